@@ -0,0 +1,70 @@
+"""
+Benchmark incremental rolling-feature updates against full recomputation
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from data_processing.rolling_features import RollingFeatureEngine, RollingState
+
+FEATURES = ['tws_trend', 'rainfall_std', 'stress_trend']
+DEPLETION = ['depletion_rate', 'depletion_acceleration']
+
+
+def run_benchmark(n_districts=5000, n_appends=12, state_path='rolling_state_benchmark.npz'):
+    """Append n_appends months one at a time, then compare with a full recomputation"""
+    config = Config()
+    scenario = SyntheticScenario(config)
+    raw_data = scenario.to_raw_data(scenario.generate(n_districts=n_districts))
+    panel_data = DataProcessor(config).build_panel(raw_data)
+    panel_data['water_stress'] = -panel_data['tws_anomaly']
+    
+    engine = RollingFeatureEngine()
+    dates = np.sort(panel_data['date'].unique())
+    history = panel_data[panel_data['date'] <= dates[-n_appends - 1]]
+    engine.state(history, FEATURES, depletion=DEPLETION).save(state_path)
+    
+    appended = []
+    append_times = []
+    for date in dates[-n_appends:]:
+        start = time.perf_counter()
+        state = RollingState.load(state_path)
+        appended.append(state.update(panel_data[panel_data['date'] == date]))
+        state.save(state_path)
+        append_times.append(time.perf_counter() - start)
+    os.remove(state_path)
+    
+    start = time.perf_counter()
+    full = engine.compute(panel_data, FEATURES, depletion=DEPLETION)
+    full_time = time.perf_counter() - start
+    
+    # Incremental rows must match the same rows of the full recomputation
+    incremental = pd.concat(appended).sort_values(['district', 'date']).reset_index(drop=True)
+    expected = full[full['date'] > dates[-n_appends - 1]].sort_values(['district', 'date']).reset_index(drop=True)
+    max_diff = max(
+        np.nanmax(np.abs(incremental[col].to_numpy() - expected[col].to_numpy()))
+        for col in state.columns
+    )
+    
+    print(f"{n_districts:>7} districts | full recompute {full_time:8.3f} s | "
+          f"append {np.mean(append_times) * 1000:8.1f} ms/month | "
+          f"max |diff| after {n_appends} appends {max_diff:.2e}")
+    
+    return {
+        'districts': n_districts,
+        'full_seconds': full_time,
+        'append_seconds': float(np.mean(append_times)),
+        'max_abs_diff': float(max_diff)
+    }
+
+
+if __name__ == "__main__":
+    run_benchmark()
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Benchmark district x month panel construction throughput
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+
+DISTRICT_COUNTS = [50, 5000, 50000]
+
+
+def run_benchmark(district_counts=DISTRICT_COUNTS, repeats=3):
+    """Time DataProcessor.build_panel for increasing district counts"""
+    config = Config()
+    scenario = SyntheticScenario(config)
+    processor = DataProcessor(config)
+
+    results = []
+    for n_districts in district_counts:
+        raw_data = scenario.to_raw_data(scenario.generate(n_districts=n_districts))
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            panel_data = processor.build_panel(raw_data)
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        results.append({
+            'districts': n_districts,
+            'rows': len(panel_data),
+            'seconds': best,
+            'rows_per_second': len(panel_data) / best
+        })
+        print(f"{n_districts:>7} districts | {len(panel_data):>10} rows | "
+              f"{best:8.3f} s | {len(panel_data) / best:>14,.0f} rows/s")
+
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
\ No newline at end of file
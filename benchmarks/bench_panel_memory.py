@@ -0,0 +1,69 @@
+"""
+Benchmark panel memory: full float64 panel against the compact panel
+"""
+
+import os
+import sys
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+
+DISTRICT_COUNTS = [500, 5000, 20000]
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(n_districts, compact):
+    """Process one scenario in a fresh process and report its memory use"""
+    config = Config()
+    config.COMPACT_PANEL = compact
+    config.PARQUET_STORAGE = False
+    config.FEATURE_STORE = False
+    scenario = SyntheticScenario(config)
+    raw_data = scenario.to_raw_data(scenario.generate(n_districts=n_districts, n_workers=1))
+    
+    baseline = _peak_rss_mb()
+    processed_data = DataProcessor(config).process_all_data(raw_data)
+    return {
+        'rows': len(processed_data),
+        'frame_mb': processed_data.memory_usage(deep=True).sum() / 1024 ** 2,
+        'peak_rss_mb': _peak_rss_mb() - baseline
+    }
+
+
+def run_benchmark(district_counts=DISTRICT_COUNTS):
+    """Compare frame size and peak RSS growth of both panel modes"""
+    context = multiprocessing.get_context('spawn')
+    
+    results = []
+    for n_districts in district_counts:
+        row = {'districts': n_districts}
+        for mode, compact in (('full', False), ('compact', True)):
+            # A fresh interpreter per run keeps ru_maxrss from carrying over
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                measured = executor.submit(_measure, n_districts, compact).result()
+            row['rows'] = measured['rows']
+            row[f'{mode}_frame_mb'] = measured['frame_mb']
+            row[f'{mode}_peak_rss_mb'] = measured['peak_rss_mb']
+        
+        results.append(row)
+        print(f"{n_districts:>7} districts | {row['rows']:>10} rows | "
+              f"frame {row['full_frame_mb']:8.1f} -> {row['compact_frame_mb']:7.1f} MB "
+              f"({row['full_frame_mb'] / row['compact_frame_mb']:.1f}x) | "
+              f"peak RSS +{row['full_peak_rss_mb']:8.1f} -> +{row['compact_peak_rss_mb']:7.1f} MB "
+              f"({row['full_peak_rss_mb'] / max(row['compact_peak_rss_mb'], 1e-9):.1f}x)")
+    
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
\ No newline at end of file
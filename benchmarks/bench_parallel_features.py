@@ -0,0 +1,52 @@
+"""
+Benchmark district-sharded feature engineering across worker counts
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from data_processing.feature_engineer import FeatureEngineer
+
+
+def run_benchmark(n_districts=20000, worker_counts=None, repeats=2):
+    """Time FeatureEngineer.create_features with 1..N worker processes"""
+    config = Config()
+    cpu_count = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+    
+    scenario = SyntheticScenario(config)
+    raw_data = scenario.to_raw_data(scenario.generate(n_districts=n_districts))
+    district_data = DataProcessor(config).build_panel(raw_data)[['district', 'date', 'tws_anomaly', 'rainfall']]
+    district_data['month'] = district_data['date'].dt.month
+    
+    results = []
+    baseline = None
+    for n_workers in worker_counts:
+        config.FEATURE_WORKERS = n_workers
+        # Enough shards to keep every worker busy
+        config.FEATURE_SHARD_ROWS = max(len(district_data) // (4 * n_workers), 1)
+        engineer = FeatureEngineer(config)
+        
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            engineer.create_features(district_data, raw_data)
+            timings.append(time.perf_counter() - start)
+        
+        best = min(timings)
+        baseline = baseline or best
+        results.append({'workers': n_workers, 'seconds': best, 'speedup': baseline / best})
+        print(f"{n_workers:>3} workers | {len(district_data):>10} rows | "
+              f"{best:8.3f} s | speedup {baseline / best:5.2f}x")
+    
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
\ No newline at end of file
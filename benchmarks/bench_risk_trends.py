@@ -0,0 +1,53 @@
+"""
+Benchmark batched risk trend computation across district counts
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from modeling.risk_classification import RiskClassifier
+
+DISTRICT_COUNTS = [50, 5000, 50000]
+
+
+def run_benchmark(district_counts=DISTRICT_COUNTS, n_months=168, repeats=3, seed=0):
+    """Time RiskClassifier._calculate_risk_trends; per-district cost should stay flat"""
+    classifier = RiskClassifier(Config())
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2010-01-31', periods=n_months, freq='ME')
+    
+    results = []
+    for n_districts in district_counts:
+        df = pd.DataFrame({
+            'district': np.repeat([f'District_{i}' for i in range(n_districts)], n_months),
+            'date': np.tile(dates, n_districts),
+            'risk_score': rng.random(n_districts * n_months)
+        })
+        
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            classifier._calculate_risk_trends(df)
+            timings.append(time.perf_counter() - start)
+        
+        best = min(timings)
+        results.append({
+            'districts': n_districts,
+            'seconds': best,
+            'us_per_district': best / n_districts * 1e6
+        })
+        print(f"{n_districts:>7} districts | {len(df):>10} rows | "
+              f"{best:8.3f} s | {best / n_districts * 1e6:8.1f} us/district")
+    
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Benchmark batched trend estimation against per-series fits
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.stats import theilslopes
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import StatisticsCalculator
+
+# Per-series Theil-Sen is timed on a sample of rows and extrapolated
+LOOP_SAMPLE = 200
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(n_districts=10000, n_months=600, max_pairs=20000, seed=0):
+    """Time per-series and batched OLS and Theil-Sen slopes on a random-walk panel"""
+    rng = np.random.default_rng(seed)
+    trends = rng.normal(0, 0.05, size=(n_districts, 1))
+    matrix = rng.normal(0, 1, size=(n_districts, n_months)).cumsum(axis=1) + trends * np.arange(n_months)
+    sample = rng.choice(n_districts, size=min(LOOP_SAMPLE, n_districts), replace=False)
+
+    loop_ols, loop_ols_seconds = _timed(lambda: np.array([
+        StatisticsCalculator.calculate_trend(row) for row in matrix
+    ]))
+    batch_ols, batch_ols_seconds = _timed(lambda: StatisticsCalculator.calculate_trends(matrix))
+
+    loop_ts, loop_ts_seconds = _timed(lambda: np.array([
+        theilslopes(matrix[row], np.arange(n_months))[0] for row in sample
+    ]))
+    loop_ts_seconds *= n_districts / len(sample)
+    batch_ts, batch_ts_seconds = _timed(lambda: StatisticsCalculator.calculate_trends(matrix, 'theil_sen'))
+    sub_ts, sub_ts_seconds = _timed(lambda: StatisticsCalculator.calculate_trends(
+        matrix, 'theil_sen', max_pairs=max_pairs, random_state=seed
+    ))
+
+    results = [
+        ('OLS, per series', loop_ols_seconds, 0.0),
+        ('OLS, batched', batch_ols_seconds, np.abs(batch_ols - loop_ols).max()),
+        ('Theil-Sen, per series*', loop_ts_seconds, 0.0),
+        ('Theil-Sen, batched', batch_ts_seconds, np.abs(batch_ts[sample] - loop_ts).max()),
+        (f'Theil-Sen, {max_pairs} pairs', sub_ts_seconds, np.abs(sub_ts[sample] - loop_ts).max()),
+    ]
+    print(f"{n_districts} districts x {n_months} months")
+    for name, seconds, error in results:
+        print(f"{name:>26} | {seconds:9.3f} s | max |slope error| {error:.2e}")
+    print(f"* extrapolated from {len(sample)} series")
+
+    return [{'method': name, 'seconds': seconds, 'max_error': error} for name, seconds, error in results]
+
+
+if __name__ == "__main__":
+    run_benchmark()
\ No newline at end of file
@@ -18,6 +18,17 @@ class Config:
         self.DATA_DIR = os.path.join(self.BASE_DIR, "data")
         self.OUTPUT_DIR = os.path.join(self.BASE_DIR, "output")
         self.MODELS_DIR = os.path.join(self.BASE_DIR, "models")
+        self.CACHE_DIR = os.path.join(self.DATA_DIR, "cache")
+        self.SERIES_DIR = os.path.join(self.DATA_DIR, "series")
+        self.GRID_DIR = os.path.join(self.DATA_DIR, "grids")
+        self.WEIGHTS_DIR = os.path.join(self.DATA_DIR, "weights")
+        self.PARQUET_DIR = os.path.join(self.DATA_DIR, "parquet")
+        self.CLIMATOLOGY_DIR = os.path.join(self.DATA_DIR, "climatology")
+        self.ROLLING_STATE_DIR = os.path.join(self.DATA_DIR, "rolling_state")
+        self.FEATURE_STORE_DIR = os.path.join(self.DATA_DIR, "features")
+        self.RISK_HISTORY_DIR = os.path.join(self.OUTPUT_DIR, "risk_history")
+        self.CV_CACHE_DIR = os.path.join(self.DATA_DIR, "cv_cache")
+        self.BOUNDARIES_FILE = os.path.join(self.DATA_DIR, "district_boundaries.geojson")
         
         # Create directories
         self._create_directories()
@@ -31,12 +42,76 @@ class Config:
         self.N_DISTRICTS = 50
         self.LAT_RANGE = (20, 30)
         self.LON_RANGE = (70, 80)
+        self.GRID_RESOLUTION = 0.25  # Degrees
+        self.GRID_CHUNK_SIZE = 32  # Cells per side of each stored chunk
+        self.ZONAL_SUBSAMPLES = 4  # Sample points per cell side for polygon coverage
+        self.BOUNDARY_NAME_FIELD = 'district'  # GeoJSON property holding the district name
+        self.SPATIAL_INDEX_NODE_CAPACITY = 16
+        
+        # Ingestion settings
+        self.CONCURRENT_COLLECTION = True
+        self.COLLECTION_WORKERS = 4
+        self.COLLECTION_TIMEOUT = 600  # Seconds per source, retries included
+        self.COLLECTION_RETRIES = 2
+        self.COLLECTION_RETRY_DELAY = 5  # Seconds, doubled after each failure
+        self.USE_CACHE = True
+        self.CACHE_MAX_SIZE_MB = 1024
+        self.INCREMENTAL_INGESTION = False  # Append only months past the stored watermark; needs PARQUET_STORAGE
+        self.GRIDDED_INGESTION = False  # Also build lat/lon/time cubes under GRID_DIR
+        
+        # Storage settings
+        self.PARQUET_STORAGE = False  # Persist raw inputs and the panel under PARQUET_DIR (rewritten each run)
+        self.PARQUET_DISTRICT_BUCKETS = 16
+        self.FEATURE_STORE = True  # Reuse processed panels stored under FEATURE_STORE_DIR
+        self.FEATURE_STORE_MAX_SIZE_MB = 4096
+        self.FEATURE_STORE_TTL_DAYS = 30
+        
+        # Climatology settings
+        self.CLIMATOLOGY_BASELINE = None  # (start, end) dates; None uses the full record
+        self.CLIMATOLOGY_PERCENTILES = (10, 50, 90)
+        
+        # Feature engineering settings
+        self.FEATURE_WORKERS = None  # Defaults to the CPU count
+        self.FEATURE_SHARD_ROWS = 500000  # Panel rows per worker task; smaller panels run in-process
+        self.DECOMPOSITION_PERIOD = 12  # Months per seasonal cycle of the TWS decomposition
+        self.DECOMPOSITION_ROBUST_ITERATIONS = 0  # Bisquare refits that damp outliers; 0 is classical
+        self.DECOMPOSITION_FEATURES = []  # e.g. ['tws_deseasonalized']; added to the panel and modeled
+        
+        # Memory settings
+        self.COMPACT_PANEL = False  # Categorical districts, float32 measures, static side table
+        self.SHARED_PANEL = False  # Publish the processed panel in shared memory for worker stages
+        self.STREAMING = False  # Process, score and store the panel in district chunks
+        self.MEMORY_BUDGET_MB = 12288  # Peak RSS target that sizes STREAMING chunks
+        
+        # Synthetic data settings
+        self.DATA_SEED = 42  # None draws fresh entropy on every run
+        self.SCENARIO_SPATIAL_CORRELATION = 0.6  # Share of variance from the shared field
+        self.SCENARIO_CORRELATION_LENGTH = 2.0  # Degrees
+        self.SCENARIO_TREND_REGIMES = {
+            'stable': {'probability': 0.3, 'rate': 0.0},
+            'declining': {'probability': 0.4, 'rate': -0.06},  # cm per month
+            'accelerating': {'probability': 0.2, 'rate': -0.03},
+            'recovering': {'probability': 0.1, 'rate': 0.03}
+        }
+        self.SCENARIO_CHUNK_SIZE = 5000  # Districts per generation task
+        self.SCENARIO_WORKERS = None  # Defaults to the CPU count
         
         # Model parameters
         self.TEST_SIZE = 0.2
         self.RANDOM_STATE = 42
         self.N_ESTIMATORS = 100
         self.CROSS_VALIDATION = 5  # This was missing!
+        self.CV_TEST_MONTHS = 12  # Months tested by each rolling-origin fold
+        self.CV_WORKERS = None  # Defaults to the CPU count
+        self.CV_CACHE_MAX_SIZE_MB = 64  # Fold metrics and timings, under CV_CACHE_DIR
+        self.MODEL_REGISTRY = True  # Save trained models under MODELS_DIR
+        self.MODEL_REGISTRY_MAX_MODELS = 20  # Oldest registered models beyond this are removed
+        self.INFERENCE_ONLY = False  # Load a registered model instead of training
+        self.MODEL_ID = None  # Registered model for INFERENCE_ONLY; defaults to the latest compatible
+        self.MODEL_FEATURES = [
+            'tws_anomaly', 'rainfall', 'crop_intensity', 'population_density',
+            'gw_irrigation_ratio', 'month'
+        ]
         
         # Risk classification thresholds
         self.RISK_THRESHOLDS = {
@@ -63,7 +138,10 @@ class Config:
         
     def _create_directories(self):
         """Create necessary directories"""
-        directories = [self.DATA_DIR, self.OUTPUT_DIR, self.MODELS_DIR]
+        directories = [self.DATA_DIR, self.OUTPUT_DIR, self.MODELS_DIR, self.CACHE_DIR,
+                       self.SERIES_DIR, self.GRID_DIR, self.WEIGHTS_DIR, self.PARQUET_DIR,
+                       self.CLIMATOLOGY_DIR, self.ROLLING_STATE_DIR, self.FEATURE_STORE_DIR,
+                       self.RISK_HISTORY_DIR, self.CV_CACHE_DIR]
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
     
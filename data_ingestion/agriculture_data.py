@@ -3,25 +3,37 @@ Agriculture and population data collection
 """
 
 import pandas as pd
-import numpy as np
+from .synthetic_scenario import SyntheticScenario
 
 class AgricultureData:
     """Handle agriculture and population data"""
     
+    SOURCE_VERSION = 2
+    
     def __init__(self, config):
         self.config = config
     
+    def cache_params(self):
+        """Parameters that determine the generated dataset"""
+        return {
+            'n_districts': self.config.N_DISTRICTS,
+            'lat_range': list(self.config.LAT_RANGE),
+            'lon_range': list(self.config.LON_RANGE),
+            'data_seed': self.config.DATA_SEED
+        }
+    
     def collect_data(self):
         """Collect crop intensity and population data"""
         districts = [f'District_{i:02d}' for i in range(1, self.config.N_DISTRICTS + 1)]
+        rng = SyntheticScenario(self.config).generator('agriculture')
         
         district_stats = pd.DataFrame({
             'district': districts,
-            'crop_intensity': np.random.beta(2, 2, len(districts)) * 0.8 + 0.2,
-            'population_density': np.random.lognormal(5, 1, len(districts)),
-            'gw_irrigation_ratio': np.random.beta(2, 3, len(districts)),
-            'center_lat': np.random.uniform(*self.config.LAT_RANGE, len(districts)),
-            'center_lon': np.random.uniform(*self.config.LON_RANGE, len(districts))
+            'crop_intensity': rng.beta(2, 2, len(districts)) * 0.8 + 0.2,
+            'population_density': rng.lognormal(5, 1, len(districts)),
+            'gw_irrigation_ratio': rng.beta(2, 3, len(districts)),
+            'center_lat': rng.uniform(*self.config.LAT_RANGE, len(districts)),
+            'center_lon': rng.uniform(*self.config.LON_RANGE, len(districts))
         })
         
         print(f"      ✅ District data: {len(districts)} districts")
@@ -2,23 +2,69 @@
 District boundary data handling
 """
 
+import os
 import pandas as pd
 import numpy as np
+from .geometry import Polygon, read_geojson
 
 class BoundaryData:
     """Handle district boundary data"""
     
+    SOURCE_VERSION = 2
+    
     def __init__(self, config):
         self.config = config
     
+    def cache_params(self):
+        """Parameters that determine the generated dataset"""
+        params = {
+            'n_districts': self.config.N_DISTRICTS,
+            'lat_range': list(self.config.LAT_RANGE),
+            'lon_range': list(self.config.LON_RANGE)
+        }
+        
+        # A boundaries file invalidates the cache whenever it changes
+        path = self.config.BOUNDARIES_FILE
+        if os.path.exists(path):
+            stat = os.stat(path)
+            params['boundaries_file'] = {'path': path, 'size': stat.st_size, 'mtime': stat.st_mtime}
+        return params
+    
     def load_boundaries(self):
-        """Load or create district boundaries"""
-        districts = [f'District_{i:02d}' for i in range(1, self.config.N_DISTRICTS + 1)]
+        """Load district polygons from BOUNDARIES_FILE, or create a synthetic tiling"""
+        path = self.config.BOUNDARIES_FILE
+        if os.path.exists(path):
+            records = read_geojson(path, self.config.BOUNDARY_NAME_FIELD)
+            districts = [name for name, _ in records]
+            geometries = [geometry for _, geometry in records]
+            source = os.path.basename(path)
+        else:
+            districts = [f'District_{i:02d}' for i in range(1, self.config.N_DISTRICTS + 1)]
+            geometries = self._synthetic_tiles(len(districts))
+            source = 'synthetic tiling'
         
         boundaries_data = pd.DataFrame({
             'district': districts,
-            'area_sqkm': np.random.lognormal(9, 0.5, len(districts))
+            'area_sqkm': [geometry.area_sqkm() for geometry in geometries],
+            'geometry': geometries
         })
         
-        print(f"      ✅ Boundaries data: {len(districts)} districts")
-        return boundaries_data
\ No newline at end of file
+        print(f"      ✅ Boundaries data: {len(districts)} districts ({source})")
+        return boundaries_data
+    
+    def _synthetic_tiles(self, n_districts):
+        """Tile the configured lat/lon domain into one rectangle per district"""
+        n_cols = int(np.ceil(np.sqrt(n_districts)))
+        n_rows = int(np.ceil(n_districts / n_cols))
+        lat_edges = np.linspace(*self.config.LAT_RANGE, n_rows + 1)
+        lon_edges = np.linspace(*self.config.LON_RANGE, n_cols + 1)
+        
+        tiles = []
+        for i in range(n_districts):
+            row, col = divmod(i, n_cols)
+            lat_min, lat_max = lat_edges[row], lat_edges[row + 1]
+            lon_min, lon_max = lon_edges[col], lon_edges[col + 1]
+            tiles.append(Polygon([
+                (lon_min, lat_min), (lon_max, lat_min), (lon_max, lat_max), (lon_min, lat_max)
+            ]))
+        return tiles
\ No newline at end of file
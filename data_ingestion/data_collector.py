@@ -2,43 +2,208 @@
 Main data collection coordinator
 """
 
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
 from .grace_data import GRACEData
 from .rainfall_data import RainfallData
 from .agriculture_data import AgricultureData
 from .boundaries import BoundaryData
+from .dataset_cache import DatasetCache
+from .spatial_index import DistrictIndex
+from utils.panel_store import PanelStore
+
+# Longest wait before checking for newly started sources
+COLLECTION_POLL_SECONDS = 0.1
 
 class DataCollector:
     """Main data collection coordinator"""
     
-    def __init__(self, config):
+    def __init__(self, config, sources=None):
         self.config = config
         self.data = {}
-        
-    def collect_all_data(self):
-        """Collect all required datasets"""
-        print("📥 Collecting all data sources...")
-        
+        # name -> (data key, progress message, zero-argument collector,
+        #          (cache params, source version) or None if uncacheable)
+        self.sources = sources if sources is not None else self._default_sources()
+        self.cache = None
+        if config.USE_CACHE:
+            self.cache = DatasetCache(config.CACHE_DIR, config.CACHE_MAX_SIZE_MB)
+    
+    def _default_sources(self):
+        """Build the standard GRACE, rainfall, agriculture and boundary sources"""
         # Initialize data collectors WITH config parameter
         grace_collector = GRACEData(self.config)
         rainfall_collector = RainfallData(self.config)
         agriculture_collector = AgricultureData(self.config)
         boundary_collector = BoundaryData(self.config)
         
-        # Collect GRACE data
-        print("   📡 Downloading GRACE gravity anomaly data...")
-        self.data['grace'] = grace_collector.download_data()
+        # Incremental series keep their own persisted history instead of the cache
+        incremental = self.config.INCREMENTAL_INGESTION
+        # DATA_SEED=None asks for fresh synthetic data, so seeded sources skip the cache
+        unseeded = self.config.DATA_SEED is None
+        
+        sources = {
+            'grace': ('grace', "   📡 Downloading GRACE gravity anomaly data...",
+                      grace_collector.download_data,
+                      None if incremental or unseeded else
+                      (grace_collector.cache_params(), GRACEData.SOURCE_VERSION)),
+            'rainfall': ('rainfall', "   🌧️ Downloading rainfall data...",
+                         rainfall_collector.download_data,
+                         None if incremental or unseeded else
+                         (rainfall_collector.cache_params(), RainfallData.SOURCE_VERSION)),
+            'agriculture': ('district_stats', "   🌾 Collecting agriculture and population data...",
+                            agriculture_collector.collect_data,
+                            None if unseeded else
+                            (agriculture_collector.cache_params(), AgricultureData.SOURCE_VERSION)),
+            'boundaries': ('districts_gdf', "   🗺️ Loading district boundaries...",
+                           boundary_collector.load_boundaries,
+                           (boundary_collector.cache_params(), BoundaryData.SOURCE_VERSION))
+        }
+        
+        # Gridded cubes persist themselves as chunked arrays under GRID_DIR
+        if self.config.GRIDDED_INGESTION:
+            sources['grace_grid'] = ('grace_grid', "   🛰️ Loading gridded GRACE TWS anomalies...",
+                                     grace_collector.download_grid, None)
+            sources['rainfall_grid'] = ('rainfall_grid', "   🌦️ Loading gridded precipitation...",
+                                        rainfall_collector.download_grid, None)
+        
+        return sources
+    
+    def collect_all_data(self):
+        """Collect all required datasets"""
+        print("📥 Collecting all data sources...")
+        start = time.perf_counter()
+        
+        if self.config.CONCURRENT_COLLECTION:
+            results = self._collect_concurrently()
+        else:
+            results = {name: self._collect_with_retry(name) for name in self.sources}
+        
+        timings = {}
+        for name, (data_key, _, _, _) in self.sources.items():
+            value, seconds, attempts, cached = results[name]
+            self.data[data_key] = value
+            timings[name] = {'seconds': seconds, 'attempts': attempts, 'cached': cached}
+        
+        # Spatial index for point-in-district and window lookups
+        districts_gdf = self.data.get('districts_gdf')
+        if districts_gdf is not None and 'geometry' in districts_gdf.columns:
+            self.data['district_index'] = DistrictIndex(
+                districts_gdf, self.config.SPATIAL_INDEX_NODE_CAPACITY
+            )
+        
+        self.data['delta'] = self._combine_deltas()
+        self.data['collection_timings'] = timings
+        self.data['collection_wall_time'] = time.perf_counter() - start
+        
+        if self.config.PARQUET_STORAGE:
+            self._store_raw_data()
+        
+        print(f"✅ Data ingestion completed successfully! ({self.data['collection_wall_time']:.2f}s)")
+        return self.data
+    
+    def _store_raw_data(self):
+        """Persist the national series and district statistics as Parquet"""
+        store = PanelStore(self.config)
+        for key, column in (('grace', 'tws_anomaly'), ('rainfall', 'rainfall')):
+            series = self.data.get(key)
+            if isinstance(series, dict) and 'dates' in series:
+                store.write(f'raw_{key}', pd.DataFrame({
+                    'date': series['dates'],
+                    column: series['values']
+                }))
+        if 'district_stats' in self.data:
+            store.write('raw_district_stats', self.data['district_stats'])
+    
+    def _combine_deltas(self):
+        """Summarise which months are new across the time series sources"""
+        deltas = [
+            self.data[key]['delta'] for key in ('grace', 'rainfall')
+            if isinstance(self.data.get(key), dict) and 'delta' in self.data[key]
+        ]
+        if not deltas:
+            return None
         
-        # Collect rainfall data
-        print("   🌧️ Downloading rainfall data...")
-        self.data['rainfall'] = rainfall_collector.download_data()
+        new_dates = deltas[0]['new_dates']
+        for delta in deltas[1:]:
+            new_dates = new_dates.union(delta['new_dates'])
+        
+        return {
+            'new_dates': new_dates,
+            'n_new': len(new_dates),
+            'full_reload': any(delta['full_reload'] for delta in deltas)
+        }
+    
+    def _collect_concurrently(self):
+        """Run every source in a thread pool, bounded by a per-source timeout
+        
+        Each source's timeout runs from when a worker starts it, so sources
+        queued behind a full pool are not charged for the wait.
+        """
+        timeout = self.config.COLLECTION_TIMEOUT
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.config.COLLECTION_WORKERS, len(self.sources)) or 1,
+            thread_name_prefix='collector'
+        )
+        
+        started = {}
+        
+        def run(name):
+            started[name] = time.monotonic()
+            return self._collect_with_retry(name)
+        
+        try:
+            pending = {executor.submit(run, name): name for name in self.sources}
+            results = {}
+            while pending:
+                # Wake for the earliest deadline of a running source, or to notice new starts
+                now = time.monotonic()
+                deadlines = [started[name] + timeout for name in pending.values() if name in started]
+                wait_for = min([COLLECTION_POLL_SECONDS] + [deadline - now for deadline in deadlines])
+                done, _ = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                
+                now = time.monotonic()
+                for name in pending.values():
+                    if name in started and now - started[name] > timeout:
+                        raise TimeoutError(f"Data source '{name}' exceeded {timeout}s timeout")
+            return {name: results[name] for name in self.sources}
+        finally:
+            # Do not block on sources that timed out; they are abandoned
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _collect_with_retry(self, name):
+        """Load one source from cache, or call it, retrying failures with backoff"""
+        _, message, collect, cache_spec = self.sources[name]
+        retries = self.config.COLLECTION_RETRIES
+        delay = self.config.COLLECTION_RETRY_DELAY
         
-        # Collect agriculture and population data
-        print("   🌾 Collecting agriculture and population data...")
-        self.data['district_stats'] = agriculture_collector.collect_data()
+        start = time.perf_counter()
+        cache_key = None
+        if self.cache is not None and cache_spec is not None:
+            params, version = cache_spec
+            cache_key = DatasetCache.make_key(name, params, version)
+            value = self.cache.get(cache_key)
+            if value is not None:
+                print(f"   💾 Loaded {name} data from cache")
+                return value, time.perf_counter() - start, 0, True
         
-        # Load district boundaries
-        print("   🗺️ Loading district boundaries...")
-        self.data['districts_gdf'] = boundary_collector.load_boundaries()
+        print(message)
+        for attempt in range(1, retries + 2):
+            try:
+                value = collect()
+                break
+            except Exception as e:
+                if attempt > retries:
+                    raise RuntimeError(
+                        f"Data source '{name}' failed after {attempt} attempts: {e}"
+                    ) from e
+                print(f"      ⚠️  {name} attempt {attempt} failed ({e}), retrying in {delay}s")
+                time.sleep(delay)
+                delay *= 2
         
-        print("✅ Data ingestion completed successfully!")
-        return self.data
\ No newline at end of file
+        if cache_key is not None:
+            self.cache.put(cache_key, value)
+        return value, time.perf_counter() - start, attempt, False
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Content-addressed on-disk cache for ingested datasets
+"""
+
+import os
+import json
+import hashlib
+import threading
+import joblib
+
+class DatasetCache:
+    """Size-bounded LRU cache of ingested datasets keyed by source fingerprint"""
+    
+    EXTENSION = '.joblib'
+    
+    def __init__(self, cache_dir, max_size_mb=1024, compress=3):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.compress = compress
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(source, params, version):
+        """Hash source name, parameters and source version into a cache key"""
+        payload = json.dumps(
+            {'source': source, 'params': params, 'version': version},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self.EXTENSION)
+    
+    def get(self, key):
+        """Return the cached dataset for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"      ⚠️  Discarding unreadable cache entry {key[:12]}: {e}")
+            self._remove(path)
+            return None
+        
+        # Access time drives LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+    
+    def put(self, key, value):
+        """Store a dataset and evict least recently used entries over the size bound"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        joblib.dump(value, tmp_path, compress=self.compress)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+    
+    def entries(self):
+        """List cache entries as (path, size_bytes, last_access), oldest first"""
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size bound"""
+        with self._lock:
+            entries = self.entries()
+            total_size = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                self._remove(path)
+                total_size -= size
+    
+    def clear(self):
+        """Remove every cache entry"""
+        with self._lock:
+            for path, _, _ in self.entries():
+                self._remove(path)
+    
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
\ No newline at end of file
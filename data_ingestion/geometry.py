@@ -0,0 +1,112 @@
+"""
+Lightweight polygon geometries for district boundaries
+"""
+
+import json
+import numpy as np
+from matplotlib.path import Path
+
+# Kilometres per degree of latitude
+KM_PER_DEGREE = 111.32
+
+class LinearRing:
+    """Closed ring of (lon, lat) vertices"""
+    
+    def __init__(self, coords):
+        coords = np.asarray(coords, dtype=float)
+        if len(coords) and not np.array_equal(coords[0], coords[-1]):
+            coords = np.vstack([coords, coords[:1]])
+        self.coords = coords
+        self._path = None
+    
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = Path(self.coords)
+        return self._path
+    
+    def contains_points(self, points):
+        """Boolean mask of points (n x 2, lon/lat) inside the ring"""
+        return self.path.contains_points(points)
+    
+    @property
+    def signed_area(self):
+        """Planar shoelace area in square degrees"""
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        return 0.5 * np.sum(x[:-1] * y[1:] - x[1:] * y[:-1])
+
+class Polygon:
+    """Polygon with an exterior ring and optional holes"""
+    
+    def __init__(self, exterior, interiors=()):
+        self.exterior = LinearRing(exterior)
+        self.interiors = [LinearRing(ring) for ring in interiors]
+    
+    @property
+    def bounds(self):
+        """(lon_min, lat_min, lon_max, lat_max)"""
+        coords = self.exterior.coords
+        return (coords[:, 0].min(), coords[:, 1].min(), coords[:, 0].max(), coords[:, 1].max())
+    
+    @property
+    def rings(self):
+        return [self.exterior] + self.interiors
+    
+    def contains_points(self, points):
+        """Boolean mask of points inside the exterior and outside every hole"""
+        inside = self.exterior.contains_points(points)
+        for interior in self.interiors:
+            inside &= ~interior.contains_points(points)
+        return inside
+    
+    def area_sqkm(self):
+        """Approximate area using a cos(latitude) scaled planar projection"""
+        area = abs(self.exterior.signed_area) - sum(abs(ring.signed_area) for ring in self.interiors)
+        mean_lat = np.radians(self.exterior.coords[:, 1].mean())
+        return area * KM_PER_DEGREE ** 2 * np.cos(mean_lat)
+
+class MultiPolygon:
+    """Collection of polygons treated as one district"""
+    
+    def __init__(self, polygons):
+        self.geoms = list(polygons)
+    
+    @property
+    def bounds(self):
+        bounds = np.array([polygon.bounds for polygon in self.geoms])
+        return (bounds[:, 0].min(), bounds[:, 1].min(), bounds[:, 2].max(), bounds[:, 3].max())
+    
+    @property
+    def rings(self):
+        return [ring for polygon in self.geoms for ring in polygon.rings]
+    
+    def contains_points(self, points):
+        inside = np.zeros(len(points), dtype=bool)
+        for polygon in self.geoms:
+            inside |= polygon.contains_points(points)
+        return inside
+    
+    def area_sqkm(self):
+        return sum(polygon.area_sqkm() for polygon in self.geoms)
+
+
+def geometry_from_geojson(geometry):
+    """Convert a GeoJSON Polygon or MultiPolygon mapping to a geometry"""
+    if geometry['type'] == 'Polygon':
+        rings = geometry['coordinates']
+        return Polygon(rings[0], rings[1:])
+    if geometry['type'] == 'MultiPolygon':
+        return MultiPolygon(Polygon(rings[0], rings[1:]) for rings in geometry['coordinates'])
+    raise ValueError(f"Unsupported boundary geometry type: {geometry['type']}")
+
+
+def read_geojson(path, name_field='district'):
+    """Read (district name, geometry) pairs from a GeoJSON FeatureCollection"""
+    with open(path, encoding='utf-8') as f:
+        collection = json.load(f)
+    
+    records = []
+    for feature in collection['features']:
+        name = feature['properties'][name_field]
+        records.append((name, geometry_from_geojson(feature['geometry'])))
+    return records
\ No newline at end of file
@@ -2,15 +2,33 @@
 GRACE gravity anomaly data collection
 """
 
+import os
 import pandas as pd
 import numpy as np
+from .series_store import SeriesStore
+from .gridded_data import ChunkedGrid, grid_coordinates, grid_params
+from .synthetic_scenario import SyntheticScenario, month_ordinal
 
 class GRACEData:
     """Handle GRACE gravity anomaly data"""
     
+    SOURCE_VERSION = 2
+    
+    # Linear depletion at the 2010-2023 baseline rate (10 cm over 168 months)
+    DEPLETION_CM_PER_MONTH = 10 / 167
+    
     def __init__(self, config):
         self.config = config
     
+    def cache_params(self):
+        """Parameters that determine the generated dataset"""
+        return {
+            'start_date': self.config.START_DATE,
+            'end_date': self.config.END_DATE,
+            'frequency': self.config.FREQUENCY,
+            'data_seed': self.config.DATA_SEED
+        }
+    
     def download_data(self):
         """Download and process GRACE data"""
         dates = pd.date_range(
@@ -19,18 +37,65 @@ class GRACEData:
             freq=self.config.FREQUENCY
         )
         
-        # Create synthetic GRACE data
-        base_tws = np.random.normal(0, 5, len(dates))
-        depletion_trend = np.linspace(0, -10, len(dates))
-        seasonal = 2 * np.sin(2 * np.pi * np.arange(len(dates)) / 12)
-        tws_values = base_tws + depletion_trend + seasonal
+        if self.config.INCREMENTAL_INGESTION:
+            store = SeriesStore(self.config.SERIES_DIR)
+            dates, tws_values, delta = store.append_months(
+                'grace', dates,
+                self._generate_values
+            )
+        else:
+            tws_values = self._generate_values(dates, 0)
+            delta = {'new_dates': dates, 'n_new': len(dates), 'full_reload': True}
         
         grace_data = {
             'dates': dates,
             'values': tws_values,
             'type': 'terrestrial_water_storage',
-            'units': 'cm'
+            'units': 'cm',
+            'delta': delta
         }
         
-        print(f"      ✅ GRACE data: {len(dates)} monthly records")
-        return grace_data
\ No newline at end of file
+        print(f"      ✅ GRACE data: {len(dates)} monthly records ({delta['n_new']} new)")
+        return grace_data
+    
+    def download_grid(self):
+        """Build the gridded TWS anomaly cube as chunked, memory-mapped arrays"""
+        path = os.path.join(self.config.GRID_DIR, 'grace')
+        params = grid_params(self.config, self.cache_params(), self.SOURCE_VERSION)
+        
+        # Unseeded grids are drawn afresh on every run
+        if self.config.DATA_SEED is None or not ChunkedGrid.exists(path, params):
+            dates = pd.date_range(
+                self.config.START_DATE,
+                self.config.END_DATE,
+                freq=self.config.FREQUENCY
+            )
+            lat, lon = grid_coordinates(self.config)
+            national = self._generate_values(dates, 0)
+            rng = SyntheticScenario(self.config).generator('grace_grid')
+            
+            def fill_chunk(lat_block, lon_block):
+                # Depletion intensifies towards the north of the domain
+                lat_weight = (lat_block - lat[0]) / max(lat[-1] - lat[0], 1e-9)
+                spatial = 1 + 0.5 * np.outer(lat_weight, np.ones(len(lon_block)))
+                noise = rng.normal(0, 1, (len(dates), len(lat_block), len(lon_block)))
+                return national[:, np.newaxis, np.newaxis] * spatial[np.newaxis] + noise
+            
+            ChunkedGrid.create(
+                path, 'tws_anomaly', 'cm', lat, lon, dates, fill_chunk,
+                chunk_size=self.config.GRID_CHUNK_SIZE, params=params
+            )
+        
+        grid = ChunkedGrid(path)
+        print(f"      ✅ GRACE grid: {grid.shape[1]}x{grid.shape[2]} cells, {grid.shape[0]} months")
+        return grid
+    
+    def _generate_values(self, dates, start_index):
+        """Create synthetic GRACE TWS values for dates starting at month start_index"""
+        months = np.arange(start_index, start_index + len(dates))
+        # Keyed by first month so appended months draw fresh values
+        rng = SyntheticScenario(self.config).generator('grace', month_ordinal(dates[0]))
+        base_tws = rng.normal(0, 5, len(dates))
+        depletion_trend = -self.DEPLETION_CM_PER_MONTH * months
+        seasonal = 2 * np.sin(2 * np.pi * months / 12)
+        return base_tws + depletion_trend + seasonal
\ No newline at end of file
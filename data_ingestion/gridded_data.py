@@ -0,0 +1,175 @@
+"""
+Chunked, memory-mapped storage for gridded (time, lat, lon) datasets
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+class ChunkedGrid:
+    """Lazily read a (time, lat, lon) cube stored as memory-mapped spatial chunks"""
+    
+    META_FILE = 'meta.json'
+    COORDS_FILE = 'coords.npz'
+    
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, self.META_FILE)) as f:
+            self.meta = json.load(f)
+        coords = np.load(os.path.join(path, self.COORDS_FILE))
+        self.lat = coords['lat']
+        self.lon = coords['lon']
+        self.time = pd.DatetimeIndex(coords['time'])
+        self.variable = self.meta['variable']
+        self.units = self.meta['units']
+        self.chunk_size = self.meta['chunk_size']
+        self._chunks = {}
+    
+    @property
+    def shape(self):
+        return (len(self.time), len(self.lat), len(self.lon))
+    
+    @property
+    def chunk_grid(self):
+        """Number of chunks along lat and lon"""
+        return (-(-len(self.lat) // self.chunk_size), -(-len(self.lon) // self.chunk_size))
+    
+    @classmethod
+    def exists(cls, path, params=None):
+        """Check a stored grid exists and, optionally, was built with params"""
+        meta_path = os.path.join(path, cls.META_FILE)
+        if not os.path.exists(meta_path):
+            return False
+        if params is None:
+            return True
+        with open(meta_path) as f:
+            return json.load(f).get('params') == params
+    
+    @classmethod
+    def create(cls, path, variable, units, lat, lon, time, fill_chunk,
+               chunk_size=32, dtype='float32', params=None):
+        """Write a grid chunk by chunk without holding the full cube in memory
+        
+        fill_chunk(lat_block, lon_block) must return a (time, lat, lon) array
+        for the given coordinate blocks.
+        """
+        os.makedirs(path, exist_ok=True)
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        time = pd.DatetimeIndex(time)
+        
+        # Remove the metadata first so a partially written grid is never opened
+        meta_path = os.path.join(path, cls.META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        
+        for i in range(0, len(lat), chunk_size):
+            for j in range(0, len(lon), chunk_size):
+                lat_block = lat[i:i + chunk_size]
+                lon_block = lon[j:j + chunk_size]
+                chunk = np.lib.format.open_memmap(
+                    cls._chunk_path(path, i // chunk_size, j // chunk_size), mode='w+',
+                    dtype=dtype, shape=(len(time), len(lat_block), len(lon_block))
+                )
+                chunk[:] = fill_chunk(lat_block, lon_block)
+                chunk.flush()
+                del chunk
+        
+        np.savez(os.path.join(path, cls.COORDS_FILE), lat=lat, lon=lon,
+                 time=time.values.astype('datetime64[ns]'))
+        with open(meta_path, 'w') as f:
+            json.dump({
+                'variable': variable,
+                'units': units,
+                'chunk_size': chunk_size,
+                'dtype': dtype,
+                'params': params
+            }, f, indent=2)
+        
+        return cls(path)
+    
+    @staticmethod
+    def _chunk_path(path, chunk_i, chunk_j):
+        return os.path.join(path, f'chunk_{chunk_i:04d}_{chunk_j:04d}.npy')
+    
+    def chunk(self, chunk_i, chunk_j):
+        """Open one spatial chunk as a read-only memory map"""
+        key = (chunk_i, chunk_j)
+        if key not in self._chunks:
+            self._chunks[key] = np.load(self._chunk_path(self.path, chunk_i, chunk_j), mmap_mode='r')
+        return self._chunks[key]
+    
+    def _index_range(self, coords, value_range):
+        """Positions of coords falling inside an inclusive (min, max) range"""
+        if value_range is None:
+            return 0, len(coords)
+        low, high = value_range
+        return (int(np.searchsorted(coords, low, side='left')),
+                int(np.searchsorted(coords, high, side='right')))
+    
+    def _window_chunks(self, lat_range, lon_range):
+        """Yield (chunk, chunk slices, output slices) covering a spatial window"""
+        lat_start, lat_stop = self._index_range(self.lat, lat_range)
+        lon_start, lon_stop = self._index_range(self.lon, lon_range)
+        size = self.chunk_size
+        
+        for chunk_i in range(lat_start // size, -(-lat_stop // size)):
+            i0 = max(lat_start, chunk_i * size)
+            i1 = min(lat_stop, (chunk_i + 1) * size)
+            for chunk_j in range(lon_start // size, -(-lon_stop // size)):
+                j0 = max(lon_start, chunk_j * size)
+                j1 = min(lon_stop, (chunk_j + 1) * size)
+                yield (
+                    self.chunk(chunk_i, chunk_j),
+                    (slice(i0 - chunk_i * size, i1 - chunk_i * size),
+                     slice(j0 - chunk_j * size, j1 - chunk_j * size)),
+                    (slice(i0 - lat_start, i1 - lat_start),
+                     slice(j0 - lon_start, j1 - lon_start))
+                )
+    
+    def read_window(self, lat_range=None, lon_range=None, time_slice=slice(None)):
+        """Read a (time, lat, lon) window, touching only the chunks it overlaps"""
+        lat_start, lat_stop = self._index_range(self.lat, lat_range)
+        lon_start, lon_stop = self._index_range(self.lon, lon_range)
+        n_time = len(self.time[time_slice])
+        
+        window = np.empty((n_time, lat_stop - lat_start, lon_stop - lon_start),
+                          dtype=self.meta['dtype'])
+        for chunk, (chunk_lat, chunk_lon), (out_lat, out_lon) in self._window_chunks(lat_range, lon_range):
+            window[:, out_lat, out_lon] = chunk[time_slice, chunk_lat, chunk_lon]
+        
+        return window, self.lat[lat_start:lat_stop], self.lon[lon_start:lon_stop]
+    
+    def window_mean(self, lat_range=None, lon_range=None):
+        """Per-time mean over a spatial window, ignoring NaN cells"""
+        total = np.zeros(len(self.time))
+        count = np.zeros(len(self.time))
+        for chunk, (chunk_lat, chunk_lon), _ in self._window_chunks(lat_range, lon_range):
+            block = np.asarray(chunk[:, chunk_lat, chunk_lon], dtype=float)
+            valid = ~np.isnan(block)
+            total += np.where(valid, block, 0).sum(axis=(1, 2))
+            count += valid.sum(axis=(1, 2))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, total / count, np.nan)
+
+
+def grid_coordinates(config):
+    """Cell-centre latitudes and longitudes covering the configured domain"""
+    resolution = config.GRID_RESOLUTION
+    lat = np.arange(config.LAT_RANGE[0] + resolution / 2, config.LAT_RANGE[1], resolution)
+    lon = np.arange(config.LON_RANGE[0] + resolution / 2, config.LON_RANGE[1], resolution)
+    return lat, lon
+
+
+def grid_params(config, cache_params, version):
+    """Parameters that determine a stored grid, used to detect stale grids"""
+    return {
+        **cache_params,
+        'lat_range': list(config.LAT_RANGE),
+        'lon_range': list(config.LON_RANGE),
+        'resolution': config.GRID_RESOLUTION,
+        'chunk_size': config.GRID_CHUNK_SIZE,
+        'version': version
+    }
\ No newline at end of file
@@ -2,15 +2,30 @@
 Rainfall data collection
 """
 
+import os
 import pandas as pd
 import numpy as np
+from .series_store import SeriesStore
+from .gridded_data import ChunkedGrid, grid_coordinates, grid_params
+from .synthetic_scenario import SyntheticScenario, month_ordinal
 
 class RainfallData:
     """Handle rainfall data collection"""
     
+    SOURCE_VERSION = 2
+    
     def __init__(self, config):
         self.config = config
     
+    def cache_params(self):
+        """Parameters that determine the generated dataset"""
+        return {
+            'start_date': self.config.START_DATE,
+            'end_date': self.config.END_DATE,
+            'frequency': self.config.FREQUENCY,
+            'data_seed': self.config.DATA_SEED
+        }
+    
     def download_data(self):
         """Download and process rainfall data"""
         dates = pd.date_range(
@@ -19,16 +34,62 @@ class RainfallData:
             freq=self.config.FREQUENCY
         )
         
-        base_rainfall = np.random.gamma(2, 50, len(dates))
-        seasonal = 50 * np.sin(2 * np.pi * pd.DatetimeIndex(dates).month / 12)
-        rainfall_values = base_rainfall + seasonal + np.random.normal(0, 20, len(dates))
+        if self.config.INCREMENTAL_INGESTION:
+            store = SeriesStore(self.config.SERIES_DIR)
+            dates, rainfall_values, delta = store.append_months(
+                'rainfall', dates, lambda new_dates, start: self._generate_values(new_dates)
+            )
+        else:
+            rainfall_values = self._generate_values(dates)
+            delta = {'new_dates': dates, 'n_new': len(dates), 'full_reload': True}
         
         rainfall_data = {
             'dates': dates,
             'values': rainfall_values,
             'type': 'precipitation',
-            'units': 'mm'
+            'units': 'mm',
+            'delta': delta
         }
         
-        print(f"      ✅ Rainfall data: {len(dates)} monthly records")
-        return rainfall_data
\ No newline at end of file
+        print(f"      ✅ Rainfall data: {len(dates)} monthly records ({delta['n_new']} new)")
+        return rainfall_data
+    
+    def download_grid(self):
+        """Build the gridded precipitation cube as chunked, memory-mapped arrays"""
+        path = os.path.join(self.config.GRID_DIR, 'rainfall')
+        params = grid_params(self.config, self.cache_params(), self.SOURCE_VERSION)
+        
+        # Unseeded grids are drawn afresh on every run
+        if self.config.DATA_SEED is None or not ChunkedGrid.exists(path, params):
+            dates = pd.date_range(
+                self.config.START_DATE,
+                self.config.END_DATE,
+                freq=self.config.FREQUENCY
+            )
+            lat, lon = grid_coordinates(self.config)
+            national = self._generate_values(dates)
+            rng = SyntheticScenario(self.config).generator('rainfall_grid')
+            
+            def fill_chunk(lat_block, lon_block):
+                # Rainfall decreases towards the west of the domain
+                lon_weight = (lon_block - lon[0]) / max(lon[-1] - lon[0], 1e-9)
+                spatial = 0.6 + 0.8 * np.outer(np.ones(len(lat_block)), lon_weight)
+                noise = rng.normal(0, 10, (len(dates), len(lat_block), len(lon_block)))
+                return national[:, np.newaxis, np.newaxis] * spatial[np.newaxis] + noise
+            
+            ChunkedGrid.create(
+                path, 'precipitation', 'mm', lat, lon, dates, fill_chunk,
+                chunk_size=self.config.GRID_CHUNK_SIZE, params=params
+            )
+        
+        grid = ChunkedGrid(path)
+        print(f"      ✅ Rainfall grid: {grid.shape[1]}x{grid.shape[2]} cells, {grid.shape[0]} months")
+        return grid
+    
+    def _generate_values(self, dates):
+        """Create synthetic monthly rainfall values for dates"""
+        # Keyed by first month so appended months draw fresh values
+        rng = SyntheticScenario(self.config).generator('rainfall', month_ordinal(dates[0]))
+        base_rainfall = rng.gamma(2, 50, len(dates))
+        seasonal = 50 * np.sin(2 * np.pi * np.asarray(pd.DatetimeIndex(dates).month) / 12)
+        return base_rainfall + seasonal + rng.normal(0, 20, len(dates))
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Persisted monthly series with a last-ingested-month watermark
+"""
+
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+class SeriesStore:
+    """Store national monthly series and append only months past the watermark"""
+    
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+    
+    def _path(self, name):
+        return os.path.join(self.store_dir, f'{name}.joblib')
+    
+    def load(self, name):
+        """Load a stored series as {'dates', 'values'}, or None if absent"""
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        return joblib.load(path)
+    
+    def save(self, name, dates, values):
+        """Persist a series; its last date becomes the watermark"""
+        path = self._path(name)
+        tmp_path = f'{path}.tmp'
+        joblib.dump({'dates': pd.DatetimeIndex(dates), 'values': np.asarray(values)}, tmp_path)
+        os.replace(tmp_path, path)
+    
+    def watermark(self, name):
+        """Last ingested month for a series, or None"""
+        stored = self.load(name)
+        if stored is None or len(stored['dates']) == 0:
+            return None
+        return stored['dates'][-1]
+    
+    def append_months(self, name, dates, generate):
+        """Return the series over dates, generating only months after the watermark
+        
+        generate(new_dates, start_index) must return values for new_dates, where
+        start_index is the position of new_dates[0] within dates. Returns
+        (dates, values, delta) with delta describing the months that were added.
+        """
+        dates = pd.DatetimeIndex(dates)
+        stored = self.load(name)
+        
+        # History is only reusable if it starts where the configured range starts
+        if stored is None or len(stored['dates']) == 0 or stored['dates'][0] != dates[0]:
+            n_kept = 0
+            kept_values = np.array([])
+            full_reload = True
+        else:
+            n_kept = int(np.searchsorted(dates, stored['dates'][-1], side='right'))
+            if not dates[:n_kept].equals(stored['dates'][:n_kept]):
+                n_kept = 0
+            kept_values = np.asarray(stored['values'])[:n_kept]
+            full_reload = n_kept == 0
+        
+        new_dates = dates[n_kept:]
+        if len(new_dates):
+            new_values = np.asarray(generate(new_dates, n_kept))
+            values = np.concatenate([kept_values, new_values])
+            self.save(name, dates, values)
+        else:
+            values = kept_values
+        
+        delta = {
+            'new_dates': new_dates,
+            'n_new': len(new_dates),
+            'full_reload': full_reload
+        }
+        return dates, values, delta
\ No newline at end of file
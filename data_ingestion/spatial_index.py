@@ -0,0 +1,176 @@
+"""
+STR-packed R-tree over district boundaries for point and window lookups
+"""
+
+import numpy as np
+
+class DistrictIndex:
+    """Bulk-loaded (Sort-Tile-Recursive) R-tree over district geometries"""
+    
+    def __init__(self, districts_gdf, node_capacity=16):
+        self.districts = districts_gdf['district'].to_numpy()
+        self.geometries = list(districts_gdf['geometry'])
+        self.node_capacity = node_capacity
+        self.bounds = np.array([geometry.bounds for geometry in self.geometries], dtype=float)
+        self._build()
+    
+    def _build(self):
+        """Pack leaves and parent levels bottom-up with STR ordering"""
+        self.item_order = self._str_order(self.bounds)
+        
+        # Each level: node bounds and [start, end) ranges into the level below
+        self.levels = []
+        child_bounds = self.bounds[self.item_order]
+        while True:
+            starts = np.arange(0, len(child_bounds), self.node_capacity)
+            ends = np.minimum(starts + self.node_capacity, len(child_bounds))
+            node_bounds = np.column_stack([
+                np.minimum.reduceat(child_bounds[:, 0], starts),
+                np.minimum.reduceat(child_bounds[:, 1], starts),
+                np.maximum.reduceat(child_bounds[:, 2], starts),
+                np.maximum.reduceat(child_bounds[:, 3], starts)
+            ])
+            self.levels.append((node_bounds, starts, ends))
+            if len(node_bounds) <= self.node_capacity:
+                break
+            
+            # Re-tile parents so siblings stay spatially close
+            order = self._str_order(node_bounds)
+            self._reorder_level(order)
+            child_bounds = self.levels[-1][0]
+        
+        self.levels.reverse()
+    
+    def _reorder_level(self, order):
+        node_bounds, starts, ends = self.levels[-1]
+        self.levels[-1] = (node_bounds[order], starts[order], ends[order])
+    
+    def _str_order(self, bounds):
+        """Sort-Tile-Recursive ordering of boxes: x slices, then y within each slice"""
+        n = len(bounds)
+        if n == 0:
+            return np.arange(0)
+        centre_x = (bounds[:, 0] + bounds[:, 2]) / 2
+        centre_y = (bounds[:, 1] + bounds[:, 3]) / 2
+        n_slices = int(np.ceil(np.sqrt(np.ceil(n / self.node_capacity))))
+        slice_size = n_slices * self.node_capacity
+        
+        by_x = np.argsort(centre_x, kind='stable')
+        slice_id = np.empty(n, dtype=int)
+        slice_id[by_x] = np.arange(n) // slice_size
+        return np.lexsort((centre_y, slice_id))
+    
+    def _candidates(self, query_bounds):
+        """(query, district) pairs whose bounding boxes overlap, via tree descent"""
+        n_queries = len(query_bounds)
+        top_bounds = self.levels[0][0]
+        queries = np.repeat(np.arange(n_queries), len(top_bounds))
+        nodes = np.tile(np.arange(len(top_bounds)), n_queries)
+        
+        for level, (node_bounds, starts, ends) in enumerate(self.levels):
+            hit = self._overlaps(query_bounds[queries], node_bounds[nodes])
+            queries, nodes = queries[hit], nodes[hit]
+            
+            # Expand each surviving node into its children
+            counts = ends[nodes] - starts[nodes]
+            queries = np.repeat(queries, counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            nodes = np.repeat(starts[nodes], counts) + offsets
+        
+        items = self.item_order[nodes]
+        hit = self._overlaps(query_bounds[queries], self.bounds[items])
+        return queries[hit], items[hit]
+    
+    @staticmethod
+    def _overlaps(a, b):
+        return ((a[:, 0] <= b[:, 2]) & (a[:, 2] >= b[:, 0]) &
+                (a[:, 1] <= b[:, 3]) & (a[:, 3] >= b[:, 1]))
+    
+    def locate_points(self, lats, lons):
+        """Index of the district containing each point, or -1 when none does"""
+        points = np.column_stack([np.asarray(lons, dtype=float), np.asarray(lats, dtype=float)])
+        result = np.full(len(points), -1, dtype=int)
+        if len(points) == 0 or len(self.geometries) == 0:
+            return result
+        
+        queries, items = self._candidates(np.hstack([points, points]))
+        
+        # Exact point-in-polygon test, one vectorised call per candidate district
+        order = np.argsort(items, kind='stable')
+        queries, items = queries[order], items[order]
+        boundaries = np.flatnonzero(np.diff(items)) + 1
+        for group_queries, group_items in zip(np.split(queries, boundaries), np.split(items, boundaries)):
+            if len(group_items) == 0:
+                continue
+            geometry = self.geometries[group_items[0]]
+            inside = geometry.contains_points(points[group_queries])
+            unassigned = result[group_queries[inside]] == -1
+            result[group_queries[inside][unassigned]] = group_items[0]
+        
+        return result
+    
+    def locate_districts(self, lats, lons):
+        """District name containing each point, or None"""
+        positions = self.locate_points(lats, lons)
+        names = np.empty(len(positions), dtype=object)
+        names[positions >= 0] = self.districts[positions[positions >= 0]]
+        return names
+    
+    def query_windows(self, windows):
+        """Districts intersecting each (lon_min, lat_min, lon_max, lat_max) window
+        
+        Returns a list with one array of district positions per window.
+        """
+        windows = np.atleast_2d(np.asarray(windows, dtype=float))
+        queries, items = self._candidates(windows)
+        
+        keep = np.array([
+            self._intersects_window(self.geometries[item], windows[query])
+            for query, item in zip(queries, items)
+        ], dtype=bool)
+        queries, items = queries[keep], items[keep]
+        
+        return [np.sort(items[queries == i]) for i in range(len(windows))]
+    
+    def query_window(self, lon_min, lat_min, lon_max, lat_max):
+        """District names intersecting a single window"""
+        positions = self.query_windows([(lon_min, lat_min, lon_max, lat_max)])[0]
+        return list(self.districts[positions])
+    
+    @staticmethod
+    def _intersects_window(geometry, window):
+        """Exact polygon/rectangle intersection test"""
+        lon_min, lat_min, lon_max, lat_max = window
+        rings = geometry.rings if hasattr(geometry, 'rings') else None
+        if rings is None:
+            return True  # Bounds-only geometry: bounding box overlap is exact
+        
+        # A vertex inside the window, or a window corner inside the polygon
+        for ring in rings:
+            x, y = ring.coords[:, 0], ring.coords[:, 1]
+            if np.any((x >= lon_min) & (x <= lon_max) & (y >= lat_min) & (y <= lat_max)):
+                return True
+        corners = np.array([[lon_min, lat_min], [lon_max, lat_min],
+                            [lon_max, lat_max], [lon_min, lat_max]])
+        if geometry.contains_points(corners).any():
+            return True
+        
+        # Otherwise only crossing edges can intersect
+        window_edges = np.stack([corners, np.roll(corners, -1, axis=0)], axis=1)
+        for ring in rings:
+            ring_edges = np.stack([ring.coords[:-1], ring.coords[1:]], axis=1)
+            if _segments_cross(ring_edges, window_edges):
+                return True
+        return False
+
+
+def _segments_cross(edges_a, edges_b):
+    """Whether any segment in edges_a properly crosses any segment in edges_b"""
+    p, r = edges_a[:, np.newaxis, 0], edges_a[:, np.newaxis, 1] - edges_a[:, np.newaxis, 0]
+    q, s = edges_b[np.newaxis, :, 0], edges_b[np.newaxis, :, 1] - edges_b[np.newaxis, :, 0]
+    denom = r[..., 0] * s[..., 1] - r[..., 1] * s[..., 0]
+    qp = q - p
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (qp[..., 0] * s[..., 1] - qp[..., 1] * s[..., 0]) / denom
+        u = (qp[..., 0] * r[..., 1] - qp[..., 1] * r[..., 0]) / denom
+    return bool(np.any((denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)))
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+Seeded, scalable synthetic scenario generator for development and load testing
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Stable stream ids: adding a source must never reshuffle existing streams
+SOURCE_IDS = {
+    'grace': 0,
+    'rainfall': 1,
+    'agriculture': 2,
+    'boundaries': 3,
+    'panel': 4,
+    'grace_grid': 5,
+    'rainfall_grid': 6,
+    'scenario_field': 7,
+    'scenario_district': 8
+}
+
+# Number of random Fourier features approximating the spatial covariance
+N_SPATIAL_FEATURES = 64
+
+class SyntheticScenario:
+    """Reproducible synthetic inputs built on np.random.Generator streams
+    
+    Every source gets its own stream, and every district its own sub-stream,
+    derived from one root seed. SeedSequence(entropy, spawn_key=(source, key))
+    is exactly the child that SeedSequence(entropy).spawn() would produce at
+    that position, so streams are addressable without spawning all siblings
+    and results do not depend on chunking or worker count.
+    """
+    
+    def __init__(self, config, seed=None):
+        self.config = config
+        self.root = np.random.SeedSequence(config.DATA_SEED if seed is None else seed)
+    
+    def seed_sequence(self, source, *key):
+        """Seed sequence for a source, optionally keyed by district or month"""
+        return np.random.SeedSequence(
+            self.root.entropy, spawn_key=(SOURCE_IDS[source],) + tuple(int(k) for k in key)
+        )
+    
+    def generator(self, source, *key):
+        """Independent np.random.Generator for a source stream"""
+        return np.random.default_rng(self.seed_sequence(source, *key))
+    
+    def district_centres(self, n_districts):
+        """Centres of the synthetic district tiling used by BoundaryData"""
+        n_cols = int(np.ceil(np.sqrt(n_districts)))
+        n_rows = int(np.ceil(n_districts / n_cols))
+        lat_edges = np.linspace(*self.config.LAT_RANGE, n_rows + 1)
+        lon_edges = np.linspace(*self.config.LON_RANGE, n_cols + 1)
+        row, col = np.divmod(np.arange(n_districts), n_cols)
+        return (lat_edges[row] + lat_edges[row + 1]) / 2, (lon_edges[col] + lon_edges[col + 1]) / 2
+    
+    def generate(self, n_districts=None, n_months=None, start_date=None,
+                 chunk_size=None, n_workers=None):
+        """Generate district x month TWS and rainfall arrays plus district statistics"""
+        config = self.config
+        n_districts = n_districts or config.N_DISTRICTS
+        start_date = start_date or config.START_DATE
+        if n_months is None:
+            n_months = len(pd.date_range(config.START_DATE, config.END_DATE, freq=config.FREQUENCY))
+        chunk_size = chunk_size or config.SCENARIO_CHUNK_SIZE
+        n_workers = n_workers or config.SCENARIO_WORKERS or os.cpu_count() or 1
+        
+        dates = pd.date_range(start_date, periods=n_months, freq=config.FREQUENCY)
+        centre_lat, centre_lon = self.district_centres(n_districts)
+        
+        # Shared spatial field: random Fourier features of a Gaussian kernel
+        field_rng = self.generator('scenario_field')
+        length_scale = config.SCENARIO_CORRELATION_LENGTH
+        field = {
+            'frequencies': field_rng.normal(0, 1 / length_scale, (N_SPATIAL_FEATURES, 2)),
+            'phases': field_rng.uniform(0, 2 * np.pi, N_SPATIAL_FEATURES),
+            'coefficients': field_rng.standard_normal((2, N_SPATIAL_FEATURES, n_months))
+        }
+        
+        regimes = config.SCENARIO_TREND_REGIMES
+        params = {
+            'entropy': self.root.entropy,
+            'n_months': n_months,
+            'month_of_year': np.asarray(dates.month),
+            'correlation': config.SCENARIO_SPATIAL_CORRELATION,
+            'regime_names': list(regimes),
+            'regime_probabilities': np.array([regimes[name]['probability'] for name in regimes]),
+            'regime_rates': np.array([regimes[name]['rate'] for name in regimes]),
+            'field': field
+        }
+        
+        tws = np.empty((n_districts, n_months), dtype=np.float32)
+        rainfall = np.empty((n_districts, n_months), dtype=np.float32)
+        stats = np.empty((n_districts, 3))
+        regime_codes = np.empty(n_districts, dtype=np.int8)
+        
+        tasks = [
+            (start, min(start + chunk_size, n_districts),
+             centre_lat[start:start + chunk_size], centre_lon[start:start + chunk_size], params)
+            for start in range(0, n_districts, chunk_size)
+        ]
+        
+        def store(result):
+            start, stop, chunk_tws, chunk_rainfall, chunk_stats, chunk_regimes = result
+            tws[start:stop] = chunk_tws
+            rainfall[start:stop] = chunk_rainfall
+            stats[start:stop] = chunk_stats
+            regime_codes[start:stop] = chunk_regimes
+        
+        if n_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+                for result in executor.map(_generate_district_chunk, tasks):
+                    store(result)
+        else:
+            for task in tasks:
+                store(_generate_district_chunk(task))
+        
+        districts = [f'District_{i:02d}' for i in range(1, n_districts + 1)]
+        district_stats = pd.DataFrame({
+            'district': districts,
+            'crop_intensity': stats[:, 0],
+            'population_density': stats[:, 1],
+            'gw_irrigation_ratio': stats[:, 2],
+            'center_lat': centre_lat,
+            'center_lon': centre_lon
+        })
+        
+        return {
+            'dates': dates,
+            'districts': districts,
+            'district_stats': district_stats,
+            'tws_anomaly': tws,
+            'rainfall': rainfall,
+            'regimes': pd.Categorical.from_codes(regime_codes, params['regime_names'])
+        }
+    
+    def to_raw_data(self, scenario):
+        """Shape a generated scenario like DataCollector.collect_all_data output"""
+        dates = scenario['dates']
+        full_delta = {'new_dates': dates, 'n_new': len(dates), 'full_reload': True}
+        district_stats = scenario['district_stats']
+        
+        lat_span = np.diff(self.config.LAT_RANGE)[0]
+        lon_span = np.diff(self.config.LON_RANGE)[0]
+        tile_area = lat_span * lon_span / len(district_stats) * 111.32 ** 2
+        
+        return {
+            'grace': {
+                'dates': dates,
+                'values': scenario['tws_anomaly'].mean(axis=0, dtype=float),
+                'type': 'terrestrial_water_storage',
+                'units': 'cm',
+                'delta': full_delta
+            },
+            'rainfall': {
+                'dates': dates,
+                'values': scenario['rainfall'].mean(axis=0, dtype=float),
+                'type': 'precipitation',
+                'units': 'mm',
+                'delta': full_delta
+            },
+            'district_stats': district_stats,
+            'districts_gdf': pd.DataFrame({
+                'district': district_stats['district'],
+                'area_sqkm': tile_area * np.cos(np.radians(district_stats['center_lat']))
+            }),
+            'district_series': {
+                'tws_anomaly': scenario['tws_anomaly'],
+                'rainfall': scenario['rainfall']
+            },
+            'delta': full_delta
+        }
+
+
+def month_ordinal(date):
+    """Months since year 0, used to key per-month random streams"""
+    return date.year * 12 + date.month - 1
+
+
+def _generate_district_chunk(task):
+    """Generate one block of districts, each from its own seed stream"""
+    start, stop, centre_lat, centre_lon, params = task
+    n_months = params['n_months']
+    n_chunk = stop - start
+    correlation = params['correlation']
+    field = params['field']
+    months = np.arange(n_months)
+    
+    # Spatially correlated anomalies: (district x feature) @ (feature x month)
+    centres = np.column_stack([centre_lat, centre_lon])
+    basis = np.sqrt(2 / N_SPATIAL_FEATURES) * np.cos(centres @ field['frequencies'].T + field['phases'])
+    tws_field = basis @ field['coefficients'][0]
+    rainfall_field = basis @ field['coefficients'][1]
+    
+    tws_noise = np.empty((n_chunk, n_months))
+    rainfall_base = np.empty((n_chunk, n_months))
+    rainfall_noise = np.empty((n_chunk, n_months))
+    stats = np.empty((n_chunk, 3))
+    regimes = np.empty(n_chunk, dtype=np.int8)
+    
+    for row, district in enumerate(range(start, stop)):
+        rng = np.random.default_rng(np.random.SeedSequence(
+            params['entropy'], spawn_key=(SOURCE_IDS['scenario_district'], district)
+        ))
+        stats[row] = (
+            rng.beta(2, 2) * 0.8 + 0.2,
+            rng.lognormal(5, 1),
+            rng.beta(2, 3)
+        )
+        regimes[row] = rng.choice(len(params['regime_rates']), p=params['regime_probabilities'])
+        tws_noise[row] = rng.standard_normal(n_months)
+        rainfall_base[row] = rng.gamma(2, 50, n_months)
+        rainfall_noise[row] = rng.standard_normal(n_months)
+    
+    # Trend regimes; 'accelerating' rates grow linearly through the period
+    rates = params['regime_rates'][regimes]
+    accelerating = np.array(params['regime_names'])[regimes] == 'accelerating'
+    trend = rates[:, np.newaxis] * months
+    trend[accelerating] *= 1 + months / max(n_months - 1, 1)
+    
+    seasonal_tws = 2 * np.sin(2 * np.pi * months / 12)
+    seasonal_rain = 50 * np.sin(2 * np.pi * params['month_of_year'] / 12)
+    mix_field, mix_noise = np.sqrt(correlation), np.sqrt(1 - correlation)
+    
+    tws = seasonal_tws + trend + 5 * (mix_field * tws_field + mix_noise * tws_noise)
+    rainfall = rainfall_base + seasonal_rain + 20 * (mix_field * rainfall_field + mix_noise * rainfall_noise)
+    
+    return start, stop, tws.astype(np.float32), rainfall.astype(np.float32), stats, regimes
\ No newline at end of file
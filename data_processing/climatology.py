@@ -0,0 +1,154 @@
+"""
+Per-district monthly climatologies and broadcast anomalies
+"""
+
+import os
+import re
+import hashlib
+import pandas as pd
+import numpy as np
+
+class MonthlyClimatology:
+    """(district, calendar month, statistic) array of one variable"""
+    
+    def __init__(self, variable, districts, stats, stat_names):
+        self.variable = variable
+        self.districts = pd.Index(districts)
+        self.stats = stats
+        self.stat_names = list(stat_names)
+    
+    @property
+    def mean(self):
+        return self.stats[:, :, self.stat_names.index('mean')]
+    
+    @property
+    def std(self):
+        return self.stats[:, :, self.stat_names.index('std')]
+    
+    def percentile(self, q):
+        return self.stats[:, :, self.stat_names.index(f'p{q:g}')]
+    
+    def lookup(self, panel_data, stat, group_col='district', time_col='date'):
+        """Per-row value of a statistic for each row's district and calendar month"""
+        table = self.stats[:, :, self.stat_names.index(stat)]
+        rows = self.districts.get_indexer(panel_data[group_col])
+        months = pd.DatetimeIndex(panel_data[time_col]).month.to_numpy() - 1
+        values = table[rows, months]
+        values[rows < 0] = np.nan
+        return values
+    
+    def anomaly(self, panel_data, group_col='district', time_col='date'):
+        """Deviation from the district's mean for the calendar month"""
+        values = panel_data[self.variable].to_numpy(dtype=float)
+        return values - self.lookup(panel_data, 'mean', group_col, time_col)
+    
+    def standardized_anomaly(self, panel_data, group_col='district', time_col='date'):
+        """Anomaly in units of the district's standard deviation for the calendar month"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.anomaly(panel_data, group_col, time_col) /
+                    self.lookup(panel_data, 'std', group_col, time_col))
+
+class Climatology:
+    """Build and cache monthly climatologies over a baseline period"""
+    
+    VERSION = 2
+    
+    def __init__(self, config=None):
+        self.cache_dir = getattr(config, 'CLIMATOLOGY_DIR', None)
+        self.baseline = getattr(config, 'CLIMATOLOGY_BASELINE', None)
+        self.percentiles = tuple(getattr(config, 'CLIMATOLOGY_PERCENTILES', (10, 50, 90)))
+    
+    def load_or_build(self, panel_data, variable, group_col='district', time_col='date'):
+        """Load the climatology for this baseline from the cache, building it once
+        
+        The cache holds one file per variable and configured baseline period,
+        with the fingerprint of the rows it was built from; changed rows
+        overwrite it rather than adding another file.
+        """
+        baseline_data = self._baseline_rows(panel_data, time_col)
+        if self.cache_dir is None:
+            return self.build(baseline_data, variable, group_col, time_col)
+        
+        fingerprint = self._fingerprint(baseline_data, variable, group_col, time_col)
+        path = self._path(variable)
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as stored:
+                if 'fingerprint' in stored.files and str(stored['fingerprint']) == fingerprint:
+                    return MonthlyClimatology(variable, stored['districts'], stored['stats'],
+                                              stored['stat_names'])
+        
+        climatology = self.build(baseline_data, variable, group_col, time_col)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{os.path.splitext(path)[0]}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, fingerprint=np.array(fingerprint), districts=climatology.districts.to_numpy(dtype=str),
+                 stats=climatology.stats, stat_names=np.array(climatology.stat_names))
+        os.replace(tmp_path, path)
+        self._remove_fingerprint_files(variable)
+        return climatology
+    
+    def _path(self, variable):
+        """Cache file of a variable for the configured baseline period"""
+        if self.baseline is None:
+            period = 'full_record'
+        else:
+            period = '_'.join(pd.Timestamp(bound).strftime('%Y%m%d') for bound in self.baseline)
+        return os.path.join(self.cache_dir, f'{variable}_{period}.npz')
+    
+    def _remove_fingerprint_files(self, variable):
+        """Remove files of the previous layout, named by fingerprint, for a variable"""
+        pattern = re.compile(rf'{re.escape(variable)}_[0-9a-f]{{64}}\.npz')
+        for name in os.listdir(self.cache_dir):
+            if pattern.fullmatch(name):
+                os.remove(os.path.join(self.cache_dir, name))
+    
+    def build(self, panel_data, variable, group_col='district', time_col='date'):
+        """Mean, sample std and percentiles for every (district, month) in one pass"""
+        district_codes, districts = pd.factorize(panel_data[group_col])
+        months = pd.DatetimeIndex(panel_data[time_col]).month.to_numpy() - 1
+        values = panel_data[variable].to_numpy(dtype=float)
+        n_groups = len(districts) * 12
+        
+        valid = ~np.isnan(values)
+        keys = (district_codes * 12 + months)[valid]
+        values = values[valid]
+        
+        count = np.bincount(keys, minlength=n_groups).astype(float)
+        total = np.bincount(keys, weights=values, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            deviation = values - mean[keys]
+            std = np.sqrt(np.bincount(keys, weights=deviation ** 2, minlength=n_groups) / (count - 1))
+        
+        # Percentiles by linear interpolation within each group's sorted values;
+        # the trailing NaN pad keeps empty groups at the end indexable
+        sorted_values = np.append(values[np.lexsort((values, keys))], np.nan)
+        starts = np.concatenate([[0], np.cumsum(count)[:-1]])
+        columns = [mean, std]
+        for q in self.percentiles:
+            position = starts + np.maximum(count - 1, 0) * q / 100
+            lower = np.floor(position).astype(int)
+            upper = np.ceil(position).astype(int)
+            result = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+            result[count == 0] = np.nan
+            columns.append(result)
+        
+        stats = np.stack(columns, axis=-1).reshape(len(districts), 12, len(columns))
+        stat_names = ['mean', 'std'] + [f'p{q:g}' for q in self.percentiles]
+        return MonthlyClimatology(variable, np.asarray(districts), stats, stat_names)
+    
+    def _baseline_rows(self, panel_data, time_col):
+        """Rows inside the baseline period (all rows when no baseline is set)"""
+        if self.baseline is None:
+            return panel_data
+        start, end = (pd.Timestamp(bound) for bound in self.baseline)
+        dates = panel_data[time_col]
+        return panel_data[(dates >= start) & (dates <= end)]
+    
+    def _fingerprint(self, baseline_data, variable, group_col, time_col):
+        """Hash the baseline rows of the variable and the build settings"""
+        digest = hashlib.sha256()
+        digest.update(f'{self.VERSION}:{variable}:{self.baseline}:{self.percentiles}'.encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(
+            baseline_data[[group_col, time_col, variable]], index=False
+        ).to_numpy().tobytes())
+        return digest.hexdigest()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Compact dtype plan for the district x month panel
+"""
+
+import pandas as pd
+import numpy as np
+
+# Measures are stored as float32 and calendar fields as small integers
+MEASURE_DTYPE = np.float32
+CALENDAR_DTYPES = {'year': np.int16, 'month': np.int8}
+
+class DistrictStatic:
+    """Static district attributes kept beside the panel and joined on demand"""
+    
+    def __init__(self, district_stats):
+        self.table = district_stats.set_index('district')
+    
+    def __deepcopy__(self, memo):
+        # pandas deep-copies frame attrs on most operations; the table is one row per district
+        copied = DistrictStatic.__new__(DistrictStatic)
+        memo[id(self)] = copied
+        copied.table = self.table.copy(deep=True)
+        return copied
+    
+    @property
+    def columns(self):
+        return list(self.table.columns)
+    
+    def values(self, districts, column):
+        """Per-row values of a static column for a district column"""
+        if isinstance(districts.dtype, pd.CategoricalDtype):
+            positions = self.table.index.get_indexer(districts.cat.categories)
+            positions = positions[districts.cat.codes.to_numpy()]
+        else:
+            positions = self.table.index.get_indexer(districts)
+        return self.table[column].to_numpy()[positions]
+    
+    def join(self, frame, columns=None):
+        """Copy of frame with the missing static columns materialised"""
+        columns = self.columns if columns is None else columns
+        missing = [col for col in columns if col in self.table.columns and col not in frame.columns]
+        if not missing:
+            return frame
+        
+        joined = frame.copy(deep=False)
+        for col in missing:
+            joined[col] = self.values(frame['district'], col)
+        return joined
+
+def compact_panel(districts, dates, tws_matrix, rainfall_matrix):
+    """Lean panel with categorical districts, float32 measures and small-int calendar fields"""
+    n_districts = len(districts)
+    n_dates = len(dates)
+    
+    panel_data = pd.DataFrame({
+        'district': pd.Categorical.from_codes(
+            np.repeat(np.arange(n_districts), n_dates), categories=pd.Index(districts)
+        ),
+        'date': np.tile(dates.to_numpy(), n_districts),
+        'tws_anomaly': np.asarray(tws_matrix, dtype=MEASURE_DTYPE).ravel(),
+        'rainfall': np.asarray(rainfall_matrix, dtype=MEASURE_DTYPE).ravel()
+    })
+    panel_data['year'] = np.tile(dates.year.to_numpy().astype(CALENDAR_DTYPES['year']), n_districts)
+    panel_data['month'] = np.tile(dates.month.to_numpy().astype(CALENDAR_DTYPES['month']), n_districts)
+    return panel_data
+
+def static_table(panel_data):
+    """The DistrictStatic side table of a compact panel, or None"""
+    return panel_data.attrs.get('district_static')
+
+def has_column(panel_data, column):
+    """Whether column is on the panel or available from its side table"""
+    static = static_table(panel_data)
+    return column in panel_data.columns or (static is not None and column in static.columns)
+
+def with_static(panel_data, columns=None):
+    """Panel with static columns joined from its side table (a no-op for full panels)"""
+    static = static_table(panel_data)
+    if static is None:
+        return panel_data
+    return static.join(panel_data, columns)
\ No newline at end of file
@@ -2,66 +2,303 @@
 Main data processing coordinator
 """
 
+import os
 import pandas as pd
 import numpy as np
+from .rolling_features import RollingFeatureEngine, RollingState, expand_features
+from .compact_panel import DistrictStatic, MEASURE_DTYPE, compact_panel
+from .feature_engineer import FeatureEngineer
+from data_ingestion.synthetic_scenario import SyntheticScenario, month_ordinal
+from utils.panel_store import PanelStore
+from utils.shared_panel import SharedPanel
+from utils.feature_store import FeatureStore, content_hash
+
+# Rolling features of the processed panel
+PANEL_ROLLING_FEATURES = [('tws_trend', 6), ('tws_trend', 12), ('rainfall_std', 6)]
+
+# Districts per synthetic noise stream
+PANEL_NOISE_BLOCK = 1024
 
 class DataProcessor:
     """Main data processing coordinator"""
     
+    # Bump when processing changes the panel for unchanged inputs
+    FEATURE_VERSION = 1
+    
+    # Raw inputs and config settings the processed panel depends on
+    PANEL_INPUTS = ('grace', 'rainfall', 'district_stats', 'district_series', 'district_offset')
+    PANEL_CONFIG_KEYS = ('COMPACT_PANEL', 'DATA_SEED', 'DECOMPOSITION_FEATURES', 'DECOMPOSITION_PERIOD',
+                         'DECOMPOSITION_ROBUST_ITERATIONS')
+    
     def __init__(self, config):
         self.config = config
+        self.rolling_engine = RollingFeatureEngine()
+        self.shared_panel = None
+        # Set by incremental runs: fingerprint of the processed history, and the
+        # (fingerprint, watermark) the rolling state was appended to
+        self.history_key = None
+        self.appended = None
     
     def process_all_data(self, raw_data):
         """Process all raw data into analysis-ready format"""
         print("🔧 Processing all data sources...")
+        self.history_key = None
+        self.appended = None
         
-        # Aggregate to district level
-        district_data = []
-        districts = raw_data['district_stats']
-        grace_data = raw_data['grace']
-        rainfall_data = raw_data['rainfall']
+        feature_store = FeatureStore(self.config) if self.config.FEATURE_STORE else None
+        feature_key = self.feature_key(raw_data) if feature_store is not None else None
+        processed_data = feature_store.get(feature_key) if feature_key is not None else None
+        if processed_data is not None:
+            print(f"   💾 Loaded processed panel {feature_key[:12]} from the feature store")
+        else:
+            processed_data = self.process_panel(raw_data)
+            if feature_key is not None:
+                feature_store.put(feature_key, processed_data, self.feature_definitions())
         
-        for _, district in districts.iterrows():
-            district_name = district['district']
-            variation = np.random.normal(0, 2, len(grace_data['dates']))
-            
-            for i, date in enumerate(grace_data['dates']):
-                district_data.append({
-                    'district': district_name,
-                    'date': date,
-                    'tws_anomaly': grace_data['values'][i] + variation[i],
-                    'rainfall': rainfall_data['values'][i] + np.random.normal(0, 10)
-                })
+        # Skip the rewrite when the Parquet panel already holds this feature set, and
+        # append only the new months when it holds the history the rolling state extended
+        panel_store = PanelStore(self.config) if self.config.PARQUET_STORAGE else None
+        store_key = self.history_key or feature_key
+        if panel_store is not None:
+            if self.appended is not None and panel_store.key('panel') == self.appended[0]:
+                new_rows = processed_data[processed_data['date'] > self.appended[1]]
+                panel_store.write('panel', new_rows, append=True, key=store_key)
+            elif store_key is None or panel_store.key('panel') != store_key:
+                panel_store.write('panel', processed_data, key=store_key)
+        
+        if self.config.SHARED_PANEL:
+            self.publish_panel(processed_data)
         
-        district_timeseries = pd.DataFrame(district_data)
+        print(f"      ✅ Processed data: {len(processed_data)} records with enhanced features")
+        return processed_data
+    
+    def process_panel(self, raw_data):
+        """Panel with basic, rolling and derived features, without storing it"""
+        if self.config.COMPACT_PANEL:
+            return self._decomposition_features(self._process_compact(raw_data), raw_data)
         
-        # Create panel data
-        panel_data = district_timeseries.merge(
-            raw_data['district_stats'], on='district', how='left'
-        )
+        # Aggregate to district level and attach district statistics
+        panel_data = self.build_panel(raw_data)
         
         # Add basic features
         panel_data['year'] = panel_data['date'].dt.year
         panel_data['month'] = panel_data['date'].dt.month
         panel_data['water_stress'] = -panel_data['tws_anomaly']
         
-        # Add rolling features for better analysis
-        enhanced_data = []
-        for district in panel_data['district'].unique():
-            district_df = panel_data[panel_data['district'] == district].copy()
-            
-            # Add rolling statistics
-            district_df['tws_trend_6m'] = district_df['tws_anomaly'].rolling(6, min_periods=1).mean()
-            district_df['tws_trend_12m'] = district_df['tws_anomaly'].rolling(12, min_periods=1).mean()
-            district_df['rainfall_std_6m'] = district_df['rainfall'].rolling(6, min_periods=1).std()
-            
-            # Add derived features
-            district_df['crop_stress_index'] = district_df['water_stress'] * district_df['crop_intensity']
-            district_df['water_demand_index'] = district_df['population_density'] * district_df['gw_irrigation_ratio']
+        # Add rolling statistics in one grouped pass
+        processed_data = self._rolling_features(panel_data, raw_data)
+        
+        # Add derived features
+        processed_data['crop_stress_index'] = processed_data['water_stress'] * processed_data['crop_intensity']
+        processed_data['water_demand_index'] = processed_data['population_density'] * processed_data['gw_irrigation_ratio']
+        return self._decomposition_features(processed_data, raw_data)
+    
+    def feature_definitions(self):
+        """Feature definitions and config settings that shape the processed panel"""
+        return {
+            'version': self.FEATURE_VERSION,
+            'rolling_features': PANEL_ROLLING_FEATURES,
+            'config': {key: getattr(self.config, key) for key in self.PANEL_CONFIG_KEYS}
+        }
+    
+    def feature_key(self, raw_data):
+        """Feature store fingerprint of a run, or None when its panel is not reproducible"""
+        if self.config.DATA_SEED is None:
+            # Panel noise is drawn from fresh entropy
+            return None
+        
+        inputs = {}
+        for key in self.PANEL_INPUTS:
+            value = raw_data.get(key)
+            if isinstance(value, dict) and 'values' in value:
+                # The series itself, not ingestion metadata such as deltas
+                value = {'dates': value.get('dates'), 'values': value['values']}
+            if value is not None:
+                inputs[key] = content_hash(value)
+        
+        definitions = self.feature_definitions()
+        return FeatureStore.make_key(inputs, definitions, definitions.pop('config'))
+    
+    def publish_panel(self, processed_data):
+        """Publish the processed panel in shared memory; workers find it via frame attrs"""
+        self.release_panel()
+        self.shared_panel = SharedPanel.publish(processed_data)
+        processed_data.attrs['shared_panel'] = self.shared_panel
+        return self.shared_panel
+    
+    def release_panel(self):
+        """Unlink the shared panel published by this processor, if any"""
+        if self.shared_panel is not None:
+            self.shared_panel.close()
+            self.shared_panel = None
+    
+    def _process_compact(self, raw_data):
+        """Memory-lean processing: static district attributes stay in a side table"""
+        districts = raw_data['district_stats']
+        dates = pd.DatetimeIndex(raw_data['grace']['dates'])
+        tws_matrix, rainfall_matrix = self._district_matrices(raw_data, len(districts), len(dates))
+        
+        panel_data = compact_panel(districts['district'].to_numpy(), dates, tws_matrix, rainfall_matrix)
+        del tws_matrix, rainfall_matrix
+        panel_data['water_stress'] = -panel_data['tws_anomaly']
+        
+        processed_data = self._rolling_features(panel_data, raw_data, dtype=MEASURE_DTYPE)
+        del panel_data
+        
+        # Per-district indices live in the side table; only row-varying ones are broadcast
+        static_stats = districts.copy()
+        static_stats['water_demand_index'] = static_stats['population_density'] * static_stats['gw_irrigation_ratio']
+        district_static = DistrictStatic(static_stats)
+        crop_intensity = district_static.values(processed_data['district'], 'crop_intensity')
+        processed_data['crop_stress_index'] = (
+            processed_data['water_stress'].to_numpy() * crop_intensity
+        ).astype(MEASURE_DTYPE)
+        
+        processed_data.attrs['district_static'] = district_static
+        return processed_data
+    
+    def _decomposition_features(self, processed_data, raw_data):
+        """Add the configured DECOMPOSITION_FEATURES through the feature registry"""
+        features = self.config.DECOMPOSITION_FEATURES
+        if not features:
+            return processed_data
+        
+        processed_data = FeatureEngineer(self.config).create_features(processed_data, raw_data, features)
+        if self.config.COMPACT_PANEL:
+            processed_data[features] = processed_data[features].astype(MEASURE_DTYPE)
+        return processed_data
+    
+    def _rolling_features(self, panel_data, raw_data, dtype=None):
+        """Rolling features, computing only new months when a rolling state is stored"""
+        incremental = self.config.INCREMENTAL_INGESTION and self.config.PARQUET_STORAGE
+        state_path = os.path.join(self.config.ROLLING_STATE_DIR, 'panel.npz')
+        if incremental:
+            processed_data = self._append_rolling_features(panel_data, raw_data, state_path, dtype)
+            if processed_data is not None:
+                return processed_data
+        
+        processed_data = self.rolling_engine.compute(panel_data, PANEL_ROLLING_FEATURES, dtype=dtype)
+        if incremental:
+            state = self.rolling_engine.state(processed_data, PANEL_ROLLING_FEATURES)
+            self._save_history(state, processed_data, state_path)
+        return processed_data
+    
+    def _append_rolling_features(self, panel_data, raw_data, state_path, dtype):
+        """Reuse the stored features up to the state watermark and roll the state forward
+        
+        The history is checked against the fingerprint kept in the state
+        file instead of being read back. Returns None whenever it does not
+        match, so the caller falls back to a full recomputation.
+        """
+        state = RollingState.load(state_path)
+        delta = raw_data.get('delta') or {}
+        if (state is None or not state.matches(expand_features(PANEL_ROLLING_FEATURES)) or
+                delta.get('full_reload') or state.fingerprint is None):
+            return None
+        
+        df, _ = self.rolling_engine.sort_panel(panel_data)
+        if not np.array_equal(np.sort(state.districts.to_numpy(dtype=str)),
+                              np.sort(pd.unique(df['district'].astype(str)))):
+            return None
+        
+        old = (df['date'] <= state.watermark).to_numpy()
+        if self._history_fingerprint(df[old], state.sources) != state.fingerprint:
+            return None
+        
+        previous = (state.fingerprint, state.watermark)
+        if (~old).any():
+            updated = state.update(df[~old], dtype=dtype)
+        for col in state.columns:
+            values = np.empty(len(df), dtype=dtype or float)
+            values[old] = state.history[col]
+            if (~old).any():
+                values[~old] = updated[col].to_numpy()
+            df[col] = values
+        
+        self._save_history(state, df, state_path)
+        self.appended = previous
+        print(f"      ✅ Rolling features updated for {(~old).sum()} new rows")
+        return df
+    
+    def _save_history(self, state, processed_data, state_path):
+        """Keep the features and fingerprint of processed_data in the rolling state file"""
+        state.fingerprint = self._history_fingerprint(processed_data, state.sources)
+        state.history = {col: processed_data[col].to_numpy() for col in state.columns}
+        state.save(state_path)
+        self.history_key = state.fingerprint
+    
+    @staticmethod
+    def _history_fingerprint(panel_rows, sources):
+        """Fingerprint of the keys and source values of panel rows, in row order"""
+        # Raw arrays hash far faster than per-row district names
+        codes, districts = pd.factorize(panel_rows['district'])
+        arrays = {col: panel_rows[col].to_numpy() for col in ['date'] + sources}
+        return content_hash({'districts': [str(name) for name in districts], 'codes': codes, **arrays})
+    
+    def _district_matrices(self, raw_data, n_districts, n_dates):
+        """District x month TWS and rainfall matrices"""
+        grace_data = raw_data['grace']
+        rainfall_data = raw_data['rainfall']
+        
+        if 'district_series' in raw_data:
+            # District-level series supplied directly, e.g. by SyntheticScenario
+            tws_matrix = raw_data['district_series']['tws_anomaly']
+            rainfall_matrix = raw_data['district_series']['rainfall']
+        else:
+            # District-specific noise keyed by month and district block, so appended
+            # months leave history unchanged and any district range can be drawn alone
+            variation, rainfall_noise = self._panel_noise(
+                pd.DatetimeIndex(grace_data['dates'])[:n_dates],
+                raw_data.get('district_offset', 0), n_districts
+            )
             
-            enhanced_data.append(district_df)
+            tws_values = np.asarray(grace_data['values'], dtype=float)[:n_dates]
+            rainfall_values = np.asarray(rainfall_data['values'], dtype=float)[:n_dates]
+            tws_matrix = tws_values[np.newaxis, :] + variation
+            rainfall_matrix = rainfall_values[np.newaxis, :] + rainfall_noise
         
-        processed_data = pd.concat(enhanced_data, ignore_index=True)
+        return tws_matrix, rainfall_matrix
+    
+    def _panel_noise(self, dates, start, n_districts):
+        """TWS and rainfall noise for districts [start, start + n_districts)"""
+        scenario = SyntheticScenario(self.config)
+        stop = start + n_districts
+        variation = np.empty((n_districts, len(dates)))
+        rainfall_noise = np.empty((n_districts, len(dates)))
         
-        print(f"      ✅ Processed data: {len(processed_data)} records with enhanced features")
-        return processed_data
\ No newline at end of file
+        first_block = start // PANEL_NOISE_BLOCK
+        last_block = (stop - 1) // PANEL_NOISE_BLOCK if n_districts else first_block - 1
+        for block in range(first_block, last_block + 1):
+            block_start = block * PANEL_NOISE_BLOCK
+            lo, hi = max(start, block_start), min(stop, block_start + PANEL_NOISE_BLOCK)
+            rows, draws = slice(lo - start, hi - start), slice(lo - block_start, hi - block_start)
+            for i, date in enumerate(dates):
+                rng = scenario.generator('panel', month_ordinal(date), block)
+                variation[rows, i] = rng.normal(0, 2, PANEL_NOISE_BLOCK)[draws]
+                rainfall_noise[rows, i] = rng.normal(0, 10, PANEL_NOISE_BLOCK)[draws]
+        
+        return variation, rainfall_noise
+    
+    def build_panel(self, raw_data):
+        """Build the district x month panel from national series and district stats"""
+        districts = raw_data['district_stats']
+        n_districts = len(districts)
+        dates = pd.DatetimeIndex(raw_data['grace']['dates'])
+        n_dates = len(dates)
+        tws_matrix, rainfall_matrix = self._district_matrices(raw_data, n_districts, n_dates)
+        
+        # Rows are ordered district-major, dates ascending within each district
+        panel_data = pd.DataFrame({
+            'district': np.repeat(districts['district'].to_numpy(), n_dates),
+            'date': np.tile(dates.to_numpy(), n_districts),
+            'tws_anomaly': np.asarray(tws_matrix, dtype=float).ravel(),
+            'rainfall': np.asarray(rainfall_matrix, dtype=float).ravel()
+        })
+        
+        # Broadcast static district attributes instead of merging on name
+        row_positions = np.repeat(np.arange(n_districts), n_dates)
+        for col in districts.columns:
+            if col != 'district':
+                panel_data[col] = districts[col].to_numpy()[row_positions]
+        
+        return panel_data
\ No newline at end of file
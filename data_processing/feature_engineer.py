@@ -2,81 +2,158 @@
 Feature engineering for risk modeling
 """
 
-import pandas as pd
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from .rolling_features import RollingFeatureEngine, expand_features, feature_columns, source_columns
+from .climatology import Climatology
+from .feature_registry import FeaturePlanner
+from .panel_cube import PanelCube
+from utils.helpers import StatisticsCalculator
+from utils.shared_arrays import SharedArray
+from utils.shared_panel import SharedPanel
 
 class FeatureEngineer:
     """Create features for risk modeling"""
     
     def __init__(self, config):
         self.config = config
+        self.rolling_engine = RollingFeatureEngine()
+        self.climatology = Climatology(config)
+        self.planner = FeaturePlanner()
+        self._rainfall_climatology = None
+        self._tws_decomposition = None
     
-    def create_features(self, district_data, raw_data):
-        """Create engineered features"""
-        # Merge with district statistics
-        panel_data = district_data.merge(
-            raw_data['district_stats'], on='district', how='left'
-        )
+    def create_features(self, district_data, raw_data, features=None):
+        """Create engineered features
         
-        # Add temporal features
-        panel_data['quarter'] = panel_data['date'].dt.quarter
-        panel_data['season'] = panel_data['month'] % 12 // 3 + 1
+        Only the requested features and the inputs they need are computed;
+        by default those consumed downstream, the model and decomposition
+        features and the weighted risk factors.
+        """
+        requested = list(features or self.consumed_features())
+        steps, missing = self.planner.plan(requested, district_data.columns)
         
-        # Calculate derived variables
-        panel_data['water_stress'] = -panel_data['tws_anomaly']  # Higher = more stress
+        # Merge only the district statistics the plan reads
+        district_stats = raw_data['district_stats']
+        unknown = sorted(missing - set(district_stats.columns))
+        if unknown:
+            raise ValueError(f"Unknown features: {unknown}")
+        if missing:
+            features_data = district_data.merge(
+                district_stats[['district'] + sorted(missing)], on='district', how='left'
+            )
+        else:
+            features_data = district_data.copy(deep=False)
         
-        # Rainfall anomalies (deviation from monthly mean)
-        panel_data['rainfall_anomaly'] = panel_data.groupby(['district', 'month'])['rainfall'].transform(
-            lambda x: x - x.mean()
-        )
+        self._rainfall_climatology = None
+        self._tws_decomposition = None
+        for step in steps:
+            if isinstance(step, list):
+                # Rolling statistics and depletion metrics, per district shard when large
+                features_data = self._district_features(features_data, self._rolling_request(step))
+            else:
+                features_data[step.name] = step.compute(self, features_data)
+        features_data = features_data.drop(columns=self.planner.transient(steps, requested))
         
-        # Create rolling features for each district
-        features_list = []
+        print(f"      ✅ Engineered features: {len(features_data.columns)} total features")
+        return features_data
+    
+    def consumed_features(self):
+        """Features read by model training and risk classification"""
+        return list(dict.fromkeys(
+            self.config.MODEL_FEATURES + self.config.DECOMPOSITION_FEATURES + list(self.config.RISK_WEIGHTS)
+        ))
+    
+    def rainfall_climatology(self, panel_data):
+        """Rainfall climatology of the panel, loaded once per create_features call"""
+        if self._rainfall_climatology is None:
+            self._rainfall_climatology = self.climatology.load_or_build(panel_data, 'rainfall')
+        return self._rainfall_climatology
+    
+    def tws_decomposition(self, panel_data, component):
+        """Per-row component of every district's TWS decomposition
         
-        for district in panel_data['district'].unique():
-            district_df = panel_data[panel_data['district'] == district].sort_values('date').copy()
-            
-            # Rolling statistics for different time windows
-            for window in [6, 12, 24]:
-                # TWS trends
-                district_df[f'tws_trend_{window}m'] = district_df['tws_anomaly'].rolling(
-                    window=window, min_periods=1
-                ).mean()
-                
-                # Rainfall variability
-                district_df[f'rainfall_std_{window}m'] = district_df['rainfall'].rolling(
-                    window=window, min_periods=1
-                ).std()
-                
-                # Water stress trends
-                district_df[f'stress_trend_{window}m'] = district_df['water_stress'].rolling(
-                    window=window, min_periods=1
-                ).mean()
-            
-            # Crop stress index (combination of water stress and agricultural factors)
-            district_df['crop_stress_index'] = (
-                district_df['water_stress'] * district_df['crop_intensity'] +
-                abs(district_df['rainfall_anomaly']) * 0.5 +
-                district_df['gw_irrigation_ratio'] * 2
+        component is 'trend', 'seasonal', 'residual' or 'deseasonalized_rate',
+        the monthly change of the deseasonalised series. All districts are
+        decomposed together once per create_features call.
+        """
+        if self._tws_decomposition is None:
+            cube = PanelCube.from_frame(panel_data, ['tws_anomaly'])
+            tws = cube['tws_anomaly'].astype(float)
+            decomposition = StatisticsCalculator.calculate_seasonal_decompositions(
+                tws, self.config.DECOMPOSITION_PERIOD, self.config.DECOMPOSITION_ROBUST_ITERATIONS
             )
-            
-            # Rainfall variability index
-            district_df['rainfall_variability'] = (
-                district_df['rainfall_std_12m'] / 
-                district_df['rainfall'].rolling(window=12, min_periods=1).mean()
-            )
-            
-            # Depletion metrics
-            district_df['depletion_rate'] = district_df['tws_anomaly'].diff()
-            district_df['depletion_acceleration'] = district_df['depletion_rate'].diff()
-            
-            # Water availability index
-            district_df['water_availability'] = (
-                district_df['rainfall'] - district_df['water_stress'] * 10
+            decomposition['deseasonalized_rate'] = np.diff(
+                tws - decomposition['seasonal'], axis=1, prepend=np.nan
             )
+            self._tws_decomposition = (decomposition, cube.districts, cube.dates)
+        
+        # Rows are located per call; the panel may have been reordered in between
+        decomposition, districts, dates = self._tws_decomposition
+        district_positions = districts.get_indexer(np.asarray(panel_data['district']))
+        date_positions = dates.get_indexer(panel_data['date'])
+        return decomposition[component][district_positions, date_positions]
+    
+    def _rolling_request(self, features):
+        """RollingFeatureEngine arguments for a batch of rolling Features"""
+        return {
+            'features': [f.rolling for f in features if isinstance(f.rolling, tuple)],
+            'depletion': [f.rolling for f in features if not isinstance(f.rolling, tuple)]
+        }
+    
+    def _district_features(self, panel_data, request):
+        """Rolling and depletion features, sharded across processes for large panels"""
+        n_workers = self.config.FEATURE_WORKERS or os.cpu_count() or 1
+        n_shards = -(-len(panel_data) // self.config.FEATURE_SHARD_ROWS)
+        if n_workers < 2 or n_shards < 2:
+            return self.rolling_engine.compute(panel_data, **request)
+        
+        df, codes = self.rolling_engine.sort_panel(panel_data)
+        requested = expand_features(request['features'])
+        sources = source_columns(requested, request['depletion'])
+        columns = feature_columns(requested, request['depletion'])
+        
+        # Shards end on district boundaries close to equal row counts
+        district_starts = np.flatnonzero(np.diff(codes)) + 1
+        if len(district_starts) == 0:
+            return self.rolling_engine.compute(df, **request)
+        targets = np.arange(1, n_shards) * len(df) // n_shards
+        cuts = np.unique(district_starts[np.searchsorted(district_starts, targets).clip(max=len(district_starts) - 1)])
+        bounds = np.concatenate([[0], cuts, [len(df)]])
+        
+        # Workers attach to the shared panel; only specs and row ranges are pickled
+        shared_panel = SharedPanel.publish(df[['district', 'date'] + sources])
+        outputs = SharedArray.create((len(columns), len(df)))
+        try:
+            tasks = [
+                (start, stop, shared_panel.spec, outputs.spec, request, columns)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+                list(executor.map(_district_feature_shard, tasks))
             
-            features_list.append(district_df)
+            for row, col in enumerate(columns):
+                df[col] = outputs.array[row].copy()
+        finally:
+            shared_panel.close()
+            outputs.close()
         
-        features_data = pd.concat(features_list, ignore_index=True)
-        print(f"      ✅ Engineered features: {len(features_data.columns)} total features")
-        return features_data
\ No newline at end of file
+        return df
+
+
+def _district_feature_shard(task):
+    """Compute rolling features for one contiguous block of districts in shared memory"""
+    start, stop, panel_spec, output_spec, request, columns = task
+    shared_panel = SharedPanel.attach(panel_spec)
+    outputs = SharedArray.attach(output_spec)
+    try:
+        shard = shared_panel.to_frame(rows=slice(start, stop)).copy()
+        result = RollingFeatureEngine().compute(shard, **request)
+        for row, col in enumerate(columns):
+            outputs.array[row, start:stop] = result[col].to_numpy()
+        del shard, result
+    finally:
+        shared_panel.close()
+        outputs.close()
+    return start, stop
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Declarative feature registry and dependency planner
+"""
+
+from .rolling_features import ROLLING_FEATURES, DEPLETION_FEATURES
+
+# Seasonal decomposition features, opted into with Config.DECOMPOSITION_FEATURES
+DECOMPOSITION_FEATURES = ('tws_seasonal', 'tws_decomposed_trend', 'tws_deseasonalized',
+                          'deseasonalized_depletion_rate')
+
+class Feature:
+    """A named feature column, the columns it reads and how it is computed
+    
+    Row features set compute(engineer, df) returning the column values.
+    Rolling features set rolling to a (prefix, window) pair of
+    ROLLING_FEATURES, or to a DEPLETION_FEATURES name, and are computed
+    together in one grouped pass. Transient features feed others and are
+    dropped from the result unless requested themselves.
+    """
+    
+    def __init__(self, name, inputs, compute=None, rolling=None, transient=False):
+        self.name = name
+        self.inputs = list(inputs)
+        self.compute = compute
+        self.rolling = rolling
+        self.transient = transient
+
+def _crop_stress_index(engineer, df):
+    """Water stress scaled by crop intensity, plus rainfall and irrigation pressure"""
+    return (
+        df['water_stress'] * df['crop_intensity'] +
+        abs(df['rainfall_anomaly']) * 0.5 +
+        df['gw_irrigation_ratio'] * 2
+    )
+
+FEATURES = [
+    # Temporal features
+    Feature('quarter', ['date'], lambda engineer, df: df['date'].dt.quarter),
+    Feature('season', ['month'], lambda engineer, df: df['month'] % 12 // 3 + 1),
+    
+    # Higher = more stress
+    Feature('water_stress', ['tws_anomaly'], lambda engineer, df: -df['tws_anomaly']),
+    
+    # Deviation from the district's monthly rainfall climatology
+    Feature('rainfall_anomaly', ['district', 'date', 'rainfall'],
+            lambda engineer, df: engineer.rainfall_climatology(df).anomaly(df)),
+    Feature('rainfall_standardized_anomaly', ['district', 'date', 'rainfall'],
+            lambda engineer, df: engineer.rainfall_climatology(df).standardized_anomaly(df)),
+    
+    # Seasonal decomposition of each district's TWS series
+    Feature('tws_seasonal', ['district', 'date', 'tws_anomaly'],
+            lambda engineer, df: engineer.tws_decomposition(df, 'seasonal')),
+    Feature('tws_decomposed_trend', ['district', 'date', 'tws_anomaly'],
+            lambda engineer, df: engineer.tws_decomposition(df, 'trend')),
+    Feature('tws_deseasonalized', ['tws_anomaly', 'tws_seasonal'],
+            lambda engineer, df: df['tws_anomaly'] - df['tws_seasonal']),
+    Feature('deseasonalized_depletion_rate', ['district', 'date', 'tws_anomaly'],
+            lambda engineer, df: engineer.tws_decomposition(df, 'deseasonalized_rate')),
+    
+    # Combination of water stress and agricultural factors
+    Feature('crop_stress_index',
+            ['water_stress', 'crop_intensity', 'rainfall_anomaly', 'gw_irrigation_ratio'],
+            _crop_stress_index),
+    Feature('rainfall_variability', ['rainfall_std_12m', 'rainfall_mean_12m'],
+            lambda engineer, df: df['rainfall_std_12m'] / df['rainfall_mean_12m']),
+    Feature('water_availability', ['rainfall', 'water_stress'],
+            lambda engineer, df: df['rainfall'] - df['water_stress'] * 10),
+]
+
+FEATURES += [
+    Feature(f'{prefix}_{window}m', [source], rolling=(prefix, window),
+            transient=(prefix == 'rainfall_mean'))
+    for window in (6, 12, 24)
+    for prefix, (source, _) in ROLLING_FEATURES.items()
+]
+FEATURES += [Feature(name, ['tws_anomaly'], rolling=name) for name in DEPLETION_FEATURES]
+
+class FeaturePlanner:
+    """Resolve requested features to the minimal set of computations"""
+    
+    def __init__(self, features=None):
+        self.features = {feature.name: feature for feature in (features or FEATURES)}
+    
+    def plan(self, requested, available):
+        """Steps computing every requested feature missing from available columns
+        
+        Each step is either one row Feature or a list of rolling Features that
+        are ready at the same time, ordered so inputs precede their consumers.
+        Returns (steps, missing), missing being the unregistered input columns
+        that must come from elsewhere, e.g. district statistics.
+        """
+        available = set(available)
+        needed, missing = {}, set()
+        pending = [name for name in requested if name not in available]
+        while pending:
+            name = pending.pop()
+            if name in needed or name in available or name in missing:
+                continue
+            if name not in self.features:
+                missing.add(name)
+                continue
+            needed[name] = self.features[name]
+            pending.extend(needed[name].inputs)
+        
+        # Kahn-style waves; rolling features wait until no row feature is ready,
+        # so every rolling feature ready at once shares a single grouped pass
+        ready = available | missing
+        steps = []
+        while needed:
+            runnable = [f for f in needed.values() if set(f.inputs) <= ready]
+            row_features = [f for f in runnable if f.rolling is None]
+            step = row_features[:1] if row_features else runnable
+            if not step:
+                raise ValueError(f"Cyclic feature dependencies among: {sorted(needed)}")
+            steps.append(step[0] if row_features else step)
+            for feature in step:
+                ready.add(feature.name)
+                del needed[feature.name]
+        
+        return steps, missing
+    
+    def transient(self, steps, requested):
+        """Transient columns computed by a plan that were not themselves requested"""
+        computed = [f for step in steps for f in (step if isinstance(step, list) else [step])]
+        return [f.name for f in computed if f.transient and f.name not in requested]
\ No newline at end of file
@@ -3,10 +3,14 @@ Create panel dataset from all data sources
 """
 
 import pandas as pd
+from .climatology import Climatology
 
 class PanelCreator:
     """Create panel dataset for analysis"""
     
+    def __init__(self, config=None):
+        self.climatology = Climatology(config)
+    
     def create_panel_dataset(self, district_timeseries, raw_data):
         """Merge all data into panel format"""
         print("   🔄 Creating panel dataset...")
@@ -23,9 +27,7 @@ class PanelCreator:
         
         # Calculate derived variables
         panel_data['water_stress'] = -panel_data['tws_anomaly']  # Higher = more stress
-        panel_data['rainfall_anomaly'] = panel_data.groupby(['district', 'month'])['rainfall'].transform(
-            lambda x: x - x.mean()
-        )
+        panel_data['rainfall_anomaly'] = self.climatology.load_or_build(panel_data, 'rainfall').anomaly(panel_data)
         
         print(f"   ✅ Panel dataset created: {len(panel_data)} records")
         return panel_data
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Dense district x date x feature array representation of the panel
+"""
+
+import pandas as pd
+import numpy as np
+
+# Districts per block of float64 rolling intermediates
+ROLLING_BLOCK_ROWS = 2048
+
+class PanelCube:
+    """Panel held as one contiguous (feature, district, date) array with index maps
+    
+    Each feature is a C-contiguous (district, date) block, so a complete,
+    district-major long frame converts to and from the cube without copying
+    its measure columns.
+    """
+    
+    def __init__(self, values, districts, dates, features, observed=None, dtypes=None):
+        self.values = values
+        self.districts = pd.Index(districts)
+        self.dates = pd.DatetimeIndex(dates)
+        self.features = pd.Index(features)
+        self.observed = observed  # (district, date) mask of rows present, None when complete
+        self.dtypes = dtypes if dtypes is not None else {}
+        
+        self.district_index = pd.Series(np.arange(len(self.districts)), index=self.districts)
+        self.date_index = pd.Series(np.arange(len(self.dates)), index=self.dates)
+    
+    @classmethod
+    def from_frame(cls, panel_data, features=None, group_col='district', time_col='date',
+                   dtype=None):
+        """Build a cube from a long panel; missing (district, date) cells become NaN
+        
+        features defaults to every numeric column. Districts keep their order
+        of appearance and dates are sorted, so a district-major panel with
+        ascending dates maps onto the cube as a view of its measure block.
+        """
+        if features is None:
+            features = [col for col in panel_data.select_dtypes('number').columns
+                        if col not in (group_col, time_col)]
+        features = list(features)
+        
+        district_codes, districts = pd.factorize(panel_data[group_col])
+        date_codes, dates = pd.factorize(panel_data[time_col], sort=True)
+        n_districts, n_dates = len(districts), len(dates)
+        
+        measures = panel_data[features].to_numpy(dtype=dtype)
+        if dtype is None and not np.issubdtype(measures.dtype, np.floating):
+            measures = measures.astype(float)
+        measures = measures.T
+        
+        # Row positions in the cube, built in place to spare a row-sized temporary
+        positions = district_codes
+        positions *= n_dates
+        positions += date_codes
+        del date_codes
+        if len(positions) == n_districts * n_dates and _is_range(positions):
+            values = np.ascontiguousarray(measures).reshape(len(features), n_districts, n_dates)
+            observed = None
+        else:
+            values = np.full((len(features), n_districts * n_dates), np.nan, dtype=measures.dtype)
+            values[:, positions] = measures
+            values = values.reshape(len(features), n_districts, n_dates)
+            observed = np.zeros(n_districts * n_dates, dtype=bool)
+            observed[positions] = True
+            observed = observed.reshape(n_districts, n_dates)
+        
+        if isinstance(panel_data[group_col].dtype, pd.CategoricalDtype):
+            districts = pd.Index(np.asarray(districts))
+        dtypes = {col: panel_data[col].dtype for col in features}
+        dtypes[group_col] = panel_data[group_col].dtype
+        return cls(values, districts, dates, features, observed, dtypes)
+    
+    @property
+    def shape(self):
+        """(districts, dates, features)"""
+        return (len(self.districts), len(self.dates), len(self.features))
+    
+    @property
+    def complete(self):
+        """Whether every district has a row for every date"""
+        return self.observed is None
+    
+    @property
+    def array(self):
+        """(district, date, feature) view of the cube"""
+        return self.values.transpose(1, 2, 0)
+    
+    def __getitem__(self, feature):
+        """(district, date) view of one feature"""
+        return self.values[self.features.get_loc(feature)]
+    
+    def __setitem__(self, feature, data):
+        """Overwrite a feature in place, or append it (reallocating the cube)"""
+        data = np.broadcast_to(np.asarray(data), self.shape[:2])
+        if feature in self.features:
+            self.values[self.features.get_loc(feature)] = data
+        else:
+            self.values = np.concatenate(
+                [self.values, data[np.newaxis].astype(self.values.dtype)], axis=0
+            )
+            self.features = self.features.append(pd.Index([feature]))
+    
+    def rolling(self, feature, window, stat='mean', min_periods=1, dtype=None):
+        """Trailing rolling mean or sample std along the date axis of every district
+        
+        Follows pandas: NaNs are skipped, a window needs min_periods values
+        (None means a full window) and std uses ddof=1. Districts are rolled
+        in blocks, so float64 intermediates stay block-sized and only the
+        result, stored as dtype (default float64), spans the whole cube.
+        """
+        if stat not in ('mean', 'std'):
+            raise ValueError(f"Unsupported rolling statistic: {stat}")
+        source = self[feature]
+        result = np.empty(source.shape, dtype=dtype or float)
+        for start in range(0, source.shape[0], ROLLING_BLOCK_ROWS):
+            block = slice(start, start + ROLLING_BLOCK_ROWS)
+            result[block] = _rolling_block(source[block], window, stat, min_periods)
+        return result
+    
+    def diff(self, feature, periods=1):
+        """Difference along the date axis of every district"""
+        x = self[feature]
+        result = np.full(x.shape, np.nan, dtype=np.result_type(x.dtype, np.float32))
+        result[:, periods:] = x[:, periods:] - x[:, :-periods]
+        return result
+    
+    def last_valid(self, data):
+        """Last non-NaN value of a (district, date) array per district"""
+        valid = ~np.isnan(data)
+        last = data.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        values = data[np.arange(data.shape[0]), last]
+        values[~valid.any(axis=1)] = np.nan
+        return values
+    
+    def last_observed(self):
+        """Date position of each district's last row"""
+        if self.observed is None:
+            return np.full(len(self.districts), len(self.dates) - 1)
+        return len(self.dates) - 1 - np.argmax(self.observed[:, ::-1], axis=1)
+    
+    def latest(self, group_col='district', time_col='date'):
+        """One row per district with the last non-null value of every feature"""
+        last_dates = self.dates.to_numpy()[self.last_observed()]
+        latest = pd.DataFrame({group_col: self._district_column(self.districts.to_numpy(), group_col),
+                               time_col: last_dates})
+        for feature in self.features:
+            latest[feature] = self._cast(feature, self.last_valid(self[feature]))
+        return latest
+    
+    def to_frame(self, group_col='district', time_col='date'):
+        """Long district-major frame whose measure columns view the cube"""
+        n_districts, n_dates, n_features = self.shape
+        
+        frame = pd.DataFrame(self.values.reshape(n_features, -1).T,
+                             columns=self.features, copy=False)
+        frame.insert(0, group_col, self._district_column(
+            np.repeat(self.districts.to_numpy(), n_dates), group_col
+        ))
+        frame.insert(1, time_col, np.tile(self.dates.to_numpy(), n_districts))
+        if self.observed is not None:
+            frame = frame[self.observed.ravel()].reset_index(drop=True)
+        return frame
+    
+    def _district_column(self, districts, group_col):
+        """District names in the dtype of the source panel"""
+        dtype = self.dtypes.get(group_col)
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical(districts, dtype=dtype)
+        return districts
+    
+    def _cast(self, feature, values):
+        """Restore the source dtype of a feature where no values are missing"""
+        dtype = self.dtypes.get(feature)
+        if dtype is None or np.isnan(values).any():
+            return values
+        return values.astype(dtype, copy=False)
+
+
+def _is_range(positions, block=1 << 20):
+    """Whether positions equal 0..n-1, checked blockwise"""
+    for start in range(0, len(positions), block):
+        chunk = positions[start:start + block]
+        if chunk[0] != start or not np.array_equal(chunk, np.arange(start, start + len(chunk))):
+            return False
+    return True
+
+
+def _rolling_block(values, window, stat, min_periods):
+    """Trailing rolling mean or std of a block of district rows"""
+    min_periods = window if min_periods is None else min_periods
+    x = values.astype(float)
+    valid = ~np.isnan(x)
+    
+    # Centre each district so the running sums of squares stay well conditioned
+    centre = np.zeros((x.shape[0], 1))
+    has_values = valid.any(axis=1)
+    centre[has_values, 0] = np.nanmean(x[has_values], axis=1)
+    x = np.where(valid, x - centre, 0.0)
+    
+    def window_sum(a):
+        cumulative = np.zeros((a.shape[0], a.shape[1] + 1))
+        np.cumsum(a, axis=1, out=cumulative[:, 1:])
+        start = np.maximum(np.arange(1, a.shape[1] + 1) - window, 0)
+        return cumulative[:, 1:] - cumulative[:, start]
+    
+    count = window_sum(valid.astype(float))
+    total = window_sum(x)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        if stat == 'mean':
+            result = mean + centre
+        else:
+            variance = (window_sum(x * x) - total * mean) / (count - 1)
+            result = np.sqrt(np.maximum(variance, 0))
+            result[count < 2] = np.nan
+    
+    result[count < max(min_periods, 1)] = np.nan
+    return result
\ No newline at end of file
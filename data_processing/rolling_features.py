@@ -0,0 +1,277 @@
+"""
+Shared rolling feature engine for district panels
+"""
+
+import os
+import json
+import pandas as pd
+import numpy as np
+from .panel_cube import PanelCube
+
+# Rolling feature families: prefix -> (source column, statistic)
+ROLLING_FEATURES = {
+    'tws_trend': ('tws_anomaly', 'mean'),
+    'rainfall_std': ('rainfall', 'std'),
+    'stress_trend': ('water_stress', 'mean'),
+    'rainfall_mean': ('rainfall', 'mean')
+}
+
+# Per-district first and second differences of TWS
+DEPLETION_FEATURES = ('depletion_rate', 'depletion_acceleration')
+
+def expand_features(features, windows=(6, 12, 24)):
+    """(prefix, window) pairs for a mix of prefixes and explicit pairs"""
+    # Plain prefixes expand window by window, matching the legacy column order
+    prefixes = [feature for feature in features if not isinstance(feature, tuple)]
+    requested = [(prefix, window) for window in windows for prefix in prefixes]
+    requested += [tuple(feature) for feature in features if isinstance(feature, tuple)]
+    return requested
+
+def source_columns(requested, depletion=()):
+    """Panel columns read by a set of (prefix, window) features"""
+    return sorted({ROLLING_FEATURES[prefix][0] for prefix, _ in requested} |
+                  ({'tws_anomaly'} if depletion else set()))
+
+def feature_columns(requested, depletion=()):
+    """Columns added for a set of (prefix, window) features, in engine order"""
+    return ([f'{prefix}_{window}m' for prefix, window in requested] +
+            [name for name in DEPLETION_FEATURES if name in depletion])
+
+class RollingFeatureEngine:
+    """Compute per-district rolling features in a single grouped pass"""
+    
+    def __init__(self, group_col='district', time_col='date'):
+        self.group_col = group_col
+        self.time_col = time_col
+    
+    def sort_panel(self, panel_data):
+        """Sort panel once by district (in order of appearance) and date"""
+        codes, _ = pd.factorize(panel_data[self.group_col])
+        order = np.lexsort((panel_data[self.time_col].to_numpy(), codes))
+        if np.array_equal(order, np.arange(len(order))):
+            # Already in panel order; share the columns instead of copying them
+            sorted_data = panel_data.copy(deep=False)
+            sorted_data.index = pd.RangeIndex(len(sorted_data))
+            return sorted_data, codes
+        sorted_data = panel_data.iloc[order].reset_index(drop=True)
+        return sorted_data, codes[order]
+    
+    def compute(self, panel_data, features, windows=(6, 12, 24), min_periods=1,
+                depletion=(), dtype=None):
+        """Add rolling feature columns named '{prefix}_{window}m'
+        
+        features mixes ROLLING_FEATURES prefixes, computed for every window,
+        and explicit (prefix, window) pairs. min_periods=None requires a full
+        window, as pandas does by default. depletion names the columns of
+        DEPLETION_FEATURES to add alongside the rolling ones. dtype, if
+        given, is the storage dtype of the new columns.
+        """
+        df, codes = self.sort_panel(panel_data)
+        requested = expand_features(features, windows)
+        
+        # Batch every source column sharing a (window, statistic) into one call
+        batches = {}
+        for prefix, window in requested:
+            source, stat = ROLLING_FEATURES[prefix]
+            batches.setdefault((window, stat), set()).add(source)
+        
+        # Complete panels roll along the date axis of a dense cube instead of grouping
+        cube = PanelCube.from_frame(df, source_columns(requested, depletion),
+                                    self.group_col, self.time_col)
+        if cube.complete:
+            return self._compute_cube(df, cube, requested, min_periods, depletion, dtype)
+        
+        grouped = df.groupby(codes, sort=False)
+        rolled = {}
+        for (window, stat), sources in batches.items():
+            sources = sorted(sources)
+            result = getattr(
+                grouped[sources].rolling(window=window, min_periods=min_periods), stat
+            )()
+            result = result.reset_index(level=0, drop=True).sort_index()
+            for source in sources:
+                rolled[(source, window, stat)] = result[source].to_numpy(dtype=dtype)
+        
+        for prefix, window in requested:
+            source, stat = ROLLING_FEATURES[prefix]
+            df[f'{prefix}_{window}m'] = rolled[(source, window, stat)]
+        
+        if depletion:
+            depletion_rate = grouped['tws_anomaly'].diff()
+            if 'depletion_rate' in depletion:
+                df['depletion_rate'] = depletion_rate.to_numpy(dtype=dtype)
+            if 'depletion_acceleration' in depletion:
+                df['depletion_acceleration'] = (
+                    depletion_rate.groupby(codes, sort=False).diff().to_numpy(dtype=dtype)
+                )
+        
+        return df
+    
+    def state(self, panel_data, features, windows=(6, 12, 24), min_periods=1, depletion=()):
+        """RollingState holding the trailing rows of each district for later appends"""
+        state = RollingState(expand_features(features, windows), min_periods, depletion)
+        df, codes = self.sort_panel(panel_data)
+        
+        # Right-align each district's last rows in the buffers, oldest first
+        from_end = df.groupby(codes, sort=False).cumcount(ascending=False).to_numpy()
+        keep = from_end < state.length
+        districts = pd.unique(df[self.group_col])
+        state.districts = pd.Index(np.asarray(districts))
+        state.buffers = {}
+        for source in state.sources:
+            buffer = np.full((len(districts), state.length), np.nan)
+            buffer[codes[keep], state.length - 1 - from_end[keep]] = df[source].to_numpy(dtype=float)[keep]
+            state.buffers[source] = buffer
+        state.watermark = df[self.time_col].max()
+        return state
+    
+    def _compute_cube(self, df, cube, requested, min_periods, depletion, dtype):
+        """Rolling and depletion features as axis-wise operations on a PanelCube"""
+        rolled = {}
+        for prefix, window in requested:
+            source, stat = ROLLING_FEATURES[prefix]
+            if (source, window, stat) not in rolled:
+                rolled[(source, window, stat)] = cube.rolling(
+                    source, window, stat, min_periods, dtype=dtype
+                ).ravel()
+            df[f'{prefix}_{window}m'] = rolled[(source, window, stat)]
+        
+        if depletion:
+            depletion_rate = cube.diff('tws_anomaly')
+            if 'depletion_rate' in depletion:
+                df['depletion_rate'] = depletion_rate.ravel().astype(dtype or float, copy=False)
+            if 'depletion_acceleration' in depletion:
+                acceleration = np.full(depletion_rate.shape, np.nan, dtype=depletion_rate.dtype)
+                acceleration[:, 1:] = np.diff(depletion_rate, axis=1)
+                df['depletion_acceleration'] = acceleration.ravel().astype(dtype or float, copy=False)
+        
+        return df
+
+class RollingState:
+    """Trailing per-district values for month-by-month rolling feature updates
+    
+    Each source column keeps a (district, longest window) buffer of its most
+    recent values, so appending a month costs O(districts x windows)
+    regardless of how long the history is. Callers that need the features
+    of past rows too may keep them in history, with a fingerprint of the
+    rows they were computed from, so the state file replaces a reread.
+    """
+    
+    VERSION = 2
+    
+    def __init__(self, requested, min_periods=1, depletion=()):
+        self.requested = [tuple(feature) for feature in requested]
+        self.min_periods = min_periods
+        self.depletion = [name for name in DEPLETION_FEATURES if name in depletion]
+        
+        self.sources = source_columns(self.requested, self.depletion)
+        windows = [window for _, window in self.requested]
+        # Acceleration needs the last three TWS values
+        self.length = max(windows + ([3] if self.depletion else []))
+        
+        self.districts = pd.Index([])
+        self.buffers = {}
+        self.watermark = None
+        self.fingerprint = None
+        self.history = {}
+    
+    @property
+    def columns(self):
+        """Feature columns produced by update, in engine order"""
+        return feature_columns(self.requested, self.depletion)
+    
+    def matches(self, requested, min_periods=1, depletion=()):
+        """Whether this state was built for the same feature request"""
+        return (self.requested == [tuple(feature) for feature in requested] and
+                self.min_periods == min_periods and
+                self.depletion == [name for name in DEPLETION_FEATURES if name in depletion])
+    
+    def update(self, new_rows, group_col='district', time_col='date', dtype=None):
+        """Feature rows for months after the watermark, advancing the state
+        
+        new_rows needs one row per tracked district for every new month.
+        """
+        new_rows = new_rows[new_rows[time_col] > self.watermark]
+        dates = np.sort(new_rows[time_col].unique())
+        positions = self.districts.get_indexer(new_rows[group_col])
+        date_positions = np.searchsorted(dates, new_rows[time_col].to_numpy())
+        if (positions < 0).any() or len(new_rows) != len(dates) * len(self.districts):
+            raise ValueError("New rows must cover every tracked district for each new month")
+        
+        # Scatter the new rows into (source, district, month) blocks
+        incoming = {}
+        for source in self.sources:
+            block = np.full((len(self.districts), len(dates)), np.nan)
+            block[positions, date_positions] = new_rows[source].to_numpy(dtype=float)
+            incoming[source] = block
+        
+        results = {col: np.empty((len(self.districts), len(dates))) for col in self.columns}
+        min_periods = self.min_periods
+        for step in range(len(dates)):
+            for source in self.sources:
+                buffer = self.buffers[source]
+                buffer[:, :-1] = buffer[:, 1:]
+                buffer[:, -1] = incoming[source][:, step]
+            
+            for prefix, window in self.requested:
+                source, stat = ROLLING_FEATURES[prefix]
+                values = self.buffers[source][:, -window:]
+                count = (~np.isnan(values)).sum(axis=1)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    mean = np.nansum(values, axis=1) / count
+                    if stat == 'mean':
+                        result = mean
+                    else:
+                        squares = np.nansum((values - mean[:, np.newaxis]) ** 2, axis=1)
+                        result = np.sqrt(squares / (count - 1))
+                        result[count < 2] = np.nan
+                required = window if min_periods is None else max(min_periods, 1)
+                result[count < required] = np.nan
+                results[f'{prefix}_{window}m'][:, step] = result
+            
+            if self.depletion:
+                tws = self.buffers['tws_anomaly']
+                rate = tws[:, -1] - tws[:, -2]
+                if 'depletion_rate' in self.depletion:
+                    results['depletion_rate'][:, step] = rate
+                if 'depletion_acceleration' in self.depletion:
+                    results['depletion_acceleration'][:, step] = rate - (tws[:, -2] - tws[:, -3])
+        
+        self.watermark = dates[-1]
+        updated = new_rows.copy()
+        for col in self.columns:
+            updated[col] = results[col][positions, date_positions].astype(dtype or float, copy=False)
+        return updated
+    
+    def save(self, path):
+        """Persist the buffers and request as an .npz file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {
+            'version': self.VERSION,
+            'requested': self.requested,
+            'min_periods': self.min_periods,
+            'depletion': self.depletion,
+            'watermark': pd.Timestamp(self.watermark).isoformat(),
+            'fingerprint': self.fingerprint,
+            'history': list(self.history)
+        }
+        np.savez(path, meta=json.dumps(meta), districts=self.districts.to_numpy(dtype=str),
+                 **{f'buffer_{source}': buffer for source, buffer in self.buffers.items()},
+                 **{f'history_{col}': values for col, values in self.history.items()})
+    
+    @classmethod
+    def load(cls, path):
+        """Read a state written by save, or None if missing or from another version"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as stored:
+            meta = json.loads(str(stored['meta']))
+            if meta['version'] != cls.VERSION:
+                return None
+            state = cls(meta['requested'], meta['min_periods'], meta['depletion'])
+            state.districts = pd.Index(stored['districts'])
+            state.buffers = {source: stored[f'buffer_{source}'] for source in state.sources}
+            state.history = {col: stored[f'history_{col}'] for col in meta['history']}
+        state.watermark = pd.Timestamp(meta['watermark'])
+        state.fingerprint = meta['fingerprint']
+        return state
\ No newline at end of file
@@ -4,48 +4,41 @@ Spatial aggregation of satellite data to district level
 
 import pandas as pd
 import numpy as np
+from .zonal_weights import ZonalWeights
 
 class SpatialAggregator:
     """Aggregate spatial data to district level"""
     
+    def __init__(self, config):
+        self.config = config
+        self.zonal_weights = ZonalWeights(config)
+    
     def aggregate_to_districts(self, raw_data):
         """Aggregate satellite data to district level"""
         print("   📍 Aggregating data to district level...")
         
-        district_data = []
         districts_gdf = raw_data['districts_gdf']
+        grace_grid = raw_data['grace_grid']
+        rainfall_grid = raw_data['rainfall_grid']
+        
+        # Area-weighted district means as sparse (district x cell) @ (cell x time)
+        district_index = raw_data.get('district_index')
+        grace_weights = self.zonal_weights.load_or_build(districts_gdf, grace_grid, district_index)
+        grace_mean = ZonalWeights.aggregate(grace_weights, grace_grid)
+        
+        if np.array_equal(rainfall_grid.lat, grace_grid.lat) and np.array_equal(rainfall_grid.lon, grace_grid.lon):
+            rainfall_weights = grace_weights
+        else:
+            rainfall_weights = self.zonal_weights.load_or_build(districts_gdf, rainfall_grid, district_index)
+        rainfall_mean = ZonalWeights.aggregate(rainfall_weights, rainfall_grid)
         
-        for idx, district in districts_gdf.iterrows():
-            district_name = district['district']
-            geometry = district['geometry']
-            
-            # Get bounds for spatial subsetting
-            bounds = geometry.bounds
-            lon_min, lat_min, lon_max, lat_max = bounds
-            
-            # Extract data within district bounds
-            grace_subset = raw_data['grace'].sel(
-                lat=slice(lat_min, lat_max),
-                lon=slice(lon_min, lon_max)
-            )
-            
-            rainfall_subset = raw_data['rainfall'].sel(
-                lat=slice(lat_min, lat_max),
-                lon=slice(lon_min, lon_max)
-            )
-            
-            # Calculate district averages
-            grace_mean = grace_subset['tws_anomaly'].mean(dim=['lat', 'lon']).values
-            rainfall_mean = rainfall_subset['precipitation'].mean(dim=['lat', 'lon']).values
-            
-            for i, date in enumerate(raw_data['grace'].time.values):
-                district_data.append({
-                    'district': district_name,
-                    'date': pd.to_datetime(date),
-                    'tws_anomaly': grace_mean[i] if not np.isnan(grace_mean[i]) else 0,
-                    'rainfall': rainfall_mean[i] if not np.isnan(rainfall_mean[i]) else 0
-                })
+        n_districts, n_dates = grace_mean.shape
+        district_timeseries = pd.DataFrame({
+            'district': np.repeat(districts_gdf['district'].to_numpy(), n_dates),
+            'date': np.tile(grace_grid.time.to_numpy(), n_districts),
+            'tws_anomaly': np.nan_to_num(grace_mean, nan=0).ravel(),
+            'rainfall': np.nan_to_num(rainfall_mean, nan=0).ravel()
+        })
         
-        district_timeseries = pd.DataFrame(district_data)
         print(f"   ✅ District aggregation complete: {len(district_timeseries)} records")
         return district_timeseries
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Sparse area-weight matrices for grid-to-district zonal statistics
+"""
+
+import os
+import hashlib
+import numpy as np
+from scipy import sparse
+from matplotlib.path import Path
+
+class ZonalWeights:
+    """Build, cache and apply (district x grid cell) area-weight matrices"""
+    
+    VERSION = 1
+    
+    def __init__(self, config):
+        self.config = config
+        self.cache_dir = config.WEIGHTS_DIR
+        self.subsamples = config.ZONAL_SUBSAMPLES
+    
+    def load_or_build(self, districts_gdf, grid, district_index=None):
+        """Load the weight matrix for these districts and grid, building it once"""
+        path = os.path.join(self.cache_dir, f'{self._fingerprint(districts_gdf, grid)}.npz')
+        if os.path.exists(path):
+            return sparse.load_npz(path).tocsc()
+        
+        weights = self.build(districts_gdf, grid, district_index)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sparse.save_npz(path, weights)
+        return weights.tocsc()
+    
+    def build(self, districts_gdf, grid, district_index=None):
+        """Row-normalised weights: fraction of each cell inside each district x cell area
+        
+        With a DistrictIndex over the same districts, polygon coverage comes
+        from locating every cell's sample points once through the index
+        instead of testing each district's bounding-box cells separately.
+        """
+        lat, lon = grid.lat, grid.lon
+        lat_res = np.diff(lat).mean() if len(lat) > 1 else 1.0
+        lon_res = np.diff(lon).mean() if len(lon) > 1 else 1.0
+        
+        # Cell area on the sphere scales with cos(latitude)
+        cell_area = np.cos(np.radians(lat))
+        
+        located = None
+        if district_index is not None:
+            if not np.array_equal(district_index.districts, districts_gdf['district'].to_numpy()):
+                raise ValueError("District index was built over different districts")
+            located = self._located_coverage(district_index, lat, lon, lat_res, lon_res)
+        
+        rows, cols, values = [], [], []
+        for row, geometry in enumerate(districts_gdf['geometry']):
+            if located is not None and self._polygon_rings(geometry) is not None:
+                start, end = located.indptr[row], located.indptr[row + 1]
+                cells = located.indices[start:end]
+                weight = located.data[start:end] * cell_area[cells // len(lon)]
+                if weight.sum() > 0:
+                    rows.append(np.full(len(cells), row))
+                    cols.append(cells)
+                    values.append(weight / weight.sum())
+                continue
+            
+            lon_min, lat_min, lon_max, lat_max = geometry.bounds
+            i0 = int(np.searchsorted(lat + lat_res / 2, lat_min, side='right'))
+            i1 = int(np.searchsorted(lat - lat_res / 2, lat_max, side='left'))
+            j0 = int(np.searchsorted(lon + lon_res / 2, lon_min, side='right'))
+            j1 = int(np.searchsorted(lon - lon_res / 2, lon_max, side='left'))
+            if i1 <= i0 or j1 <= j0:
+                continue
+            
+            coverage = self._coverage(geometry, lat[i0:i1], lon[j0:j1], lat_res, lon_res)
+            weight = coverage * cell_area[i0:i1, np.newaxis]
+            if weight.sum() <= 0:
+                continue
+            
+            ii, jj = np.nonzero(weight)
+            rows.append(np.full(len(ii), row))
+            cols.append((ii + i0) * len(lon) + (jj + j0))
+            values.append(weight[ii, jj] / weight.sum())
+        
+        shape = (len(districts_gdf), len(lat) * len(lon))
+        if not rows:
+            return sparse.csr_matrix(shape)
+        return sparse.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))), shape=shape
+        )
+    
+    def _coverage(self, geometry, lat, lon, lat_res, lon_res):
+        """Fraction of each candidate cell covered by a geometry"""
+        rings = self._polygon_rings(geometry)
+        
+        if rings is None:
+            # Bounds-only geometry: exact rectangle overlap
+            lon_min, lat_min, lon_max, lat_max = geometry.bounds
+            lat_overlap = np.clip(np.minimum(lat + lat_res / 2, lat_max) -
+                                  np.maximum(lat - lat_res / 2, lat_min), 0, None) / lat_res
+            lon_overlap = np.clip(np.minimum(lon + lon_res / 2, lon_max) -
+                                  np.maximum(lon - lon_res / 2, lon_min), 0, None) / lon_res
+            return np.outer(lat_overlap, lon_overlap)
+        
+        # Polygon: share of sub-cell sample points falling inside
+        k = self.subsamples
+        offsets = (np.arange(k) + 0.5) / k - 0.5
+        sample_lat = (lat[:, np.newaxis] + offsets * lat_res).ravel()
+        sample_lon = (lon[:, np.newaxis] + offsets * lon_res).ravel()
+        lon_grid, lat_grid = np.meshgrid(sample_lon, sample_lat)
+        points = np.column_stack([lon_grid.ravel(), lat_grid.ravel()])
+        
+        inside = np.zeros(len(points), dtype=bool)
+        for exterior, interiors in rings:
+            in_ring = Path(exterior).contains_points(points)
+            for interior in interiors:
+                in_ring &= ~Path(interior).contains_points(points)
+            inside |= in_ring
+        
+        inside = inside.reshape(len(lat), k, len(lon), k)
+        return inside.mean(axis=(1, 3))
+    
+    def _located_coverage(self, district_index, lat, lon, lat_res, lon_res):
+        """(district x cell) share of each cell's sample points the index places in each district"""
+        k = self.subsamples
+        offsets = (np.arange(k) + 0.5) / k - 0.5
+        sample_lon = (lon[:, np.newaxis] + offsets * lon_res).ravel()
+        sample_cols = np.tile(np.arange(len(sample_lon)) // k, k)
+        
+        # One grid row of sample points at a time bounds the working set
+        rows, cols = [], []
+        for i, cell_lat in enumerate(lat):
+            lon_grid, lat_grid = np.meshgrid(sample_lon, cell_lat + offsets * lat_res)
+            positions = district_index.locate_points(lat_grid.ravel(), lon_grid.ravel())
+            found = positions >= 0
+            rows.append(positions[found])
+            cols.append(i * len(lon) + sample_cols[found])
+        
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        coverage = sparse.csr_matrix(
+            (np.full(len(rows), 1.0 / k ** 2), (rows, cols)),
+            shape=(len(district_index.districts), len(lat) * len(lon))
+        )
+        coverage.sum_duplicates()
+        return coverage
+    
+    @staticmethod
+    def _polygon_rings(geometry):
+        """Return [(exterior, [interiors])] vertex arrays, or None for bounds-only geometry"""
+        if hasattr(geometry, 'geoms'):
+            parts = list(geometry.geoms)
+        elif hasattr(geometry, 'exterior'):
+            parts = [geometry]
+        else:
+            return None
+        
+        return [
+            (np.asarray(part.exterior.coords),
+             [np.asarray(interior.coords) for interior in part.interiors])
+            for part in parts
+        ]
+    
+    def _fingerprint(self, districts_gdf, grid):
+        """Hash district geometries, grid coordinates and build settings"""
+        digest = hashlib.sha256()
+        digest.update(f'{self.VERSION}:{self.subsamples}'.encode('utf-8'))
+        digest.update(np.asarray(grid.lat, dtype=float).tobytes())
+        digest.update(np.asarray(grid.lon, dtype=float).tobytes())
+        for name, geometry in zip(districts_gdf['district'], districts_gdf['geometry']):
+            digest.update(str(name).encode('utf-8'))
+            rings = self._polygon_rings(geometry)
+            if rings is None:
+                digest.update(np.asarray(geometry.bounds, dtype=float).tobytes())
+            else:
+                for exterior, interiors in rings:
+                    digest.update(np.asarray(exterior, dtype=float).tobytes())
+                    for interior in interiors:
+                        digest.update(np.asarray(interior, dtype=float).tobytes())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def aggregate(weights, grid):
+        """District x time means as one sparse product per stored grid chunk
+        
+        NaN cells are skipped and the remaining weights renormalised.
+        """
+        weights = sparse.csc_matrix(weights)
+        n_time = len(grid.time)
+        n_lon = len(grid.lon)
+        size = grid.chunk_size
+        total = np.zeros((weights.shape[0], n_time))
+        weight_sum = np.zeros((weights.shape[0], n_time))
+        
+        n_chunk_lat, n_chunk_lon = grid.chunk_grid
+        for chunk_i in range(n_chunk_lat):
+            for chunk_j in range(n_chunk_lon):
+                chunk = grid.chunk(chunk_i, chunk_j)
+                _, chunk_lat, chunk_lon = chunk.shape
+                lat_idx = np.arange(chunk_lat) + chunk_i * size
+                lon_idx = np.arange(chunk_lon) + chunk_j * size
+                cells = (lat_idx[:, np.newaxis] * n_lon + lon_idx).ravel()
+                
+                chunk_weights = weights[:, cells]
+                if chunk_weights.nnz == 0:
+                    continue
+                
+                # (cell x time) block for this chunk
+                values = np.asarray(chunk, dtype=float).reshape(n_time, -1).T
+                valid = ~np.isnan(values)
+                total += chunk_weights @ np.where(valid, values, 0)
+                weight_sum += chunk_weights @ valid
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(weight_sum > 0, total / weight_sum, np.nan)
\ No newline at end of file
@@ -6,15 +6,20 @@ Main entry point for Underground Water Depletion Risk Modeling
 import sys
 import os
 import logging
+import argparse
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from data_ingestion.data_collector import DataCollector
 from data_processing.data_processor import DataProcessor
+from data_processing.feature_registry import DECOMPOSITION_FEATURES
 from modeling.model_manager import ModelManager
+from modeling.chunked_pipeline import ChunkedPipeline
+from modeling.model_registry import ModelRegistry
 from visualization.visualization_engine import VisualizationEngine
 from reporting.report_manager import ReportManager
+from utils.feature_store import FeatureStore
 from config import Config
 
 def setup_logging():
@@ -28,17 +33,83 @@ def setup_logging():
         ]
     )
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Underground Water Depletion Risk Modeling")
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="Ignore and do not update the ingested dataset cache"
+    )
+    parser.add_argument(
+        '--streaming', action='store_true',
+        help="Process, score and store the panel in district chunks; risk assessment and history "
+             "cover every district, but the panel-based plots and exports cover only the modeled district sample"
+    )
+    parser.add_argument(
+        '--memory-budget-mb', type=int, default=None,
+        help="Peak memory target used to size streaming chunks"
+    )
+    parser.add_argument(
+        '--features', metavar='FINGERPRINT', default=None,
+        help="Model and report a stored processed panel, skipping ingestion and processing"
+    )
+    parser.add_argument(
+        '--list-features', action='store_true',
+        help="List the processed panels in the feature store and exit"
+    )
+    parser.add_argument(
+        '--decomposition-features', nargs='+', metavar='FEATURE', choices=DECOMPOSITION_FEATURES,
+        default=None,
+        help=f"Add seasonal decomposition features to the panel and the model: {', '.join(DECOMPOSITION_FEATURES)}"
+    )
+    parser.add_argument(
+        '--inference', action='store_true',
+        help="Load the latest compatible registered model instead of training"
+    )
+    parser.add_argument(
+        '--model', metavar='MODEL_ID', default=None,
+        help="Registered model to load for --inference"
+    )
+    parser.add_argument(
+        '--list-models', action='store_true',
+        help="List the models in the model registry and exit"
+    )
+    args = parser.parse_args(argv)
+    if args.features and args.streaming:
+        parser.error("--features models a stored in-memory panel and cannot be combined with --streaming")
+    return args
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
+    if args.list_features:
+        FeatureStore(Config()).print_entries()
+        return
+    if args.list_models:
+        ModelRegistry(Config()).print_entries()
+        return
+    
     setup_logging()
     logger = logging.getLogger(__name__)
     
     print("🚀 Starting Underground Water Depletion Risk Modeling...")
     logger.info("Initializing Water Depletion Risk Model")
     
+    data_processor = None
     try:
         # Initialize all components
         config = Config()
+        if args.no_cache:
+            config.USE_CACHE = False
+        if args.streaming:
+            config.STREAMING = True
+        if args.memory_budget_mb is not None:
+            config.MEMORY_BUDGET_MB = args.memory_budget_mb
+        if args.decomposition_features:
+            config.DECOMPOSITION_FEATURES = list(dict.fromkeys(args.decomposition_features))
+        if args.inference or args.model:
+            config.INFERENCE_ONLY = True
+            config.MODEL_ID = args.model
         data_collector = DataCollector(config)
         data_processor = DataProcessor(config)
         model_manager = ModelManager(config)
@@ -49,19 +120,39 @@ def main():
         logger.info("Phase 1: Data Ingestion")
         print("\n📥 1. DATA INGESTION PHASE")
         print("-" * 30)
-        raw_data = data_collector.collect_all_data()
+        if args.features:
+            print(f"   ⏭️  Skipped; using stored features {args.features}")
+        else:
+            raw_data = data_collector.collect_all_data()
         
         # 2. Data Processing
         logger.info("Phase 2: Data Processing")
         print("\n🔧 2. DATA PROCESSING PHASE")
         print("-" * 30)
-        processed_data = data_processor.process_all_data(raw_data)
+        if args.features:
+            feature_store = FeatureStore(config)
+            processed_data = feature_store.get(feature_store.resolve(args.features))
+            if processed_data is None:
+                raise ValueError(f"Stored features {args.features} could not be loaded")
+            if config.SHARED_PANEL:
+                data_processor.publish_panel(processed_data)
+            print(f"   💾 Loaded processed panel: {len(processed_data)} records")
+        elif config.STREAMING:
+            # Processing, modeling and risk scoring run together chunk by chunk;
+            # processed_data is then the modeled district sample
+            processed_data, models_results = ChunkedPipeline(config).run(raw_data)
+            print(f"   ⚠️  Panel-based visualizations and reports cover the "
+                  f"{processed_data['district'].nunique()} modeled districts; the full panel is in "
+                  f"{config.PARQUET_DIR}")
+        else:
+            processed_data = data_processor.process_all_data(raw_data)
         
         # 3. Statistical Modeling
         logger.info("Phase 3: Statistical Modeling")
         print("\n📊 3. STATISTICAL MODELING PHASE")
         print("-" * 30)
-        models_results = model_manager.build_models(processed_data)
+        if args.features or not config.STREAMING:
+            models_results = model_manager.build_models(processed_data)
         
         # 4. Visualization
         logger.info("Phase 4: Visualization")
@@ -80,10 +171,15 @@ def main():
         
         # Print final summary
         report_manager.print_summary(models_results)
-        
+    
     except Exception as e:
         logger.error(f"Project failed with error: {str(e)}", exc_info=True)
         raise
+    
+    finally:
+        # Unlink the shared-memory panel, if one was published
+        if data_processor is not None:
+            data_processor.release_panel()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Out-of-core pipeline that processes and scores the panel in district chunks
+"""
+
+import sys
+import copy
+import numpy as np
+import pandas as pd
+from .model_trainer import ModelTrainer
+from .risk_classifier import RiskClassifier
+from .risk_history import RiskHistory
+from data_processing.data_processor import DataProcessor
+from data_processing.panel_cube import PanelCube
+from data_processing.compact_panel import DistrictStatic, static_table, with_static
+from utils.panel_store import PanelStore
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Working-set multiple of a chunk's panel bytes: rolling temporaries, the risk
+# cube and the Parquet copy all exist alongside the panel at some point
+CHUNK_OVERHEAD = 8
+
+# Processed columns added on top of the district statistics
+PROCESSED_COLUMNS = 12
+
+# Fully grown forest trees hold about two nodes per training row, ~72 bytes each
+FOREST_BYTES_PER_ROW = 144
+
+# Risk history cells: a float32 score and an int8 level, memory-mapped but resident once written
+HISTORY_BYTES_PER_CELL = 5
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (0 where unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+class ChunkedPipeline:
+    """Process, score and store the panel district chunk by district chunk"""
+    
+    def __init__(self, config):
+        self.config = config
+        
+        # Chunks are processed from scratch and stored here, not by the processor
+        chunk_config = copy.copy(config)
+        chunk_config.PARQUET_STORAGE = False
+        chunk_config.SHARED_PANEL = False
+        chunk_config.INCREMENTAL_INGESTION = False
+        self.processor = DataProcessor(chunk_config)
+        self.model_trainer = ModelTrainer(config)
+        self.risk_classifier = RiskClassifier(config)
+        self.store = PanelStore(config)
+    
+    def headroom_bytes(self):
+        """Memory budget left above this process's peak so far"""
+        return max(self.config.MEMORY_BUDGET_MB - peak_rss_mb(), 0) * 1024 ** 2
+    
+    def districts_per_chunk(self, raw_data, headroom=None):
+        """Largest district chunk whose working set fits in half the headroom left by the risk history"""
+        headroom = self.headroom_bytes() if headroom is None else headroom
+        n_dates = len(raw_data['grace']['dates'])
+        headroom = max(headroom - self.history_bytes(raw_data), 0)
+        n_columns = len(raw_data['district_stats'].columns) + PROCESSED_COLUMNS
+        district_bytes = n_dates * n_columns * 8 * CHUNK_OVERHEAD
+        return max(int(headroom / 2 // district_bytes), 1)
+    
+    def history_bytes(self, raw_data):
+        """Resident size of the full district x month risk history"""
+        return len(raw_data['district_stats']) * len(raw_data['grace']['dates']) * HISTORY_BYTES_PER_CELL
+    
+    def sample_districts(self, raw_data, headroom=None):
+        """Districts whose full series can train the forest in a quarter of the headroom"""
+        headroom = self.headroom_bytes() if headroom is None else headroom
+        n_dates = len(raw_data['grace']['dates'])
+        forest_bytes = (1 - self.config.TEST_SIZE) * self.config.N_ESTIMATORS * FOREST_BYTES_PER_ROW
+        return max(int(headroom / 4 // (forest_bytes * n_dates)), 1)
+    
+    def chunk_raw_data(self, raw_data, start, stop):
+        """raw_data restricted to districts [start, stop)"""
+        raw_chunk = dict(raw_data)
+        raw_chunk['district_stats'] = raw_data['district_stats'].iloc[start:stop].reset_index(drop=True)
+        raw_chunk['district_offset'] = start
+        if 'district_series' in raw_data:
+            raw_chunk['district_series'] = {
+                key: values[start:stop] for key, values in raw_data['district_series'].items()
+            }
+        return raw_chunk
+    
+    def run(self, raw_data):
+        """Stream every district chunk through processing and risk scoring
+        
+        Each processed chunk is appended to the 'panel' Parquet dataset and
+        reduced to its districts' latest state before the next is built.
+        Models train on the full series of a random district sample sized
+        so the forest fits the budget. Returns (sample_data, models_results).
+        """
+        districts = raw_data['district_stats']['district'].to_numpy()
+        n_districts = len(districts)
+        headroom = self.headroom_bytes()
+        chunk_size = self.districts_per_chunk(raw_data, headroom)
+        n_sample = min(self.sample_districts(raw_data, headroom), n_districts)
+        print(f"🌊 Streaming {n_districts} districts in chunks of {chunk_size} "
+              f"(budget {self.config.MEMORY_BUDGET_MB} MB, {n_sample} modeled)...")
+        
+        rng = np.random.default_rng(self.config.RANDOM_STATE)
+        sample = districts[rng.choice(n_districts, size=n_sample, replace=False)]
+        
+        # Chunk water stress goes straight into the on-disk history, scored once the range is known
+        risk_history = RiskHistory.allocate(
+            self.config.RISK_HISTORY_DIR, districts, pd.DatetimeIndex(raw_data['grace']['dates'])
+        )
+        district_positions = pd.Index(districts)
+        
+        latest_states, samples, static_tables = [], [], []
+        stress_min, stress_max = np.inf, -np.inf
+        for start in range(0, n_districts, chunk_size):
+            stop = min(start + chunk_size, n_districts)
+            chunk = self.processor.process_panel(self.chunk_raw_data(raw_data, start, stop))
+            self.store.write('panel', chunk, append=start > 0)
+            
+            cube = PanelCube.from_frame(chunk)
+            stress_min = min(stress_min, np.nanmin(cube['water_stress']))
+            stress_max = max(stress_max, np.nanmax(cube['water_stress']))
+            latest_states.append(self.risk_classifier.latest_state(cube))
+            risk_history.scores[np.ix_(
+                district_positions.get_indexer(cube.districts), risk_history.dates.get_indexer(cube.dates)
+            )] = cube['water_stress']
+            
+            district_static = static_table(chunk)
+            if district_static is not None:
+                static_tables.append(district_static.table.reset_index())
+            in_sample = chunk['district'].isin(sample).to_numpy()
+            if in_sample.any():
+                samples.append(with_static(chunk[in_sample]))
+            
+            del chunk, cube
+            print(f"      ✅ Districts {start + 1}-{stop} of {n_districts} processed and stored")
+        
+        district_static = DistrictStatic(pd.concat(static_tables, ignore_index=True)) if static_tables else None
+        latest_state = pd.concat(latest_states, ignore_index=True)
+        if self.config.COMPACT_PANEL:
+            latest_state['district'] = pd.Categorical(latest_state['district'], categories=districts)
+        
+        print("   🤖 Training predictive models on a district sample...")
+        sample_data = pd.concat(samples, ignore_index=True)
+        model_results = self.model_trainer.train_models(sample_data)
+        
+        print("   🚨 Classifying risk levels...")
+        risk_assessment = self.risk_classifier.classify_latest(
+            latest_state, stress_min, stress_max, district_static
+        )
+        risk_history.score_stress(stress_min, stress_max, self.config.RISK_THRESHOLDS)
+        
+        return sample_data, {
+            'model_results': model_results,
+            'risk_assessment': risk_assessment,
+            'risk_history': risk_history
+        }
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Rolling-origin cross-validation for panel models
+"""
+
+import os
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error, r2_score
+from data_ingestion.dataset_cache import DatasetCache
+from utils.shared_arrays import SharedArray
+
+class RollingOriginCV:
+    """Expanding-window cross-validation that splits panel rows by date
+    
+    Each fold trains on every month before its origin and tests on the
+    CV_TEST_MONTHS that follow, so no fold sees the future. Origins step
+    forward from the first month, so appending months adds folds without
+    moving earlier ones, and a fold whose rows are unchanged is read back
+    from the fold cache instead of refitted.
+    """
+    
+    VERSION = 2
+    
+    def __init__(self, config):
+        self.config = config
+        self.n_folds = config.CROSS_VALIDATION
+        self.test_months = config.CV_TEST_MONTHS
+        self.cache = None
+        if config.USE_CACHE:
+            self.cache = DatasetCache(config.CV_CACHE_DIR, config.CV_CACHE_MAX_SIZE_MB)
+    
+    def folds(self, dates):
+        """(train_stop, test_stop) row bounds of the last n_folds folds of date-sorted rows"""
+        unique_dates, first_rows = np.unique(dates, return_index=True)
+        bounds = np.append(first_rows, len(dates))
+        origins = np.arange(self.test_months, len(unique_dates) - self.test_months + 1, self.test_months)
+        return [(bounds[origin], bounds[origin + self.test_months]) for origin in origins[-self.n_folds:]]
+    
+    def cross_validate(self, X, y, dates, estimator, feature_names=()):
+        """Fit and score estimator on every fold, reusing cached folds
+        
+        Rows must be sorted by date. Returns a dict with the per-fold
+        metrics as a DataFrame plus cv_mean and cv_std of the fold R².
+        """
+        data = np.ascontiguousarray(np.column_stack([X, y]), dtype=float)
+        dates = np.asarray(dates)
+        folds = self.folds(dates)
+        
+        # A fold depends on the rows up to its test stop; hash growing prefixes once
+        keys, digest, hashed = [], hashlib.sha256(), 0
+        params = {'features': list(feature_names), 'estimator': repr(estimator.get_params())}
+        for train_stop, test_stop in folds:
+            digest.update(data[hashed:test_stop].tobytes())
+            hashed = test_stop
+            keys.append(DatasetCache.make_key('cv_fold', dict(
+                params, data=digest.copy().hexdigest(), train_stop=int(train_stop), test_stop=int(test_stop)
+            ), self.VERSION))
+        
+        results = [self.cache.get(key) if self.cache is not None else None for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            for i, result in zip(pending, self._fit_folds(data, [folds[i] for i in pending], estimator)):
+                results[i] = result
+                if self.cache is not None:
+                    self.cache.put(keys[i], result)
+        
+        records = []
+        for i, ((train_stop, test_stop), result) in enumerate(zip(folds, results)):
+            records.append({
+                'fold': i + 1,
+                'train_end': dates[train_stop - 1],
+                'test_start': dates[train_stop],
+                'test_end': dates[test_stop - 1],
+                'n_train': int(train_stop),
+                'n_test': int(test_stop - train_stop),
+                'r2': result['r2'],
+                'rmse': result['rmse'],
+                'seconds': result['seconds'],
+                'cached': i not in pending
+            })
+        fold_metrics = pd.DataFrame(records, columns=[
+            'fold', 'train_end', 'test_start', 'test_end', 'n_train', 'n_test',
+            'r2', 'rmse', 'seconds', 'cached'
+        ])
+        
+        return {
+            'folds': fold_metrics,
+            'cv_mean': fold_metrics['r2'].mean() if len(fold_metrics) else np.nan,
+            'cv_std': fold_metrics['r2'].std(ddof=0) if len(fold_metrics) else np.nan
+        }
+    
+    def _fit_folds(self, data, folds, estimator):
+        """Fit folds in worker processes that attach to one shared copy of the data"""
+        n_workers = min(self.config.CV_WORKERS or os.cpu_count() or 1, len(folds))
+        shared_data = SharedArray.from_array(data)
+        try:
+            tasks = [(shared_data.spec, train_stop, test_stop, estimator) for train_stop, test_stop in folds]
+            if n_workers < 2:
+                return [_fit_fold(task) for task in tasks]
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                return list(executor.map(_fit_fold, tasks))
+        finally:
+            shared_data.close()
+
+
+def _fit_fold(task):
+    """Fit a fresh estimator on one fold of the shared (features + target) matrix; return its metrics"""
+    data_spec, train_stop, test_stop, estimator = task
+    shared_data = SharedArray.attach(data_spec, read_only=True)
+    try:
+        X, y = shared_data.array[:, :-1], shared_data.array[:, -1]
+        start = time.perf_counter()
+        model = clone(estimator).fit(X[:train_stop], y[:train_stop])
+        y_pred = model.predict(X[train_stop:test_stop])
+        seconds = time.perf_counter() - start
+        y_test = y[train_stop:test_stop].copy()
+        del X, y, model
+    finally:
+        shared_data.close()
+    
+    return {
+        'r2': r2_score(y_test, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y_test, y_pred)),
+        'seconds': seconds
+    }
\ No newline at end of file
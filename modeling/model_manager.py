@@ -2,8 +2,11 @@
 Main modeling coordinator
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from .model_trainer import ModelTrainer
 from .risk_classifier import RiskClassifier
+from data_processing.compact_panel import static_table
+from utils.shared_panel import SharedPanel, shared_panel_spec
 
 class ModelManager:
     """Main modeling coordinator"""
@@ -17,19 +20,51 @@ class ModelManager:
         """Build all models and classifications"""
         print("📊 Building statistical models...")
         
-        # Train predictive models
-        print("   🤖 Training predictive models...")
-        model_results = self.model_trainer.train_models(processed_data)
+        panel_spec = shared_panel_spec(processed_data)
+        if panel_spec is not None:
+            # Risk levels come from the panel alone, so a worker classifies from
+            # the shared panel while the models train here
+            print("   🚨 Classifying risk levels from the shared panel...")
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                risk_future = executor.submit(_classify_shared_panel, self.config, panel_spec)
+                
+                print("   🤖 Training predictive models...")
+                model_results = self.model_trainer.train_models(processed_data)
+                risk_assessment, risk_history = risk_future.result()
+            
+            district_static = static_table(processed_data)
+            if district_static is not None:
+                risk_assessment = district_static.join(risk_assessment)
+        else:
+            # Train predictive models
+            print("   🤖 Training predictive models...")
+            model_results = self.model_trainer.train_models(processed_data)
+            
+            # Classify risk levels
+            print("   🚨 Classifying risk levels...")
+            risk_assessment, risk_history = self.risk_classifier.assess_risk(processed_data)
         
-        # Classify risk levels
-        print("   🚨 Classifying risk levels...")
-        risk_assessment = self.risk_classifier.classify_risk(processed_data, model_results)
+        # Persist the full risk history beside the latest snapshot
+        risk_history.save(self.config.RISK_HISTORY_DIR)
         
         # Combine all results
         final_results = {
             'model_results': model_results,
-            'risk_assessment': risk_assessment
+            'risk_assessment': risk_assessment,
+            'risk_history': risk_history
         }
         
         print("✅ Statistical modeling completed successfully!")
-        return final_results
\ No newline at end of file
+        return final_results
+
+
+def _classify_shared_panel(config, panel_spec):
+    """Latest risk assessment and risk history from a panel published in shared memory"""
+    shared_panel = SharedPanel.attach(panel_spec)
+    try:
+        panel_data = shared_panel.to_frame()
+        risk_assessment, risk_history = RiskClassifier(config).assess_risk(panel_data)
+        del panel_data
+    finally:
+        shared_panel.close()
+    return risk_assessment, risk_history
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Persistent registry of trained models
+"""
+
+import os
+import json
+import time
+import shutil
+import joblib
+import sklearn
+from utils.feature_store import content_hash
+
+class ModelRegistry:
+    """Trained models saved under MODELS_DIR with their training metadata
+    
+    Each model is a directory holding an uncompressed joblib dump, whose
+    arrays load memory-mapped, and a metadata file with the feature list,
+    training data fingerprint, metrics and a config snapshot.
+    """
+    
+    VERSION = 1
+    MODEL_FILE = 'model.joblib'
+    META_FILE = 'meta.json'
+    
+    def __init__(self, config):
+        self.config = config
+        self.root = config.MODELS_DIR
+        self.max_models = config.MODEL_REGISTRY_MAX_MODELS
+        os.makedirs(self.root, exist_ok=True)
+    
+    @staticmethod
+    def data_fingerprint(training_data):
+        """Fingerprint of the rows and columns a model is trained on"""
+        return content_hash(training_data)
+    
+    def config_snapshot(self):
+        """JSON-safe copy of the UPPER_CASE config settings"""
+        return json.loads(json.dumps(
+            {name: value for name, value in vars(self.config).items() if name.isupper()},
+            default=str
+        ))
+    
+    @staticmethod
+    def model_params(model):
+        """JSON-safe estimator parameters"""
+        return json.loads(json.dumps(model.get_params(), sort_keys=True, default=str))
+    
+    def find(self, fingerprint, features, params):
+        """Metadata of a compatible model trained on the same data with the same parameters, or None"""
+        for meta in self.entries():
+            if (self.is_compatible(meta, features) and meta.get('fingerprint') == fingerprint
+                    and meta.get('params') == params):
+                return meta
+        return None
+    
+    def register(self, model, features, fingerprint, metrics, feature_importance):
+        """Save a trained model with its metadata and return its model id
+        
+        A model already registered for the same data, features and parameters
+        is kept instead of saving a duplicate, and its id is returned.
+        """
+        params = self.model_params(model)
+        existing = self.find(fingerprint, features, params)
+        if existing is not None:
+            return existing['model_id']
+        
+        created = time.time()
+        model_key = content_hash({'fingerprint': fingerprint, 'features': list(features), 'params': params})
+        model_id = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(created))}-{model_key[:12]}"
+        path = self.config.get_model_path(model_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        
+        # No compression, so the fitted arrays can be memory-mapped on load
+        joblib.dump(model, os.path.join(tmp_path, self.MODEL_FILE))
+        meta = {
+            'model_id': model_id,
+            'version': self.VERSION,
+            'created': created,
+            'estimator': type(model).__name__,
+            'params': params,
+            'sklearn_version': sklearn.__version__,
+            'features': list(features),
+            'fingerprint': fingerprint,
+            'metrics': {name: float(value) for name, value in metrics.items()},
+            'feature_importance': feature_importance.to_dict('records'),
+            'config': self.config_snapshot()
+        }
+        with open(os.path.join(tmp_path, self.META_FILE), 'w') as f:
+            json.dump(meta, f, default=str)
+        
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        self.evict()
+        return model_id
+    
+    def entries(self):
+        """Registered models' metadata, newest first"""
+        entries = []
+        for name in os.listdir(self.root):
+            meta_path = os.path.join(self.root, name, self.META_FILE)
+            if name.endswith('.tmp') or not os.path.exists(meta_path):
+                continue
+            try:
+                with open(meta_path) as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(entries, key=lambda entry: entry['created'], reverse=True)
+    
+    def is_compatible(self, meta, features):
+        """Whether a registered model can score these features in this environment"""
+        return (meta.get('version') == self.VERSION
+                and meta.get('sklearn_version') == sklearn.__version__
+                and meta.get('features') == list(features))
+    
+    def latest(self, features):
+        """Metadata of the newest model compatible with features, or None"""
+        for meta in self.entries():
+            if self.is_compatible(meta, features):
+                return meta
+        return None
+    
+    def load(self, model_id, mmap_mode='r'):
+        """Registered model and its metadata, arrays memory-mapped by default"""
+        path = self.config.get_model_path(model_id)
+        try:
+            with open(os.path.join(path, self.META_FILE)) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            raise ValueError(f"Model '{model_id}' is not in the registry at {self.root}")
+        model = joblib.load(os.path.join(path, self.MODEL_FILE), mmap_mode=mmap_mode)
+        return model, meta
+    
+    def evict(self):
+        """Remove the oldest models beyond MODEL_REGISTRY_MAX_MODELS"""
+        for meta in self.entries()[self.max_models:]:
+            shutil.rmtree(self.config.get_model_path(meta['model_id']), ignore_errors=True)
+    
+    def print_entries(self):
+        """Print registered models, newest first"""
+        entries = self.entries()
+        print(f"🗄️  {len(entries)} registered models in {self.root}")
+        for entry in entries:
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created']))
+            metrics = entry['metrics']
+            print(f"   {entry['model_id']}  created {created}  {entry['estimator']}  "
+                  f"{len(entry['features']):>3} features  R² {metrics.get('r2', float('nan')):.3f}  "
+                  f"CV R² {metrics.get('cv_mean', float('nan')):.3f}")
+        return entries
\ No newline at end of file
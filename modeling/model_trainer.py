@@ -3,46 +3,56 @@ Machine learning model training
 """
 
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 import pandas as pd
 import numpy as np
+from .cross_validation import RollingOriginCV
+from .model_registry import ModelRegistry
+from data_processing.compact_panel import has_column, with_static
 
 class ModelTrainer:
     """Train machine learning models for water stress prediction"""
     
     def __init__(self, config):
         self.config = config
+        self.cross_validator = RollingOriginCV(config)
+        self.registry = ModelRegistry(config)
     
-    def train_models(self, processed_data):
-        """Train predictive models"""
-        # Prepare features for modeling
-        feature_columns = [
-            'tws_anomaly', 'rainfall', 'crop_intensity', 'population_density',
-            'gw_irrigation_ratio', 'month'
-        ]
-        
-        # Use only available columns with data
+    def model_features(self, processed_data):
+        """Configured model and decomposition features present in the panel"""
+        # Use only available model features
         available_features = []
-        for col in feature_columns:
-            if col in processed_data.columns:
+        for col in self.config.MODEL_FEATURES + self.config.DECOMPOSITION_FEATURES:
+            if has_column(processed_data, col):
                 available_features.append(col)
         
         if not available_features:
             available_features = ['tws_anomaly', 'rainfall', 'month']
+        return available_features
+    
+    def train_models(self, processed_data):
+        """Train predictive models, or load a registered one for inference-only runs"""
+        available_features = self.model_features(processed_data)
+        if self.config.INFERENCE_ONLY:
+            return self.load_models(available_features)
         
-        # Prepare data
-        modeling_data = processed_data.dropna(subset=available_features + ['water_stress'])
+        # Prepare data, joining static district attributes of a compact panel
+        modeling_data = with_static(processed_data, available_features)
+        modeling_data = modeling_data.dropna(subset=available_features + ['water_stress'])
+        modeling_data = modeling_data.sort_values('date', kind='stable')
         
         X = modeling_data[available_features]
         y = modeling_data['water_stress']
+        dates = modeling_data['date'].to_numpy()
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, 
-            test_size=self.config.TEST_SIZE, 
-            random_state=self.config.RANDOM_STATE
-        )
+        # Hold out the last TEST_SIZE share of months so no future month is trained on
+        unique_dates = np.unique(dates)
+        if len(unique_dates) < 2:
+            raise ValueError(f"Model training needs at least two months of data, got {len(unique_dates)}")
+        n_test_dates = min(max(int(round(len(unique_dates) * self.config.TEST_SIZE)), 1), len(unique_dates) - 1)
+        train_rows = dates < unique_dates[-n_test_dates]
+        X_train, X_test = X[train_rows], X[~train_rows]
+        y_train, y_test = y[train_rows], y[~train_rows]
         
         print(f"      ✅ Training data: {len(X_train)} samples")
         
@@ -52,6 +62,14 @@ class ModelTrainer:
             random_state=self.config.RANDOM_STATE
         )
         
+        # Rolling-origin cross-validation over the whole period
+        cv_results = self.cross_validator.cross_validate(
+            X.to_numpy(dtype=float), y.to_numpy(dtype=float), dates, model, available_features
+        )
+        cv_folds = cv_results['folds']
+        print(f"      ✅ Cross-validation R²: {cv_results['cv_mean']:.3f} ± {cv_results['cv_std']:.3f} "
+              f"over {len(cv_folds)} rolling-origin folds ({cv_folds['cached'].sum()} cached)")
+        
         model.fit(X_train, y_train)
         
         # Predictions
@@ -73,10 +91,42 @@ class ModelTrainer:
             'model_performance': {
                 'r2': r2,
                 'rmse': rmse,
-                'mse': mse
+                'mse': mse,
+                'cv_mean': cv_results['cv_mean'],
+                'cv_std': cv_results['cv_std']
             },
+            'cv_folds': cv_folds,
             'feature_importance': feature_importance
         }
         
         print(f"      ✅ Model trained - R²: {r2:.3f}")
-        return results
\ No newline at end of file
+        
+        if self.config.MODEL_REGISTRY:
+            fingerprint = self.registry.data_fingerprint(modeling_data[available_features + ['date', 'water_stress']])
+            results['model_id'] = self.registry.register(
+                model, available_features, fingerprint, results['model_performance'], feature_importance
+            )
+            print(f"      💾 Registered model {results['model_id']}")
+        return results
+    
+    def load_models(self, available_features):
+        """Results of the configured or latest compatible registered model, without training"""
+        model_id = self.config.MODEL_ID
+        if model_id is None:
+            meta = self.registry.latest(available_features)
+            if meta is None:
+                raise ValueError(f"No registered model is compatible with features {available_features}")
+            model_id = meta['model_id']
+        
+        model, meta = self.registry.load(model_id)
+        if not self.registry.is_compatible(meta, available_features):
+            raise ValueError(f"Model '{model_id}' was trained on {meta['features']}, "
+                             f"not {available_features}, or with another scikit-learn version")
+        
+        print(f"      ⏭️  Training skipped; loaded model {model_id}")
+        return {
+            'model': model,
+            'model_id': model_id,
+            'model_performance': meta['metrics'],
+            'feature_importance': pd.DataFrame(meta['feature_importance'], columns=['feature', 'importance'])
+        }
\ No newline at end of file
@@ -91,34 +91,65 @@ class RiskClassifier:
         
         return (series - min_val) / (max_val - min_val)
     
-    def _calculate_risk_trends(self, df):
-        """Calculate risk trends over time for each district"""
-        trends = []
+    def _calculate_risk_trends(self, df, window=6, min_periods=3, min_months=12):
+        """Calculate risk trends over time for every district at once
         
-        for district in df['district'].unique():
-            district_data = df[df['district'] == district].sort_values('date')
-            
-            if len(district_data) > 12:  # Need sufficient data for trend calculation
-                # Calculate 6-month moving average of risk score
-                risk_ma = district_data['risk_score'].rolling(window=6, min_periods=3).mean()
-                
-                if len(risk_ma) > 6:
-                    # Calculate trend (slope of linear regression)
-                    x = np.arange(len(risk_ma.dropna()))
-                    y = risk_ma.dropna().values
-                    
-                    if len(y) > 1:
-                        slope = np.polyfit(x, y, 1)[0]
-                        trend_direction = 'increasing' if slope > 0.01 else 'decreasing' if slope < -0.01 else 'stable'
-                    else:
-                        slope = 0
-                        trend_direction = 'unknown'
-                    
-                    trends.append({
-                        'district': district,
-                        'risk_trend_slope': slope,
-                        'risk_trend_direction': trend_direction,
-                        'recent_risk_change': risk_ma.iloc[-1] - risk_ma.iloc[0] if len(risk_ma) > 1 else 0
-                    })
-        
-        return pd.DataFrame(trends) if trends else pd.DataFrame(columns=['district', 'risk_trend_slope', 'risk_trend_direction', 'recent_risk_change'])
\ No newline at end of file
+        Risk scores form a (district x month) matrix, row positions in date
+        order, so the moving average and the regression slope of each
+        district's series are computed in a few whole-array passes.
+        """
+        columns = ['district', 'risk_trend_slope', 'risk_trend_direction', 'recent_risk_change']
+        codes, districts = pd.factorize(df['district'])
+        order = np.lexsort((df['date'].to_numpy(), codes))
+        codes = codes[order]
+        lengths = np.bincount(codes, minlength=len(districts))
+        
+        # Districts need more than min_months records for a trend
+        eligible = lengths > min_months
+        if not eligible.any():
+            return pd.DataFrame(columns=columns)
+        
+        n_months = lengths.max()
+        positions = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        risk = np.full((len(districts), n_months), np.nan)
+        risk[codes, positions] = df['risk_score'].to_numpy(dtype=float)[order]
+        
+        # Trailing moving average that skips NaNs, as pandas rolling does
+        valid = ~np.isnan(risk)
+        
+        def window_sum(a):
+            cumulative = np.zeros((a.shape[0], n_months + 1))
+            np.cumsum(a, axis=1, out=cumulative[:, 1:])
+            start = np.maximum(np.arange(1, n_months + 1) - window, 0)
+            return cumulative[:, 1:] - cumulative[:, start]
+        
+        count = window_sum(valid.astype(float))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            risk_ma = window_sum(np.where(valid, risk, 0.0)) / count
+        risk_ma[(count < min_periods) | (np.arange(n_months) >= lengths[:, np.newaxis])] = np.nan
+        
+        # Least-squares slope against each average's rank among the defined averages
+        defined = ~np.isnan(risk_ma)
+        n_defined = defined.sum(axis=1)
+        x = np.cumsum(defined, axis=1) - 1.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            x_mean = np.where(defined, x, 0.0).sum(axis=1) / n_defined
+            y_mean = np.where(defined, risk_ma, 0.0).sum(axis=1) / n_defined
+            dx = np.where(defined, x - x_mean[:, np.newaxis], 0.0)
+            dy = np.where(defined, risk_ma - y_mean[:, np.newaxis], 0.0)
+            slopes = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+        fitted = n_defined > 1
+        slopes = np.where(fitted, slopes, 0.0)
+        
+        directions = np.select(
+            [~fitted, slopes > 0.01, slopes < -0.01],
+            ['unknown', 'increasing', 'decreasing'], default='stable'
+        ).astype(object)
+        recent_change = risk_ma[np.arange(len(districts)), lengths - 1] - risk_ma[:, 0]
+        
+        return pd.DataFrame({
+            'district': np.asarray(districts)[eligible],
+            'risk_trend_slope': slopes[eligible],
+            'risk_trend_direction': directions[eligible],
+            'recent_risk_change': recent_change[eligible]
+        }, columns=columns)
\ No newline at end of file
@@ -4,6 +4,9 @@ Risk classification implementation
 
 import pandas as pd
 import numpy as np
+from data_processing.compact_panel import static_table
+from data_processing.panel_cube import PanelCube
+from .risk_history import RiskHistory, level_codes, level_names
 
 class RiskClassifier:
     """Classify districts into risk categories"""
@@ -13,23 +16,50 @@ class RiskClassifier:
     
     def classify_risk(self, processed_data, model_results):
         """Classify districts into risk levels"""
-        df = processed_data.copy()
+        return self.assess_risk(processed_data)[0]
+    
+    def assess_risk(self, processed_data):
+        """Latest risk assessment and the full district x month RiskHistory"""
+        cube = PanelCube.from_frame(processed_data)
+        water_stress = cube['water_stress']
+        stress_min, stress_max = np.nanmin(water_stress), np.nanmax(water_stress)
+        risk_assessment = self.classify_latest(
+            self.latest_state(cube), stress_min, stress_max, static_table(processed_data)
+        )
+        return risk_assessment, self.risk_history(cube, stress_min, stress_max)
+    
+    def risk_history(self, cube, stress_min, stress_max):
+        """Risk score and level of every district in every month of a cube"""
+        return RiskHistory.from_stress(
+            cube['water_stress'], cube.districts, cube.dates, stress_min, stress_max,
+            self.config.RISK_THRESHOLDS
+        )
+    
+    def latest_state(self, cube):
+        """Each district's latest values plus the water stress of its last observed month"""
+        latest_state = cube.latest()
+        latest_state['last_water_stress'] = cube['water_stress'][
+            np.arange(len(cube.districts)), cube.last_observed()
+        ]
+        return latest_state
+    
+    def classify_latest(self, latest_state, stress_min, stress_max, district_static=None):
+        """Score latest district states against the water stress range of the whole panel"""
+        latest_risk = latest_state.drop(columns='last_water_stress')
         
         # Calculate risk score based on water stress (simplified)
-        df['risk_score'] = (df['water_stress'] - df['water_stress'].min()) / (df['water_stress'].max() - df['water_stress'].min())
+        stress_range = stress_max - stress_min
+        risk_score = (latest_risk['water_stress'].to_numpy(dtype=float) - stress_min) / stress_range
+        latest_risk['risk_score'] = risk_score.astype(np.result_type(latest_risk['water_stress'].dtype, np.float32))
+        last_score = (latest_state['last_water_stress'].to_numpy(dtype=float) - stress_min) / stress_range
         
-        # Classify risk levels
-        conditions = [
-            df['risk_score'] <= self.config.RISK_THRESHOLDS['low'],
-            (df['risk_score'] > self.config.RISK_THRESHOLDS['low']) & 
-            (df['risk_score'] <= self.config.RISK_THRESHOLDS['moderate']),
-            df['risk_score'] > self.config.RISK_THRESHOLDS['moderate']
-        ]
-        choices = ['Low', 'Moderate', 'Critical']
-        df['risk_level'] = np.select(conditions, choices, default='Unknown')
+        # Classify risk levels from each district's last observed month
+        latest_risk['risk_level'] = level_names(level_codes(last_score, self.config.RISK_THRESHOLDS))
+        latest_risk = latest_risk.sort_values('district', kind='stable').reset_index(drop=True)
         
-        # Get latest assessment for each district
-        latest_risk = df.sort_values('date').groupby('district').last().reset_index()
+        # Compact panels keep static district attributes in a side table
+        if district_static is not None:
+            latest_risk = district_static.join(latest_risk)
         
         risk_counts = latest_risk['risk_level'].value_counts()
         print(f"      ✅ Risk classification: {dict(risk_counts)}")
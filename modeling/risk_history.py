@@ -0,0 +1,158 @@
+"""
+District x month history of risk scores and levels
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# Level codes index LEVELS; -1 marks months without a score
+LEVELS = ('Low', 'Moderate', 'Critical')
+UNKNOWN = -1
+LEVEL_NAMES = np.array(LEVELS + ('Unknown',), dtype=object)
+
+def level_codes(scores, thresholds):
+    """int8 risk level codes for an array of risk scores"""
+    scores = np.asarray(scores, dtype=float)
+    codes = np.full(scores.shape, UNKNOWN, dtype=np.int8)
+    codes[scores <= thresholds['low']] = 0
+    codes[(scores > thresholds['low']) & (scores <= thresholds['moderate'])] = 1
+    codes[scores > thresholds['moderate']] = 2
+    return codes
+
+def level_names(codes):
+    """Risk level names for an array of level codes"""
+    return LEVEL_NAMES[codes]
+
+class RiskHistory:
+    """Risk scores and int8 level codes of every district in every month
+    
+    Both are (district, date) arrays, so a month or a district is a single
+    index lookup and an array slice. Saved histories load memory-mapped.
+    """
+    
+    VERSION = 1
+    SCORES_FILE = 'scores.npy'
+    LEVELS_FILE = 'levels.npy'
+    META_FILE = 'meta.json'
+    
+    def __init__(self, scores, levels, districts, dates):
+        self.scores = scores
+        self.levels = levels
+        self.districts = pd.Index(districts)
+        self.dates = pd.DatetimeIndex(dates)
+        self.path = None
+    
+    @classmethod
+    def allocate(cls, path, districts, dates):
+        """Empty history backed by .npy memmaps under path, for filling row block by row block
+        
+        Water stress is written into scores, then score_stress converts it in
+        place and writes the index that makes the history loadable.
+        """
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, cls.META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)  # A half-written history must not load
+        shape = (len(districts), len(dates))
+        scores = np.lib.format.open_memmap(os.path.join(path, cls.SCORES_FILE), mode='w+',
+                                           dtype=np.float32, shape=shape)
+        scores[:] = np.nan
+        levels = np.lib.format.open_memmap(os.path.join(path, cls.LEVELS_FILE), mode='w+',
+                                           dtype=np.int8, shape=shape)
+        history = cls(scores, levels, districts, dates)
+        history.path = path
+        return history
+    
+    def score_stress(self, stress_min, stress_max, thresholds, block_rows=4096):
+        """Rescale water stress held in an allocated history to scores and levels, in place"""
+        for start in range(0, self.shape[0], block_rows):
+            block = self.scores[start:start + block_rows]
+            block -= stress_min
+            block /= stress_max - stress_min
+            self.levels[start:start + block_rows] = level_codes(block, thresholds)
+        self.scores.flush()
+        self.levels.flush()
+        self._write_meta(self.path)
+        return self
+    
+    @classmethod
+    def from_stress(cls, water_stress, districts, dates, stress_min, stress_max, thresholds):
+        """Score a (district, date) water stress array against a stress range"""
+        scores = ((np.asarray(water_stress, dtype=float) - stress_min) / (stress_max - stress_min)).astype(np.float32)
+        return cls(scores, level_codes(scores, thresholds), districts, dates)
+    
+    @property
+    def shape(self):
+        """(districts, dates)"""
+        return self.scores.shape
+    
+    def month(self, date):
+        """Every district's risk score and level in one month"""
+        position = self.dates.get_loc(pd.Timestamp(date))
+        return pd.DataFrame({
+            'district': self.districts,
+            'risk_score': self.scores[:, position],
+            'risk_level': level_names(self.levels[:, position])
+        })
+    
+    def district(self, district):
+        """One district's risk score and level in every month"""
+        position = self.districts.get_loc(district)
+        return pd.DataFrame({
+            'date': self.dates,
+            'risk_score': self.scores[position],
+            'risk_level': level_names(self.levels[position])
+        })
+    
+    def level_counts(self):
+        """Districts at each risk level per month, indexed by date"""
+        counts = {
+            name: (self.levels == code).sum(axis=0)
+            for code, name in enumerate(LEVELS)
+        }
+        counts['Unknown'] = (self.levels == UNKNOWN).sum(axis=0)
+        return pd.DataFrame(counts, index=self.dates)
+    
+    def to_frame(self):
+        """Long (district, date, risk_score, risk_level) frame"""
+        n_districts, n_dates = self.shape
+        return pd.DataFrame({
+            'district': np.repeat(np.asarray(self.districts), n_dates),
+            'date': np.tile(self.dates.to_numpy(), n_districts),
+            'risk_score': np.asarray(self.scores).ravel(),
+            'risk_level': level_names(np.asarray(self.levels).ravel())
+        })
+    
+    def save(self, path):
+        """Write the arrays as .npy files beside a JSON index of districts and dates"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, self.SCORES_FILE), np.ascontiguousarray(self.scores))
+        np.save(os.path.join(path, self.LEVELS_FILE), np.ascontiguousarray(self.levels))
+        return self._write_meta(path)
+    
+    def _write_meta(self, path):
+        meta = {
+            'version': self.VERSION,
+            'levels': list(LEVELS),
+            'districts': [str(district) for district in self.districts],
+            'dates': [date.isoformat() for date in self.dates]
+        }
+        with open(os.path.join(path, self.META_FILE), 'w') as f:
+            json.dump(meta, f)
+        return path
+    
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Saved history, memory-mapped by default; None if absent or from another version"""
+        try:
+            with open(os.path.join(path, cls.META_FILE)) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        if meta.get('version') != cls.VERSION:
+            return None
+        scores = np.load(os.path.join(path, cls.SCORES_FILE), mmap_mode=mmap_mode)
+        levels = np.load(os.path.join(path, cls.LEVELS_FILE), mmap_mode=mmap_mode)
+        return cls(scores, levels, meta['districts'], pd.to_datetime(meta['dates']))
\ No newline at end of file
@@ -38,12 +38,13 @@ class ReportManager:
 ## Model Performance
 - R² Score: {model_perf['r2']:.3f}
 - RMSE: {model_perf['rmse']:.3f}
+- Rolling-origin CV R²: {model_perf['cv_mean']:.3f} ± {model_perf['cv_std']:.3f}
 
 ## Output Files
 - district_risk_assessment.csv
 - risk_distribution.png
 """
-        
+
         report_path = self.config.get_output_path('report.md')
         with open(report_path, 'w') as f:
             f.write(report)
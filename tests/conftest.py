@@ -0,0 +1,27 @@
+"""
+Shared test fixtures
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Monthly config whose stores and caches live under tmp_path"""
+    config = Config()
+    config.FREQUENCY = 'ME'
+    config.FEATURE_STORE = False
+    config.USE_CACHE = False
+    for name in ('CACHE_DIR', 'SERIES_DIR', 'GRID_DIR', 'WEIGHTS_DIR', 'PARQUET_DIR', 'CLIMATOLOGY_DIR',
+                 'ROLLING_STATE_DIR', 'FEATURE_STORE_DIR', 'CV_CACHE_DIR', 'MODELS_DIR', 'RISK_HISTORY_DIR'):
+        path = tmp_path / name.lower()
+        path.mkdir()
+        setattr(config, name, str(path))
+    return config
\ No newline at end of file
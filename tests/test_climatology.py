@@ -0,0 +1,45 @@
+"""
+Monthly climatology cache
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_processing.climatology import Climatology
+
+
+def _panel(seed, n_districts=5, n_months=48):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2015-01-31', periods=n_months, freq='ME')
+    return pd.DataFrame({
+        'district': np.repeat([f'District_{i:02d}' for i in range(n_districts)], n_months),
+        'date': np.tile(dates, n_districts),
+        'rainfall': rng.gamma(2, 50, n_districts * n_months)
+    })
+
+
+def test_cache_keeps_one_file_per_variable_and_baseline(config):
+    climatology = Climatology(config)
+    for seed in range(4):
+        panel = _panel(seed)
+        cached = climatology.load_or_build(panel, 'rainfall')
+        np.testing.assert_allclose(cached.stats, climatology.build(panel, 'rainfall').stats)
+        # A second call reads the file back
+        np.testing.assert_allclose(climatology.load_or_build(panel, 'rainfall').stats, cached.stats)
+    assert os.listdir(config.CLIMATOLOGY_DIR) == ['rainfall_full_record.npz']
+    
+    config.CLIMATOLOGY_BASELINE = ('2015-01-01', '2016-12-31')
+    for seed in range(2):
+        Climatology(config).load_or_build(_panel(seed), 'rainfall')
+    assert sorted(os.listdir(config.CLIMATOLOGY_DIR)) == [
+        'rainfall_20150101_20161231.npz', 'rainfall_full_record.npz'
+    ]
+
+
+def test_files_of_the_fingerprint_layout_are_removed(config):
+    legacy = os.path.join(config.CLIMATOLOGY_DIR, f"rainfall_{'0' * 64}.npz")
+    np.savez(legacy, stats=np.zeros(1))
+    Climatology(config).load_or_build(_panel(0), 'rainfall')
+    assert os.listdir(config.CLIMATOLOGY_DIR) == ['rainfall_full_record.npz']
\ No newline at end of file
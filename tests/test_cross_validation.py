@@ -0,0 +1,63 @@
+"""
+Rolling-origin cross-validation and the time-based holdout
+"""
+
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from modeling.cross_validation import RollingOriginCV
+from modeling.model_trainer import ModelTrainer
+
+
+def _panel(config, n_months=72):
+    scenario = SyntheticScenario(config)
+    return DataProcessor(config).process_panel(scenario.to_raw_data(scenario.generate(30, n_months, '2015-01-01')))
+
+
+def test_folds_never_train_on_future_months(config):
+    dates = np.repeat(np.arange('2015-01', '2021-01', dtype='datetime64[M]'), 5)
+    folds = RollingOriginCV(config).folds(dates)
+    assert len(folds) == config.CROSS_VALIDATION
+    for train_stop, test_stop in folds:
+        assert dates[:train_stop].max() < dates[train_stop:test_stop].min()
+        assert len(np.unique(dates[train_stop:test_stop])) == config.CV_TEST_MONTHS
+
+
+def test_rerun_reads_fold_metrics_from_cache(config):
+    config.USE_CACHE = True
+    config.CV_WORKERS = 1
+    rng = np.random.default_rng(0)
+    dates = np.repeat(np.arange('2015-01', '2021-01', dtype='datetime64[M]'), 20)
+    X = rng.normal(size=(len(dates), 3))
+    y = X @ [1.0, -2.0, 0.5] + rng.normal(0, 0.1, len(dates))
+    estimator = RandomForestRegressor(n_estimators=5, random_state=0)
+    
+    first = RollingOriginCV(config).cross_validate(X, y, dates, estimator)
+    second = RollingOriginCV(config).cross_validate(X, y, dates, estimator)
+    assert not first['folds']['cached'].any() and second['folds']['cached'].all()
+    np.testing.assert_array_equal(first['folds']['r2'], second['folds']['r2'])
+    
+    # Only metrics and timings are cached, not fold models
+    sizes = [entry.stat().st_size for entry in os.scandir(config.CV_CACHE_DIR)]
+    assert len(sizes) == len(first['folds']) and max(sizes) < 4096
+
+
+def test_trainer_reports_cross_validation(config):
+    config.N_ESTIMATORS = 5
+    config.CV_WORKERS = 1
+    config.MODEL_REGISTRY = False
+    results = ModelTrainer(config).train_models(_panel(config))
+    assert results['model_performance']['cv_mean'] == pytest.approx(results['cv_folds']['r2'].mean())
+    assert len(results['cv_folds']) == config.CROSS_VALIDATION
+
+
+def test_single_month_panel_is_rejected(config):
+    config.MODEL_REGISTRY = False
+    panel = _panel(config)
+    with pytest.raises(ValueError, match="at least two months"):
+        ModelTrainer(config).train_models(panel[panel['date'] == panel['date'].max()])
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Concurrent collection timeouts and the dataset cache
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from data_ingestion.data_collector import DataCollector
+from data_ingestion.grace_data import GRACEData
+
+
+def _sleeping_source(name, seconds):
+    def collect():
+        time.sleep(seconds)
+        return name
+    return (name, f"   ⏳ {name}", collect, None)
+
+
+def test_timeout_starts_when_a_worker_picks_the_source_up(config):
+    config.CONCURRENT_COLLECTION = True
+    config.COLLECTION_WORKERS = 1
+    config.COLLECTION_TIMEOUT = 1.0
+    # Run back to back, the second source finishes 1.2 s after submission
+    sources = {name: _sleeping_source(name, 0.6) for name in ('first', 'second')}
+    
+    results = DataCollector(config, sources=sources)._collect_concurrently()
+    assert [results[name][0] for name in sources] == ['first', 'second']
+
+
+def test_slow_source_times_out(config):
+    config.CONCURRENT_COLLECTION = True
+    config.COLLECTION_WORKERS = 2
+    config.COLLECTION_TIMEOUT = 0.3
+    config.COLLECTION_RETRIES = 0
+    sources = {'fast': _sleeping_source('fast', 0.05), 'slow': _sleeping_source('slow', 1.5)}
+    
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match="'slow'"):
+        DataCollector(config, sources=sources)._collect_concurrently()
+    assert time.monotonic() - start < 1.0
+
+
+def _collect(config, name, seed):
+    config.DATA_SEED = seed
+    value, _, _, cached = DataCollector(config)._collect_with_retry(name)
+    return value, cached
+
+
+def test_cache_is_keyed_by_data_seed(config):
+    config.USE_CACHE = True
+    first, first_cached = _collect(config, 'grace', 1)
+    other, other_cached = _collect(config, 'grace', 2)
+    again, again_cached = _collect(config, 'grace', 1)
+    
+    assert not first_cached and not other_cached and again_cached
+    assert not np.allclose(first['values'], other['values'])
+    np.testing.assert_array_equal(first['values'], again['values'])
+    
+    stats, _ = _collect(config, 'agriculture', 1)
+    other_stats, other_cached = _collect(config, 'agriculture', 2)
+    assert not other_cached
+    assert not np.allclose(stats['crop_intensity'], other_stats['crop_intensity'])
+
+
+def test_unseeded_sources_bypass_the_cache(config):
+    config.USE_CACHE = True
+    for name in ('grace', 'rainfall', 'agriculture'):
+        first, first_cached = _collect(config, name, None)
+        second, second_cached = _collect(config, name, None)
+        assert not first_cached and not second_cached
+    assert not np.allclose(first['crop_intensity'], second['crop_intensity'])
+    assert not [f for f in os.listdir(config.CACHE_DIR) if not f.startswith('.')]
+
+
+def test_grids_are_rebuilt_for_another_or_no_seed(config):
+    grids = []
+    for seed in (1, 1, 2, None, None):
+        config.DATA_SEED = seed
+        window, _, _ = GRACEData(config).download_grid().read_window(time_slice=slice(0, 3))
+        grids.append(window)
+    np.testing.assert_array_equal(grids[0], grids[1])
+    assert not np.allclose(grids[1], grids[2])
+    assert not np.allclose(grids[3], grids[4])
\ No newline at end of file
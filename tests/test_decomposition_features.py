@@ -0,0 +1,55 @@
+"""
+Seasonal decomposition features selected through DECOMPOSITION_FEATURES
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from data_processing.feature_registry import DECOMPOSITION_FEATURES
+from modeling.model_trainer import ModelTrainer
+from utils.helpers import StatisticsCalculator
+
+
+def _raw_data(config):
+    scenario = SyntheticScenario(config)
+    return scenario.to_raw_data(scenario.generate(20, 48, '2015-01-01'))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_selected_features_reach_the_panel_and_the_model(config, compact):
+    config.COMPACT_PANEL = compact
+    config.DECOMPOSITION_FEATURES = list(DECOMPOSITION_FEATURES)
+    processed_data = DataProcessor(config).process_panel(_raw_data(config))
+    
+    for feature in DECOMPOSITION_FEATURES:
+        assert feature in processed_data.columns
+    np.testing.assert_allclose(
+        processed_data['tws_deseasonalized'],
+        processed_data['tws_anomaly'] - processed_data['tws_seasonal'], rtol=1e-5, atol=1e-5
+    )
+    features = ModelTrainer(config).model_features(processed_data)
+    assert features[-len(DECOMPOSITION_FEATURES):] == list(DECOMPOSITION_FEATURES)
+
+
+def test_panel_is_unchanged_without_decomposition_features(config):
+    processed_data = DataProcessor(config).process_panel(_raw_data(config))
+    assert not set(DECOMPOSITION_FEATURES) & set(processed_data.columns)
+
+
+def test_seasonal_profile_is_the_centred_classical_profile():
+    rng = np.random.default_rng(0)
+    months = np.arange(60)
+    matrix = 0.05 * months + np.sin(2 * np.pi * months / 12) + rng.normal(0, 0.2, (4, 60))
+    seasonal = StatisticsCalculator.calculate_seasonal_decompositions(matrix, 12)['seasonal']
+    
+    for row, values in enumerate(matrix):
+        series = pd.Series(values)
+        trend = series.rolling(12, center=True).mean()
+        profile = (series - trend).groupby(months % 12).mean()
+        # Same profile up to a constant: the decomposition centres it on zero
+        offset = seasonal[row, :12] - profile.to_numpy()
+        np.testing.assert_allclose(offset, offset.mean(), atol=1e-10)
+        np.testing.assert_allclose(seasonal[row, :12].sum(), 0, atol=1e-10)
\ No newline at end of file
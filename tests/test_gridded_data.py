@@ -0,0 +1,83 @@
+"""
+Chunked grid windows and the parameters that key stored grids
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_ingestion.grace_data import GRACEData
+from data_ingestion.gridded_data import ChunkedGrid, grid_params
+
+
+def _grid(path, chunk_size=4, params=None):
+    rng = np.random.default_rng(0)
+    lat = np.arange(10) * 0.5 + 8.25
+    lon = np.arange(9) * 0.5 + 68.25
+    time = pd.date_range('2020-01-31', periods=12, freq='ME')
+    full = rng.normal(size=(len(time), len(lat), len(lon))).astype('float32')
+    full[:, 2:6, 3] = np.nan
+    full[4, 5, 5] = np.nan
+    
+    def fill_chunk(lat_block, lon_block):
+        i = np.searchsorted(lat, lat_block)
+        j = np.searchsorted(lon, lon_block)
+        return full[:, i][:, :, j]
+    
+    grid = ChunkedGrid.create(path, 'tws_anomaly', 'cm', lat, lon, time, fill_chunk,
+                              chunk_size=chunk_size, params=params)
+    return grid, full
+
+
+@pytest.mark.parametrize('lat_range, lon_range, time_slice', [
+    (None, None, slice(None)),
+    ((9.0, 11.5), (69.0, 71.5), slice(None)),
+    ((8.25, 12.75), (70.25, 72.25), slice(3, 9)),
+    ((10.25, 10.25), (69.75, 70.25), slice(None, None, 2))
+])
+def test_windows_across_chunks_match_the_full_array(tmp_path, lat_range, lon_range, time_slice):
+    grid, full = _grid(str(tmp_path / 'grid'))
+    lat_mask = np.ones(len(grid.lat), dtype=bool)
+    lon_mask = np.ones(len(grid.lon), dtype=bool)
+    if lat_range is not None:
+        lat_mask = (grid.lat >= lat_range[0]) & (grid.lat <= lat_range[1])
+        lon_mask = (grid.lon >= lon_range[0]) & (grid.lon <= lon_range[1])
+    expected = full[time_slice][:, lat_mask][:, :, lon_mask]
+    
+    window, lat, lon = grid.read_window(lat_range, lon_range, time_slice)
+    np.testing.assert_array_equal(window, expected)
+    np.testing.assert_array_equal(lat, grid.lat[lat_mask])
+    np.testing.assert_array_equal(lon, grid.lon[lon_mask])
+    
+    with np.errstate(invalid='ignore'):
+        expected_mean = np.nanmean(full[:, lat_mask][:, :, lon_mask].astype(float), axis=(1, 2))
+    np.testing.assert_allclose(grid.window_mean(lat_range, lon_range), expected_mean, rtol=1e-12)
+
+
+def test_window_mean_of_an_all_nan_window_is_nan(tmp_path):
+    grid, _ = _grid(str(tmp_path / 'grid'))
+    assert np.isnan(grid.window_mean((9.25, 10.75), (69.75, 69.75))).all()
+
+
+@pytest.mark.parametrize('name, value', [
+    ('DATA_SEED', 7),
+    ('GRID_CHUNK_SIZE', 16),
+    ('GRID_RESOLUTION', 0.5),
+    ('LAT_RANGE', (6, 36)),
+    ('END_DATE', '2022-12-31')
+])
+def test_grid_params_change_invalidates_the_stored_grid(config, name, value):
+    def params():
+        return grid_params(config, GRACEData(config).cache_params(), GRACEData.SOURCE_VERSION)
+    
+    path = os.path.join(config.GRID_DIR, 'grace')
+    stored = params()
+    _grid(path, params=stored)
+    assert ChunkedGrid.exists(path, stored)
+    assert not ChunkedGrid.exists(path, {**stored, 'version': GRACEData.SOURCE_VERSION + 1})
+    
+    setattr(config, name, value)
+    assert params() != stored
+    assert not ChunkedGrid.exists(path, params())
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Model building from a panel published in shared memory
+"""
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from modeling.model_manager import ModelManager
+from utils.shared_panel import shared_panel_spec
+
+
+def _published_panel(config):
+    config.SHARED_PANEL = True
+    config.N_ESTIMATORS = 5
+    config.CV_WORKERS = 1
+    config.MODEL_REGISTRY = False
+    scenario = SyntheticScenario(config)
+    raw_data = scenario.to_raw_data(scenario.generate(30, 48, '2015-01-01'))
+    processor = DataProcessor(config)
+    return processor, processor.process_all_data(raw_data)
+
+
+def test_subset_of_a_published_panel_is_not_classified_as_the_whole_panel(config):
+    processor, processed_data = _published_panel(config)
+    try:
+        district = processed_data['district'].iloc[0]
+        subset = processed_data[processed_data['district'] == district]
+        assert shared_panel_spec(subset) is None
+        assert shared_panel_spec(processed_data.sort_values('date', kind='stable')) is None
+        
+        results = ModelManager(config).build_models(subset)
+        assert list(results['risk_assessment']['district']) == [district]
+        assert list(results['risk_history'].districts) == [district]
+    finally:
+        processor.release_panel()
+
+
+def test_published_panel_is_classified_from_shared_memory(config):
+    processor, processed_data = _published_panel(config)
+    try:
+        assert shared_panel_spec(processed_data) is not None
+        shared = ModelManager(config).build_models(processed_data)
+        local_data = processed_data.copy()
+        local_data.attrs = {}
+        local = ModelManager(config).build_models(local_data)
+        assert shared['risk_assessment']['district'].nunique() == 30
+        assert shared['risk_assessment'].equals(local['risk_assessment'])
+    finally:
+        processor.release_panel()
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Model registry: deduplicated registration and inference-only loading
+"""
+
+import numpy as np
+import pytest
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from modeling.model_registry import ModelRegistry
+from modeling.model_trainer import ModelTrainer
+
+
+@pytest.fixture
+def processed_data(config):
+    config.N_ESTIMATORS = 5
+    config.CV_WORKERS = 1
+    scenario = SyntheticScenario(config)
+    return DataProcessor(config).process_panel(scenario.to_raw_data(scenario.generate(40, 48, '2015-01-01')))
+
+
+def test_identical_runs_register_one_model(config, processed_data):
+    first = ModelTrainer(config).train_models(processed_data)
+    second = ModelTrainer(config).train_models(processed_data)
+    assert second['model_id'] == first['model_id']
+    assert len(ModelRegistry(config).entries()) == 1
+    
+    config.N_ESTIMATORS = 6
+    third = ModelTrainer(config).train_models(processed_data)
+    assert third['model_id'] != first['model_id']
+    assert len(ModelRegistry(config).entries()) == 2
+
+
+def test_inference_loads_registered_model(config, processed_data):
+    trained = ModelTrainer(config).train_models(processed_data)
+    
+    config.INFERENCE_ONLY = True
+    loaded = ModelTrainer(config).train_models(processed_data)
+    assert loaded['model_id'] == trained['model_id']
+    assert loaded['model_performance'] == pytest.approx(trained['model_performance'])
+    features = trained['feature_importance']['feature'].tolist()
+    X = processed_data[ModelTrainer(config).model_features(processed_data)].dropna()
+    np.testing.assert_array_equal(loaded['model'].predict(X), trained['model'].predict(X))
+    assert sorted(loaded['feature_importance']['feature']) == sorted(features)
+    
+    config.MODEL_ID = 'missing'
+    with pytest.raises(ValueError):
+        ModelTrainer(config).train_models(processed_data)
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Panels read back from the partitioned store keep (district, date) order
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.panel_store import PanelStore
+
+
+def _panel(n_districts=40, n_dates=30):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2018-01-31', periods=n_dates, freq='ME')
+    panel = pd.DataFrame({
+        'district': np.repeat([f'district_{i:03d}' for i in range(n_districts)], n_dates),
+        'date': np.tile(dates, n_districts),
+        'tws_anomaly': rng.normal(size=n_districts * n_dates)
+    })
+    # Shuffle so row order has to come from the sort, not the write order
+    return panel.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_read_sorts_on_district_and_date(config):
+    store = PanelStore(config)
+    panel = _panel()
+    store.write('panel', panel)
+    
+    expected = panel.sort_values(['district', 'date']).reset_index(drop=True)
+    full = store.read('panel')
+    assert list(full.columns) == ['district', 'date', 'tws_anomaly']
+    np.testing.assert_array_equal(full['district'].astype(str), expected['district'])
+    np.testing.assert_array_equal(full['tws_anomaly'], expected['tws_anomaly'])
+
+
+def test_read_sorts_when_keys_are_not_projected(config):
+    store = PanelStore(config)
+    panel = _panel()
+    store.write('panel', panel)
+    
+    expected = panel.sort_values(['district', 'date']).reset_index(drop=True)
+    measures = store.read('panel', columns=['tws_anomaly'])
+    assert list(measures.columns) == ['tws_anomaly']
+    np.testing.assert_array_equal(measures['tws_anomaly'], expected['tws_anomaly'])
+    
+    window = store.read('panel', columns=['tws_anomaly'], start_date='2019-01-01')
+    expected_window = expected[expected['date'] >= '2019-01-01']['tws_anomaly']
+    np.testing.assert_array_equal(window['tws_anomaly'], expected_window)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Streamed and in-memory risk histories must agree
+"""
+
+import numpy as np
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor
+from modeling.chunked_pipeline import ChunkedPipeline
+from modeling.risk_classifier import RiskClassifier
+from modeling.risk_history import RiskHistory
+
+
+def test_streamed_history_matches_in_memory_history(config):
+    config.PARQUET_STORAGE = True
+    config.N_ESTIMATORS = 5
+    config.CV_WORKERS = 1
+    config.MODEL_REGISTRY = False
+    scenario = SyntheticScenario(config)
+    raw_data = scenario.to_raw_data(scenario.generate(300, 48, '2015-01-01'))
+    
+    _, expected = RiskClassifier(config).assess_risk(DataProcessor(config).process_panel(raw_data))
+    
+    pipeline = ChunkedPipeline(config)
+    pipeline.districts_per_chunk = lambda raw_data, headroom=None: 70
+    _, models_results = pipeline.run(raw_data)
+    streamed = RiskHistory.load(config.RISK_HISTORY_DIR)
+    
+    assert isinstance(streamed.scores, np.memmap)
+    assert list(streamed.districts) == list(expected.districts)
+    assert streamed.dates.equals(expected.dates)
+    np.testing.assert_allclose(streamed.scores, expected.scores, rtol=1e-6, atol=1e-6)
+    np.testing.assert_array_equal(streamed.levels, expected.levels)
+    np.testing.assert_array_equal(models_results['risk_history'].levels, expected.levels)
\ No newline at end of file
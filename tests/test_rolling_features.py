@@ -0,0 +1,131 @@
+"""
+Incremental rolling features must match a full recomputation
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from data_processing.data_processor import DataProcessor, PANEL_ROLLING_FEATURES
+from data_processing.rolling_features import RollingFeatureEngine, RollingState
+from utils.panel_store import PanelStore
+
+N_APPENDS = 6
+FEATURES = [('tws_trend', 6), ('tws_trend', 12), ('rainfall_std', 6), ('stress_trend', 24)]
+DEPLETION = ['depletion_rate', 'depletion_acceleration']
+
+
+def _scenario(config, n_districts=40, n_months=36):
+    scenario = SyntheticScenario(config)
+    return scenario.to_raw_data(scenario.generate(n_districts, n_months, '2015-01-01'))
+
+
+def _first_months(raw_data, n_months):
+    """raw_data as if only its first n_months had been ingested"""
+    dates = raw_data['grace']['dates'][:n_months]
+    delta = {'new_dates': dates[-1:], 'n_new': 1, 'full_reload': False}
+    truncated = dict(raw_data, delta=delta, district_series={
+        name: matrix[:, :n_months] for name, matrix in raw_data['district_series'].items()
+    })
+    for source in ('grace', 'rainfall'):
+        truncated[source] = dict(raw_data[source], dates=dates, values=raw_data[source]['values'][:n_months],
+                                 delta=delta)
+    return truncated
+
+
+def _assert_same_features(actual, expected, columns):
+    key = ['district', 'date']
+    actual = actual.sort_values(key).reset_index(drop=True)
+    expected = expected.sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual[key], expected[key], check_dtype=False, check_categorical=False)
+    for col in columns:
+        # assert_allclose treats matching NaNs as equal and fails on mismatched ones
+        np.testing.assert_allclose(actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-9, err_msg=col)
+
+
+def test_state_updates_match_full_compute(config):
+    processor = DataProcessor(config)
+    panel_data = processor.build_panel(_scenario(config))
+    panel_data['water_stress'] = -panel_data['tws_anomaly']
+    dates = np.sort(panel_data['date'].unique())
+    
+    engine = RollingFeatureEngine()
+    state = engine.state(panel_data[panel_data['date'] <= dates[-N_APPENDS - 1]], FEATURES, depletion=DEPLETION)
+    state_path = f"{config.ROLLING_STATE_DIR}/state.npz"
+    appended = []
+    for date in dates[-N_APPENDS:]:
+        state.save(state_path)
+        state = RollingState.load(state_path)
+        appended.append(state.update(panel_data[panel_data['date'] == date]))
+    
+    full = engine.compute(panel_data, FEATURES, depletion=DEPLETION)
+    _assert_same_features(pd.concat(appended), full[full['date'] > dates[-N_APPENDS - 1]], state.columns)
+
+
+def test_incremental_processing_matches_full_processing(config):
+    config.PARQUET_STORAGE = True
+    config.INCREMENTAL_INGESTION = True
+    raw_data = _scenario(config)
+    n_months = len(raw_data['grace']['dates'])
+    
+    processor = DataProcessor(config)
+    for months in range(n_months - N_APPENDS, n_months + 1):
+        incremental = processor.process_all_data(_first_months(raw_data, months))
+    
+    config.INCREMENTAL_INGESTION = False
+    full = DataProcessor(config).process_all_data(raw_data)
+    columns = [f'{prefix}_{window}m' for prefix, window in PANEL_ROLLING_FEATURES]
+    _assert_same_features(incremental, full, columns)
+
+def test_append_neither_rereads_nor_rewrites_the_history(config, monkeypatch):
+    config.PARQUET_STORAGE = True
+    config.INCREMENTAL_INGESTION = True
+    raw_data = _scenario(config)
+    n_months = len(raw_data['grace']['dates'])
+    n_districts = len(raw_data['district_stats'])
+    processor = DataProcessor(config)
+    processor.process_all_data(_first_months(raw_data, n_months - 1))
+    
+    writes = []
+    
+    def no_read(self, *args, **kwargs):
+        raise AssertionError("The stored history was read back")
+    
+    original_write = PanelStore.write
+    
+    def recorded_write(self, name, df, append=False, key=None):
+        writes.append((len(df), append))
+        return original_write(self, name, df, append=append, key=key)
+    
+    monkeypatch.setattr(PanelStore, 'read', no_read)
+    monkeypatch.setattr(PanelStore, 'write', recorded_write)
+    
+    processor.process_all_data(_first_months(raw_data, n_months))
+    assert processor.appended is not None
+    assert writes == [(n_districts, True)]
+    
+    monkeypatch.undo()
+    stored = PanelStore(config).read('panel')
+    assert len(stored) == n_districts * n_months
+    assert stored.groupby(['district', 'date'], observed=True).size().max() == 1
+
+
+def test_changed_history_falls_back_to_full_recompute(config):
+    config.PARQUET_STORAGE = True
+    config.INCREMENTAL_INGESTION = True
+    raw_data = _scenario(config)
+    n_months = len(raw_data['grace']['dates'])
+    processor = DataProcessor(config)
+    processor.process_all_data(_first_months(raw_data, n_months - 1))
+    
+    revised = _first_months(raw_data, n_months)
+    revised['district_series'] = {name: matrix.copy() for name, matrix in revised['district_series'].items()}
+    revised['district_series']['tws_anomaly'][:, 0] += 1.0
+    incremental = processor.process_all_data(revised)
+    assert processor.appended is None
+    
+    config.INCREMENTAL_INGESTION = False
+    full = DataProcessor(config).process_all_data(revised)
+    columns = [f'{prefix}_{window}m' for prefix, window in PANEL_ROLLING_FEATURES]
+    _assert_same_features(incremental, full, columns)
\ No newline at end of file
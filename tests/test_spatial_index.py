@@ -0,0 +1,110 @@
+"""
+District geometries, the STR-packed district index and index-backed zonal weights
+"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_ingestion.geometry import KM_PER_DEGREE, MultiPolygon, Polygon, read_geojson
+from data_ingestion.spatial_index import DistrictIndex
+from data_processing.zonal_weights import ZonalWeights
+
+
+def _triangulated_grid(n_rows=12, n_cols=15):
+    """Partition [0, n_cols] x [0, n_rows] into two triangles per unit square"""
+    names, geometries = [], []
+    for row in range(n_rows):
+        for col in range(n_cols):
+            x, y = col, row
+            names += [f'D{row}_{col}_a', f'D{row}_{col}_b']
+            geometries += [Polygon([(x, y), (x + 1, y), (x + 1, y + 1)]),
+                           Polygon([(x, y), (x + 1, y + 1), (x, y + 1)])]
+    return pd.DataFrame({'district': names, 'geometry': geometries})
+
+
+def _brute_force_locate(districts_gdf, points):
+    result = np.full(len(points), -1)
+    for position, geometry in enumerate(districts_gdf['geometry']):
+        inside = geometry.contains_points(points) & (result == -1)
+        result[inside] = position
+    return result
+
+
+def test_polygon_area_and_holes():
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert square.area_sqkm() == pytest.approx(KM_PER_DEGREE ** 2 * np.cos(np.radians(0.4)))
+    
+    holed = Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (3, 1), (3, 3), (1, 3)]])
+    assert holed.area_sqkm() == pytest.approx(12 / 16 * Polygon(holed.exterior.coords).area_sqkm())
+    np.testing.assert_array_equal(holed.contains_points(np.array([[0.5, 0.5], [2, 2], [5, 5]])),
+                                  [True, False, False])
+    
+    both = MultiPolygon([square, Polygon([(2, 2), (3, 2), (3, 3), (2, 3)])])
+    assert both.bounds == (0, 0, 3, 3)
+    np.testing.assert_array_equal(both.contains_points(np.array([[0.5, 0.5], [1.5, 1.5], [2.5, 2.5]])),
+                                  [True, False, True])
+
+
+def test_read_geojson(tmp_path):
+    path = tmp_path / 'districts.geojson'
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': [
+        {'properties': {'district': 'A'},
+         'geometry': {'type': 'Polygon', 'coordinates': [[[0, 0], [1, 0], [1, 1], [0, 0]]]}},
+        {'properties': {'district': 'B'},
+         'geometry': {'type': 'MultiPolygon', 'coordinates': [[[[2, 2], [3, 2], [3, 3], [2, 2]]],
+                                                              [[[4, 4], [5, 4], [5, 5], [4, 4]]]]}}
+    ]}))
+    (name_a, polygon), (name_b, multi) = read_geojson(str(path))
+    assert (name_a, name_b) == ('A', 'B')
+    assert isinstance(polygon, Polygon) and isinstance(multi, MultiPolygon) and len(multi.geoms) == 2
+    assert multi.bounds == (2, 2, 5, 5)
+
+
+@pytest.mark.parametrize('node_capacity', [2, 4, 16])
+def test_locate_points_matches_brute_force(node_capacity):
+    districts_gdf = _triangulated_grid()
+    index = DistrictIndex(districts_gdf, node_capacity)
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-1, 16, size=(5000, 2))
+    
+    expected = _brute_force_locate(districts_gdf, points)
+    np.testing.assert_array_equal(index.locate_points(points[:, 1], points[:, 0]), expected)
+    assert (expected == -1).any() and (expected >= 0).any()
+    
+    names = index.locate_districts(points[:, 1], points[:, 0])
+    assert names[expected >= 0].tolist() == districts_gdf['district'].to_numpy()[expected[expected >= 0]].tolist()
+    assert all(name is None for name in names[expected == -1])
+
+
+def test_query_windows_matches_brute_force():
+    districts_gdf = _triangulated_grid()
+    index = DistrictIndex(districts_gdf, node_capacity=4)
+    rng = np.random.default_rng(1)
+    corners = rng.uniform(-1, 16, size=(200, 2, 2))
+    windows = np.column_stack([corners.min(axis=1), corners.max(axis=1)])[:, [0, 1, 2, 3]]
+    
+    for window, positions in zip(windows, index.query_windows(windows)):
+        expected = [position for position, geometry in enumerate(districts_gdf['geometry'])
+                    if DistrictIndex._intersects_window(geometry, window)]
+        np.testing.assert_array_equal(positions, expected)
+    
+    # A window inside the lower triangle of one square touches only that triangle
+    assert index.query_window(0.6, 0.1, 0.9, 0.3) == ['D0_0_a']
+
+
+def test_index_backed_zonal_weights_match_per_district_weights(config):
+    districts_gdf = _triangulated_grid(6, 8)
+    grid = SimpleNamespace(lat=np.arange(0.125, 6, 0.25), lon=np.arange(0.125, 8, 0.25))
+    zonal_weights = ZonalWeights(config)
+    
+    expected = zonal_weights.build(districts_gdf, grid).toarray()
+    actual = zonal_weights.build(districts_gdf, grid, DistrictIndex(districts_gdf)).toarray()
+    np.testing.assert_allclose(actual.sum(axis=1), 1)
+    np.testing.assert_allclose(actual, expected, atol=0.05)
+    
+    with pytest.raises(ValueError):
+        zonal_weights.build(districts_gdf, grid, DistrictIndex(districts_gdf.iloc[::-1]))
\ No newline at end of file
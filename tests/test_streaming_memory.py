@@ -0,0 +1,37 @@
+"""
+A streaming run must stay within its memory budget
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from data_ingestion.synthetic_scenario import SyntheticScenario
+from modeling.chunked_pipeline import ChunkedPipeline, peak_rss_mb
+
+N_DISTRICTS = 8000
+MEMORY_BUDGET_MB = 1024
+
+
+def _streaming_run(config, n_districts):
+    """Generate a scenario and stream it; return chunk size, district count and peak RSS"""
+    scenario = SyntheticScenario(config)
+    raw_data = scenario.to_raw_data(scenario.generate(n_districts=n_districts, n_workers=1))
+    pipeline = ChunkedPipeline(config)
+    chunk_size = pipeline.districts_per_chunk(raw_data)
+    _, models_results = pipeline.run(raw_data)
+    return chunk_size, len(models_results['risk_assessment']), peak_rss_mb()
+
+
+def test_streaming_peak_rss_within_budget(config):
+    config.MEMORY_BUDGET_MB = MEMORY_BUDGET_MB
+    config.CV_WORKERS = 1
+    config.MODEL_REGISTRY = False
+    
+    # A fresh process, so peak RSS counts this run alone
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        chunk_size, n_assessed, peak_mb = executor.submit(_streaming_run, config, N_DISTRICTS).result()
+    
+    assert chunk_size < N_DISTRICTS, "the budget should force more than one chunk"
+    assert n_assessed == N_DISTRICTS
+    assert peak_mb <= MEMORY_BUDGET_MB, f"peak RSS {peak_mb:.0f} MB exceeds {MEMORY_BUDGET_MB} MB"
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Versioned store of engineered panels keyed by input fingerprint
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from data_processing.compact_panel import DistrictStatic
+
+def content_hash(value):
+    """SHA-256 of nested dicts, lists, arrays and pandas objects by content"""
+    digest = hashlib.sha256()
+    _update_hash(digest, value)
+    return digest.hexdigest()
+
+def _update_hash(digest, value):
+    if isinstance(value, dict):
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode('utf-8'))
+            _update_hash(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}:{len(value)}'.encode('utf-8'))
+        for item in value:
+            _update_hash(digest, item)
+    elif isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([str(col) for col in value.columns]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, (pd.Series, pd.Index)):
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'{value.dtype}:{value.shape}'.encode('utf-8'))
+        if value.dtype == object:
+            digest.update(pd.util.hash_array(value.ravel()).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+class FeatureStore:
+    """Engineered panels on disk, evicted by age and least recent use
+    
+    Each entry is a directory named by its fingerprint holding the panel,
+    the static district table of a compact panel and a metadata file.
+    """
+    
+    META_FILE = 'meta.json'
+    PANEL_FILE = 'panel.parquet'
+    STATIC_FILE = 'static.parquet'
+    
+    def __init__(self, config):
+        self.config = config
+        self.root = config.FEATURE_STORE_DIR
+        self.max_size_bytes = config.FEATURE_STORE_MAX_SIZE_MB * 1024 * 1024
+        self.ttl_seconds = config.FEATURE_STORE_TTL_DAYS * 86400
+        os.makedirs(self.root, exist_ok=True)
+    
+    @staticmethod
+    def make_key(inputs, definitions, params):
+        """Fingerprint of the input data, feature definitions and config parameters"""
+        payload = json.dumps(
+            {'inputs': inputs, 'definitions': definitions, 'params': params},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.root, key)
+    
+    def resolve(self, prefix):
+        """Full key of the single stored entry whose fingerprint starts with prefix"""
+        matches = [entry['key'] for entry in self.entries() if entry['key'].startswith(prefix)]
+        if len(matches) != 1:
+            raise ValueError(f"Fingerprint '{prefix}' matches {len(matches)} stored feature sets")
+        return matches[0]
+    
+    def get(self, key):
+        """Return the stored panel for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, self.META_FILE)) as f:
+                meta = json.load(f)
+            panel = pd.read_parquet(os.path.join(path, self.PANEL_FILE))
+            if meta['static']:
+                panel.attrs['district_static'] = DistrictStatic(
+                    pd.read_parquet(os.path.join(path, self.STATIC_FILE))
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"      ⚠️  Discarding unreadable feature set {key[:12]}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        
+        # Access time drives LRU eviction
+        os.utime(os.path.join(path, self.META_FILE))
+        return panel
+    
+    def put(self, key, panel, definitions=None):
+        """Store a panel under key and evict expired or least recently used entries"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        
+        district_static = panel.attrs.get('district_static')
+        table = panel.copy(deep=False)
+        table.attrs = {}  # Side tables are stored as their own file
+        table.to_parquet(os.path.join(tmp_path, self.PANEL_FILE), index=False)
+        if district_static is not None:
+            district_static.table.reset_index().to_parquet(os.path.join(tmp_path, self.STATIC_FILE), index=False)
+        
+        meta = {
+            'key': key,
+            'created': time.time(),
+            'rows': len(panel),
+            'columns': [str(col) for col in panel.columns],
+            'static': district_static is not None,
+            'definitions': definitions or {}
+        }
+        with open(os.path.join(tmp_path, self.META_FILE), 'w') as f:
+            json.dump(meta, f, default=str)
+        
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+    
+    def entries(self):
+        """Stored entries' metadata with size_bytes and last_access, oldest first"""
+        entries = []
+        for name in os.listdir(self.root):
+            path = self._path(name)
+            meta_path = os.path.join(path, self.META_FILE)
+            if name.endswith('.tmp') or not os.path.exists(meta_path):
+                continue
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                meta['last_access'] = os.stat(meta_path).st_mtime
+                meta['size_bytes'] = sum(
+                    entry.stat().st_size for entry in os.scandir(path) if entry.is_file()
+                )
+            except (OSError, ValueError):
+                continue
+            entries.append(meta)
+        return sorted(entries, key=lambda entry: entry['last_access'])
+    
+    def evict(self):
+        """Remove entries past the TTL, then least recently used ones over the size bound"""
+        now = time.time()
+        entries = []
+        for entry in self.entries():
+            if now - entry['created'] > self.ttl_seconds:
+                shutil.rmtree(self._path(entry['key']), ignore_errors=True)
+            else:
+                entries.append(entry)
+        
+        total_size = sum(entry['size_bytes'] for entry in entries)
+        for entry in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            shutil.rmtree(self._path(entry['key']), ignore_errors=True)
+            total_size -= entry['size_bytes']
+    
+    def print_entries(self):
+        """Print stored feature sets, most recently used first"""
+        entries = self.entries()
+        print(f"🗄️  {len(entries)} stored feature sets in {self.root}")
+        for entry in reversed(entries):
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created']))
+            used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_access']))
+            print(f"   {entry['key'][:12]}  created {created}  used {used}  "
+                  f"{entry['rows']:>10} rows  {len(entry['columns']):>3} columns  "
+                  f"{entry['size_bytes'] / 1024 ** 2:8.1f} MB")
+        return entries
\ No newline at end of file
@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
+import warnings
 
 class DataValidator:
     """Data validation utilities"""
@@ -113,6 +114,88 @@ class StatisticsCalculator:
         else:
             raise ValueError(f"Unsupported method: {method}")
     
+    @staticmethod
+    def calculate_trends(matrix, method='linear', max_pairs=None, random_state=None):
+        """Calculate the trend of every row of a (series x time) matrix at once
+        
+        NaNs are treated as missing; rows with fewer than two observations get
+        a zero slope, like calculate_trend. theil_sen takes the median of all
+        pairwise slopes; max_pairs, if given, caps the pairs per row with a
+        random subsample shared by every row.
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+        if method == 'linear':
+            return StatisticsCalculator._ols_slopes(matrix)
+        elif method == 'theil_sen':
+            return StatisticsCalculator._theil_sen_slopes(matrix, max_pairs, random_state)
+        else:
+            raise ValueError(f"Unsupported method: {method}")
+    
+    @staticmethod
+    def _ols_slopes(matrix):
+        """Closed-form least-squares slopes against time steps 0..T-1"""
+        valid = ~np.isnan(matrix)
+        y = np.where(valid, matrix, 0.0)
+        # Centre time to keep the normal equations well conditioned
+        x = np.arange(matrix.shape[1]) - (matrix.shape[1] - 1) / 2
+        
+        n = valid.sum(axis=1)
+        sum_x = valid @ x
+        sum_y = y.sum(axis=1)
+        sum_xx = valid @ (x * x)
+        sum_xy = y @ x
+        denominator = n * sum_xx - sum_x ** 2
+        
+        slopes = np.zeros(len(matrix))
+        fitted = (n >= 2) & (denominator > 0)
+        slopes[fitted] = (n * sum_xy - sum_x * sum_y)[fitted] / denominator[fitted]
+        return slopes
+    
+    @staticmethod
+    def _theil_sen_slopes(matrix, max_pairs=None, random_state=None, block_elements=4_000_000):
+        """Median pairwise slopes, row blocks at a time, medians by partitioning"""
+        n_series, n_times = matrix.shape
+        slopes = np.zeros(n_series)
+        if n_times < 2:
+            return slopes
+        
+        first, second = np.triu_indices(n_times, k=1)
+        subsample = max_pairs is not None and len(first) > max_pairs
+        if subsample:
+            rng = np.random.default_rng(random_state)
+            keep = np.sort(rng.choice(len(first), size=max_pairs, replace=False))
+            first, second = first[keep], second[keep]
+        dx = (second - first).astype(float)
+        
+        # Complete rows share one median position; gappy rows take the slow path
+        complete = ~np.isnan(matrix).any(axis=1)
+        rows = np.flatnonzero(complete)
+        n_pairs = len(first)
+        middle = [(n_pairs - 1) // 2, n_pairs // 2]
+        block_rows = max(block_elements // n_pairs, 1)
+        for start in range(0, len(rows), block_rows):
+            block = matrix[rows[start:start + block_rows]]
+            if subsample:
+                pair_slopes = (block[:, second] - block[:, first]) / dx
+            else:
+                # All pairs lag by lag from contiguous slices, avoiding index gathers
+                pair_slopes = np.empty((len(block), n_pairs))
+                offset = 0
+                for lag in range(1, n_times):
+                    pairs = pair_slopes[:, offset:offset + n_times - lag]
+                    np.subtract(block[:, lag:], block[:, :-lag], out=pairs)
+                    pairs /= lag
+                    offset += n_times - lag
+            pair_slopes.partition(middle, axis=1)
+            slopes[rows[start:start + block_rows]] = pair_slopes[:, middle].mean(axis=1)
+        
+        for row in np.flatnonzero(~complete):
+            pair_slopes = (matrix[row, second] - matrix[row, first]) / dx
+            pair_slopes = pair_slopes[~np.isnan(pair_slopes)]
+            if len(pair_slopes):
+                slopes[row] = np.median(pair_slopes)
+        return slopes
+    
     @staticmethod
     def calculate_anomaly(data, window=12, method='zscore'):
         """Calculate anomaly from rolling statistics"""
@@ -128,6 +211,112 @@ class StatisticsCalculator:
         
         return anomaly
     
+    @staticmethod
+    def calculate_seasonal_decompositions(matrix, period=12, robust_iterations=0):
+        """Seasonal decomposition of every row of a (series x time) matrix at once
+        
+        The trend is a centred moving average over one period, the seasonal
+        component the mean detrended value at each phase of the period,
+        centred to sum to zero, and the residual what remains; all three are
+        (series x time) arrays. NaNs are skipped. robust_iterations > 0
+        starts from moving and per-phase medians, then refits that many
+        times with bisquare weights on the residuals, like STL's outer loop.
+        """
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+        valid = ~np.isnan(matrix)
+        phases = np.arange(matrix.shape[1]) % period
+        
+        if robust_iterations:
+            # Medians keep one outlier from dragging whole windows and phases with it
+            windows = np.lib.stride_tricks.sliding_window_view(matrix, period, axis=1)
+            trend = np.full(matrix.shape, np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN windows stay NaN
+                median = np.median if valid.all() else np.nanmedian
+                trend[:, period // 2:period // 2 + windows.shape[1]] = median(windows, axis=2)
+            weights = None
+        else:
+            trend = StatisticsCalculator._centred_moving_average(
+                np.where(valid, matrix, 0.0), valid.astype(float), period
+            )
+            weights = valid.astype(float)
+        seasonal = StatisticsCalculator._phase_profile(matrix - trend, weights, period)[:, phases]
+        residual = matrix - trend - seasonal
+        
+        for _ in range(robust_iterations):
+            # Smooth the deseasonalised series, as STL does: a down-weighted point
+            # would otherwise leak the seasonal cycle into the trend
+            weights = valid * StatisticsCalculator._bisquare_weights(residual)
+            trend = StatisticsCalculator._centred_moving_average(
+                np.where(valid, matrix - seasonal, 0.0), weights, period
+            )
+            seasonal = StatisticsCalculator._phase_profile(matrix - trend, weights, period)[:, phases]
+            residual = matrix - trend - seasonal
+        
+        return {
+            'trend': trend,
+            'seasonal': seasonal,
+            'residual': residual
+        }
+    
+    @staticmethod
+    def _phase_profile(detrended, weights, period):
+        """(series x period) weighted mean, or median when weights is None, at each phase, centred"""
+        profile = np.full((len(detrended), period), np.nan)
+        for phase in range(min(period, detrended.shape[1])):
+            values = detrended[:, phase::period]
+            observed = ~np.isnan(values)
+            fitted = observed.any(axis=1)
+            if weights is None:
+                profile[fitted, phase] = np.nanmedian(values[fitted], axis=1)
+                continue
+            phase_weights = np.where(observed, weights[:, phase::period], 0.0)
+            total_weight = phase_weights.sum(axis=1)
+            fitted &= total_weight > 0
+            profile[fitted, phase] = (
+                (np.where(observed, values, 0.0) * phase_weights)[fitted].sum(axis=1) / total_weight[fitted]
+            )
+        
+        n_phases = (~np.isnan(profile)).sum(axis=1, keepdims=True)
+        return profile - np.nansum(profile, axis=1, keepdims=True) / np.maximum(n_phases, 1)
+    
+    @staticmethod
+    def _centred_moving_average(values, weights, window):
+        """Weighted moving average centred like pandas rolling(center=True); NaN at the edges"""
+        n_times = values.shape[1]
+        
+        def window_sum(a):
+            cumulative = np.zeros((a.shape[0], n_times + 1))
+            np.cumsum(a, axis=1, out=cumulative[:, 1:])
+            return cumulative[:, window:] - cumulative[:, :n_times + 1 - window]
+        
+        average = np.full(values.shape, np.nan)
+        if n_times < window:
+            return average
+        total_weight = window_sum(weights)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centred = window_sum(values * weights) / total_weight
+        start = window // 2
+        average[:, start:start + n_times + 1 - window] = np.where(total_weight > 0, centred, np.nan)
+        return average
+    
+    @staticmethod
+    def _bisquare_weights(residual, floor=1e-3):
+        """STL robustness weights from residuals scaled by six median absolute residuals
+        
+        Weights are floored so a window of outliers still averages to
+        something, falling back to the unweighted mean.
+        """
+        magnitude = np.abs(residual)
+        scale = np.full((len(magnitude), 1), np.nan)
+        has_residuals = (~np.isnan(magnitude)).any(axis=1)
+        scale[has_residuals, 0] = 6 * np.nanmedian(magnitude[has_residuals], axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            u = magnitude / scale
+        weights = np.where(u < 1, (1 - u ** 2) ** 2, 0.0)
+        # Points without a residual (edges, flat series) keep full weight
+        return np.maximum(np.where(np.isnan(u), 1.0, weights), floor)
+    
     @staticmethod
     def calculate_seasonal_decomposition(data, period=12):
         """Simple seasonal decomposition"""
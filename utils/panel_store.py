@@ -0,0 +1,170 @@
+"""
+Partitioned Parquet storage for raw inputs and processed panels
+"""
+
+import os
+import json
+import shutil
+import uuid
+import zlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+class PanelStore:
+    """Write and read datasets as Parquet partitioned by year and district bucket"""
+    
+    COLUMNS_FILE = '_columns.json'
+    
+    def __init__(self, config):
+        self.config = config
+        self.root = config.PARQUET_DIR
+        self.n_buckets = config.PARQUET_DISTRICT_BUCKETS
+        self.partitioning = ds.partitioning(
+            pa.schema([('year', pa.int16()), ('district_bucket', pa.int16())]),
+            flavor='hive'
+        )
+    
+    def _path(self, name):
+        return os.path.join(self.root, name)
+    
+    def district_bucket(self, districts):
+        """Stable bucket number for each district name"""
+        return np.array(
+            [zlib.crc32(str(name).encode('utf-8')) % self.n_buckets for name in districts],
+            dtype=np.int16
+        )
+    
+    def write(self, name, df, append=False, key=None):
+        """Replace dataset name with df, partitioned by whichever keys it has
+        
+        append=True adds df to an existing dataset as new files, e.g. one
+        district chunk at a time. key, e.g. a feature store fingerprint, is
+        recorded so callers can tell whether the stored data is current.
+        """
+        path = self._path(name)
+        if os.path.exists(path) and not (append and self.exists(name)):
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+        
+        table_df = df.copy()
+        table_df.attrs = {}  # Side tables such as DistrictStatic are not stored with the frame
+        columns = list(df.columns)
+        if 'date' in table_df.columns:
+            table_df['year'] = pd.DatetimeIndex(table_df['date']).year
+        if 'year' in table_df.columns:
+            table_df['year'] = table_df['year'].astype(np.int16)
+        
+        # Bucket ids are derived per unique name, not per row
+        if 'district' in table_df.columns:
+            districts = table_df['district'].astype('category')
+            buckets = self.district_bucket(districts.cat.categories)
+            table_df['district_bucket'] = buckets[districts.cat.codes.to_numpy()]
+            table_df['district'] = districts
+        
+        partition_cols = [col for col in ('year', 'district_bucket') if col in table_df.columns]
+        table = pa.Table.from_pandas(table_df, preserve_index=False)
+        table = self._typed(table)
+        
+        partitioning = ds.partitioning(
+            pa.schema([self.partitioning.schema.field(col) for col in partition_cols]),
+            flavor='hive'
+        ) if partition_cols else None
+        ds.write_dataset(
+            table, path, format='parquet', partitioning=partitioning,
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            max_partitions=max(1024, self.n_buckets * 256)
+        )
+        
+        with open(os.path.join(path, self.COLUMNS_FILE), 'w') as f:
+            json.dump({'columns': columns, 'partition_cols': partition_cols, 'key': key}, f)
+        return path
+    
+    @staticmethod
+    def _typed(table):
+        """Dictionary-encode district names and store dates as typed timestamps"""
+        fields = []
+        for field in table.schema:
+            if field.name == 'district':
+                field = pa.field('district', pa.dictionary(pa.int32(), pa.string()))
+            elif pa.types.is_timestamp(field.type):
+                field = pa.field(field.name, pa.timestamp('ms'))
+            fields.append(field)
+        return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+    
+    def exists(self, name):
+        return os.path.exists(os.path.join(self._path(name), self.COLUMNS_FILE))
+    
+    def key(self, name):
+        """Key recorded by the last write of dataset name, or None"""
+        if not self.exists(name):
+            return None
+        with open(os.path.join(self._path(name), self.COLUMNS_FILE)) as f:
+            return json.load(f).get('key')
+    
+    def dataset(self, name):
+        """Open a stored dataset for lazy scanning"""
+        path = self._path(name)
+        with open(os.path.join(path, self.COLUMNS_FILE)) as f:
+            layout = json.load(f)
+        partitioning = ds.partitioning(
+            pa.schema([self.partitioning.schema.field(col) for col in layout['partition_cols']]),
+            flavor='hive'
+        ) if layout['partition_cols'] else None
+        # Files starting with '_' (the column layout) are skipped by discovery
+        dataset = ds.dataset(path, format='parquet', partitioning=partitioning)
+        return dataset, layout
+    
+    def read(self, name, columns=None, districts=None, start_date=None, end_date=None,
+             filter=None):
+        """Read a dataset, scanning only the requested columns and matching partitions
+        
+        districts, start_date and end_date are pushed down as partition and
+        row-group filters; filter is an optional extra pyarrow expression.
+        """
+        dataset, layout = self.dataset(name)
+        partition_cols = layout['partition_cols']
+        expression = filter
+        
+        def combine(condition):
+            return condition if expression is None else expression & condition
+        
+        if districts is not None:
+            districts = list(districts)
+            if 'district_bucket' in partition_cols:
+                buckets = np.unique(self.district_bucket(districts)).tolist()
+                expression = combine(ds.field('district_bucket').isin(buckets))
+            expression = combine(ds.field('district').isin(districts))
+        if start_date is not None:
+            start_date = pd.Timestamp(start_date)
+            if 'year' in partition_cols:
+                expression = combine(ds.field('year') >= start_date.year)
+            expression = combine(ds.field('date') >= pa.scalar(start_date, pa.timestamp('ms')))
+        if end_date is not None:
+            end_date = pd.Timestamp(end_date)
+            if 'year' in partition_cols:
+                expression = combine(ds.field('year') <= end_date.year)
+            expression = combine(ds.field('date') <= pa.scalar(end_date, pa.timestamp('ms')))
+        
+        columns = list(layout['columns'] if columns is None else columns)
+        # Partitions come back in layout order, so the (district, date) keys are
+        # always scanned to restore row order, then dropped if not requested
+        sort_cols = [col for col in ('district', 'date') if col in layout['columns']]
+        scan_cols = columns + [col for col in sort_cols if col not in columns]
+        table = dataset.to_table(columns=scan_cols, filter=expression)
+        
+        df = table.to_pandas()
+        if 'year' in df.columns and 'year' in partition_cols:
+            df['year'] = df['year'].astype(np.int32)
+        
+        if 'district' in df.columns:
+            df['district'] = df['district'].cat.set_categories(
+                sorted(df['district'].cat.categories)
+            )
+        if sort_cols:
+            df = df.sort_values(sort_cols, kind='stable').reset_index(drop=True)
+        if len(scan_cols) > len(columns):
+            df = df[columns]
+        return df
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+NumPy arrays backed by multiprocessing shared memory
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+
+class SharedArray:
+    """A NumPy array living in a named shared-memory block
+    
+    The creating process owns the block and unlinks it; other processes
+    attach by spec, a picklable (name, shape, dtype) tuple.
+    """
+    
+    def __init__(self, block, shape, dtype, owner):
+        self.block = block
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+    
+    @classmethod
+    def create(cls, shape, dtype=float):
+        """Allocate a new shared block"""
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        return cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype, owner=True)
+    
+    @classmethod
+    def from_array(cls, array):
+        """Copy an array into a new shared block"""
+        shared = cls.create(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+    
+    @classmethod
+    def attach(cls, spec, read_only=False):
+        """Attach to a block created elsewhere"""
+        name, shape, dtype = spec
+        shared = cls(shared_memory.SharedMemory(name=name), shape, dtype, owner=False)
+        if read_only:
+            shared.array.flags.writeable = False
+        return shared
+    
+    @property
+    def spec(self):
+        return (self.block.name, self.shape, self.dtype.str)
+    
+    def close(self):
+        """Release this process's mapping, unlinking the block if owned"""
+        self.array = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
\ No newline at end of file
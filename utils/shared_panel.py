@@ -0,0 +1,157 @@
+"""
+Publish a long panel in shared memory for worker processes
+"""
+
+import numpy as np
+import pandas as pd
+from .shared_arrays import SharedArray
+
+class SharedPanel:
+    """Numeric columns and district codes of a panel in shared memory
+    
+    The publishing process owns the blocks and must close() them; workers
+    attach() from the picklable spec and get read-only views. Columns of
+    one dtype share a (column, row) block, so a panel costs a handful of
+    segments whatever its width.
+    """
+    
+    def __init__(self, spec, blocks, owner):
+        self.spec = spec
+        self.blocks = blocks
+        self.owner = owner
+    
+    @classmethod
+    def publish(cls, panel_data, group_col='district'):
+        """Copy the numeric, datetime and district columns of a panel into shared blocks"""
+        districts = panel_data[group_col]
+        categorical = isinstance(districts.dtype, pd.CategoricalDtype)
+        if not categorical:
+            districts = districts.astype('category')
+        
+        # Group columns by storage dtype; datetimes travel as int64 ticks
+        layout = {}
+        columns = {}
+        for col in panel_data.columns:
+            if col == group_col:
+                continue
+            values = panel_data[col]
+            if values.dtype.kind == 'M':
+                storage, dtype = np.dtype(np.int64), values.to_numpy().dtype
+            elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                storage = dtype = values.to_numpy().dtype
+            else:
+                continue
+            layout.setdefault(storage.str, []).append(col)
+            columns[col] = (storage.str, len(layout[storage.str]) - 1, str(dtype))
+        
+        blocks = {}
+        try:
+            codes = districts.cat.codes.to_numpy()
+            blocks['codes'] = SharedArray.from_array(codes)
+            for storage, names in layout.items():
+                block = SharedArray.create((len(names), len(panel_data)), storage)
+                for row, col in enumerate(names):
+                    if columns[col][2].startswith('datetime64'):
+                        block.array[row] = panel_data[col].to_numpy().view(np.int64)
+                    else:
+                        block.array[row] = panel_data[col].to_numpy()
+                blocks[storage] = block
+        except Exception:
+            for block in blocks.values():
+                block.close()
+            raise
+        
+        spec = {
+            'n_rows': len(panel_data),
+            'group_col': group_col,
+            'districts': list(districts.cat.categories),
+            'categorical': categorical,
+            'order': list(panel_data.columns),
+            'columns': columns,
+            'blocks': {key: block.spec for key, block in blocks.items()}
+        }
+        return cls(spec, blocks, owner=True)
+    
+    @classmethod
+    def attach(cls, spec):
+        """Attach read-only to a panel published by another process"""
+        blocks = {key: SharedArray.attach(block_spec, read_only=True)
+                  for key, block_spec in spec['blocks'].items()}
+        return cls(spec, blocks, owner=False)
+    
+    @property
+    def columns(self):
+        """Published columns in panel order"""
+        return [col for col in self.spec['order']
+                if col == self.spec['group_col'] or col in self.spec['columns']]
+    
+    def column(self, col):
+        """Read-only NumPy view of one published column"""
+        storage, row, dtype = self.spec['columns'][col]
+        values = self.blocks[storage].array[row]
+        return values.view(dtype) if dtype.startswith('datetime64') else values
+    
+    def district_codes(self):
+        """Read-only view of the district codes"""
+        return self.blocks['codes'].array
+    
+    def matches(self, panel_data):
+        """Whether panel_data still holds the published columns and rows, in order"""
+        group_col = self.spec['group_col']
+        if len(panel_data) != self.spec['n_rows'] or list(panel_data.columns) != self.spec['order']:
+            return False
+        
+        districts = panel_data[group_col]
+        if isinstance(districts.dtype, pd.CategoricalDtype) and list(districts.cat.categories) == self.spec['districts']:
+            codes = districts.cat.codes.to_numpy()
+        else:
+            codes = pd.Categorical(districts, categories=self.spec['districts']).codes
+        if not np.array_equal(codes, self.district_codes()):
+            return False
+        return all(np.array_equal(panel_data[col].to_numpy(), self.column(col), equal_nan=True)
+                   for col in self.spec['columns'])
+    
+    def to_frame(self, columns=None, rows=slice(None)):
+        """Long panel (or a row slice of it) whose numeric columns view the shared blocks"""
+        group_col = self.spec['group_col']
+        columns = self.columns if columns is None else columns
+        data = {}
+        for col in columns:
+            if col == group_col and self.spec['categorical']:
+                data[col] = pd.Categorical.from_codes(self.district_codes()[rows], self.spec['districts'])
+            elif col == group_col:
+                data[col] = np.asarray(self.spec['districts'], dtype=object)[self.district_codes()[rows]]
+            else:
+                data[col] = self.column(col)[rows]
+        return pd.DataFrame(data, copy=False)
+    
+    def close(self):
+        """Release the mappings; the publisher also unlinks the blocks"""
+        for block in self.blocks.values():
+            block.close()
+        self.blocks = {}
+    
+    @property
+    def is_open(self):
+        return bool(self.blocks)
+    
+    def __deepcopy__(self, memo):
+        # pandas deep-copies frame attrs on most operations; share the handle
+        return self
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def shared_panel_spec(panel_data):
+    """Spec of the open SharedPanel published for a panel, or None
+    
+    pandas carries attrs onto filtered, reordered and modified frames, so
+    the handle is used only while the frame still matches what was published.
+    """
+    shared_panel = panel_data.attrs.get('shared_panel')
+    if shared_panel is None or not shared_panel.is_open or not shared_panel.matches(panel_data):
+        return None
+    return shared_panel.spec
\ No newline at end of file
@@ -24,7 +24,7 @@ class VisualizationEngine:
         
         # Create time series graphs
         timeseries_files = self.timeseries_visualizer.create_graphs(
-            models_results['features_data']
+            models_results['features_data'], models_results.get('risk_history')
         )
         
         # Create interactive dashboard
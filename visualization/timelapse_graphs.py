@@ -14,7 +14,7 @@ class TimeSeriesVisualizer:
     def __init__(self):
         self.config = Config
     
-    def create_graphs(self, features_data):
+    def create_graphs(self, features_data, risk_history=None):
         """Create time series graphs"""
         print("   📈 Creating time-lapse graphs...")
         
@@ -25,8 +25,9 @@ class TimeSeriesVisualizer:
         output_files.append(timeseries_file)
         
         # Create risk evolution graph
-        risk_evolution_file = self._create_risk_evolution(features_data)
-        output_files.append(risk_evolution_file)
+        risk_evolution_file = self._create_risk_evolution(features_data, risk_history)
+        if risk_evolution_file is not None:
+            output_files.append(risk_evolution_file)
         
         # Create feature importance graph
         importance_file = self._create_feature_importance(features_data)
@@ -72,12 +73,22 @@ class TimeSeriesVisualizer:
         fig.write_html(timeseries_path)
         return timeseries_path
     
-    def _create_risk_evolution(self, features_data):
-        """Create risk evolution over time graph"""
+    def _create_risk_evolution(self, features_data, risk_history=None):
+        """Create risk evolution over time graph, or None without per-month risk levels"""
         df = features_data.copy()
         
-        # Calculate risk counts over time
-        risk_evolution = df.groupby(['date', 'risk_level']).size().reset_index(name='count')
+        # Calculate risk counts over time, from this run's risk history when
+        # the features carry no per-month risk levels
+        if 'risk_level' in df.columns:
+            risk_evolution = df.groupby(['date', 'risk_level']).size().reset_index(name='count')
+        elif risk_history is None:
+            print("   ⚠️  No per-month risk levels; skipping the risk evolution graph")
+            return None
+        else:
+            level_counts = risk_history.level_counts()
+            risk_evolution = level_counts.rename_axis('date').reset_index().melt(
+                id_vars='date', var_name='risk_level', value_name='count'
+            )
         
         fig_risk = px.area(risk_evolution, x='date', y='count', color='risk_level',
                           color_discrete_map={'Low': 'green', 'Moderate': 'yellow', 'Critical': 'red'},
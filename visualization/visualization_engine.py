@@ -7,6 +7,7 @@ import seaborn as sns
 import pandas as pd
 import numpy as np
 import os
+from data_processing.compact_panel import has_column, with_static
 
 class VisualizationEngine:
     """Main visualization coordinator"""
@@ -258,11 +259,11 @@ Min: {risk_assessment['risk_score'].min():.3f}"""
         numeric_columns = ['tws_anomaly', 'rainfall', 'water_stress', 
                           'crop_intensity', 'population_density', 'gw_irrigation_ratio']
         
-        available_columns = [col for col in numeric_columns if col in processed_data.columns]
+        available_columns = [col for col in numeric_columns if has_column(processed_data, col)]
         
         if len(available_columns) >= 3:
             # Calculate correlation matrix
-            corr_matrix = processed_data[available_columns].corr()
+            corr_matrix = with_static(processed_data, available_columns)[available_columns].corr()
             
             # Create heatmap
             mask = np.triu(np.ones_like(corr_matrix, dtype=bool))